@@ -1,23 +1,44 @@
 import sqlite3
 import hashlib
+import base64
+import re
 import secrets
 from datetime import datetime, timedelta
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import os
-from functools import wraps
+from functools import wraps, lru_cache
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 import logging
 import json # Import json for handling items_json in orders sheet
-
-from flask import Flask, request, jsonify, session, redirect, url_for, render_template, g, abort
-from werkzeug.security import generate_password_hash, check_password_hash
+import threading
+import time
+import queue
+from collections import OrderedDict
+import gzip
+import mimetypes
+import posixpath
+import shutil
+import tempfile
+import heapq
+
+import click
+from flask import Flask, request, jsonify, session, redirect, url_for, render_template, g, abort, Response, stream_with_context, send_from_directory
+from markupsafe import Markup
+from werkzeug.security import generate_password_hash, check_password_hash, safe_join
 from werkzeug.utils import secure_filename
 
 import pandas as pd # Still used for CSV import for SQLite products
+try:
+    import brotli # optional; responses are gzip-compressed only without it
+except ImportError:
+    brotli = None
 
 # --- Google Sheets Integration Imports ---
 import gspread
+from gspread.utils import rowcol_to_a1, a1_range_to_grid_range
 from oauth2client.service_account import ServiceAccountCredentials
 
 # Configure logging
@@ -29,8 +50,65 @@ app = Flask(__name__,
 
 app.secret_key = 'your_super_secret_key_here_for_sessions_and_security_khetihal'
 app.config['DATABASE'] = 'instance/site.db'
+# SQLite connection tuning. Each worker process keeps up to SQLITE_POOL_SIZE open connections (plus the
+# same again for the read-only path) so the per-connection statement cache survives across requests.
+app.config['SQLITE_POOL_SIZE'] = int(os.environ.get('SQLITE_POOL_SIZE', 8))
+app.config['SQLITE_JOURNAL_MODE'] = 'WAL'
+app.config['SQLITE_SYNCHRONOUS'] = 'NORMAL' # Safe with WAL; only the last commits can be lost on power failure.
+app.config['SQLITE_CACHE_SIZE'] = -16000 # Negative values are KiB, so ~16 MB of page cache per connection.
+app.config['SQLITE_MMAP_SIZE'] = 128 * 1024 * 1024
+app.config['SQLITE_BUSY_TIMEOUT'] = 5000 # ms to wait on a locked database before failing
+app.config['SQLITE_FOREIGN_KEYS'] = True
+app.config['SQLITE_STATEMENT_CACHE_SIZE'] = 256
 app.config['UPLOAD_FOLDER'] = 'instance/uploads'
-app.config['ALLOWED_EXTENSIONS'] = {'csv'}
+app.config['ALLOWED_EXTENSIONS'] = {'csv'} # each may also be uploaded gzip-compressed, e.g. products.csv.gz
+# CSV imports run as background jobs that parse the upload IMPORT_CHUNK_SIZE rows at a time.
+app.config['IMPORT_CHUNK_SIZE'] = int(os.environ.get('IMPORT_CHUNK_SIZE', 5000))
+app.config['IMPORT_JOB_MAX_ERRORS'] = 500 # row errors kept per job; error_count still counts them all
+app.config['IMPORT_JOB_POLL_INTERVAL'] = 30 # seconds between checks for jobs queued by other processes
+app.config['ORDERS_PAGE_SIZE'] = 20 # Default page size for paginated order listings
+app.config['ORDERS_MAX_PAGE_SIZE'] = 100
+app.config['CART_BATCH_MAX_CHANGES'] = 100
+# Fingerprinted static URLs (see static_url) change whenever the file does, so they can be cached for a year.
+app.config['STATIC_IMMUTABLE_MAX_AGE'] = 365 * 24 * 3600
+# `flask build-assets` writes minified files, per-page CSS bundles and their .gz/.br variants here
+# (relative to the static folder); templates switch to them automatically while they are up to date.
+app.config['ASSET_BUILD_DIR'] = 'dist'
+# Responses of these types are compressed (see compress_response) when their body is at least
+# COMPRESS_MIN_SIZE bytes; below that the headers outweigh the saving.
+app.config['COMPRESS_MIMETYPES'] = {'application/json', 'text/html'}
+app.config['COMPRESS_MIN_SIZE'] = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+app.config['COMPRESS_LEVEL'] = int(os.environ.get('COMPRESS_LEVEL', 6)) # gzip, 1 (fastest) to 9 (smallest)
+app.config['COMPRESS_BROTLI_QUALITY'] = int(os.environ.get('COMPRESS_BROTLI_QUALITY', 5)) # 0 (fastest) to 11 (smallest)
+# Public pages are rendered once per login state and served from memory (see cached_page) for up
+# to PAGE_CACHE_TTL seconds; catalog pages also drop out when the catalog version moves, which is
+# checked at most once per PAGE_CACHE_CHECK_INTERVAL seconds. A TTL of 0 disables the cache.
+app.config['PAGE_CACHE_TTL'] = int(os.environ.get('PAGE_CACHE_TTL', 300))
+app.config['PAGE_CACHE_CHECK_INTERVAL'] = 1.0
+app.config['SUGGEST_DEFAULT_LIMIT'] = 8
+app.config['SUGGEST_MAX_LIMIT'] = 20
+app.config['SUGGEST_INDEX_CHECK_INTERVAL'] = 1.0 # seconds between catalog version checks by the suggest index
+# login_required/admin_required serve user rows from a per-process LRU cache; a cached row is reused
+# while its auth_version matches the session's and it is younger than USER_CACHE_TTL seconds.
+app.config['USER_CACHE_SIZE'] = int(os.environ.get('USER_CACHE_SIZE', 1024))
+app.config['USER_CACHE_TTL'] = int(os.environ.get('USER_CACHE_TTL', 60))
+# Werkzeug hash method for new password hashes, e.g. 'scrypt:32768:8:1' or 'pbkdf2:sha256:1000000'.
+# Stored hashes using other parameters are upgraded the next time their owner logs in.
+# Use `flask bench-password-hash` to pick a cost that fits the hardware.
+app.config['PASSWORD_HASH_METHOD'] = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+# Threads that may hash passwords at once in this process; further logins queue for a free slot.
+app.config['PASSWORD_HASH_WORKERS'] = int(os.environ.get('PASSWORD_HASH_WORKERS', os.cpu_count() or 1))
+# Seconds between background syncs of the Sheets catalog into the SQLite products table (0 disables the worker).
+app.config['CATALOG_SYNC_INTERVAL'] = int(os.environ.get('CATALOG_SYNC_INTERVAL', 300))
+# Placed orders are queued in order_sheet_outbox and appended to the orders sheet in batches by a background worker.
+app.config['ORDER_OUTBOX_INTERVAL'] = int(os.environ.get('ORDER_OUTBOX_INTERVAL', 10))
+app.config['ORDER_OUTBOX_BATCH_SIZE'] = int(os.environ.get('ORDER_OUTBOX_BATCH_SIZE', 50))
+app.config['ORDER_OUTBOX_RETRY_BASE'] = 5 # seconds; doubled per failed attempt
+app.config['ORDER_OUTBOX_RETRY_MAX'] = 600
+# How often the locally allocated sheet ID sequences are checked against the IDs actually in the sheets.
+app.config['SHEET_ID_RECONCILE_INTERVAL'] = int(os.environ.get('SHEET_ID_RECONCILE_INTERVAL', 3600))
+# Seconds the in-process id -> row and header -> column maps of each sheet are trusted before being rebuilt.
+app.config['SHEET_INDEX_TTL'] = int(os.environ.get('SHEET_INDEX_TTL', 300))
 
 if not os.path.exists('instance'):
     os.makedirs('instance')
@@ -42,6 +120,21 @@ if not os.path.exists(app.config['UPLOAD_FOLDER']):
 # --- Email Configuration ---
 EMAIL_ADDRESS = 'khetihal21@gmail.com'
 EMAIL_PASSWORD = 'uhgw fdub cika tguw'
+# Outgoing mail is queued in email_outbox and sent by a background worker over one reused SMTP
+# connection. For local testing point it at a stand-in, e.g. `python -m aiosmtpd -n -l localhost:1025`
+# (pip install aiosmtpd) with MAIL_SERVER=localhost MAIL_PORT=1025 MAIL_USE_SSL=0 MAIL_PASSWORD=''.
+app.config['MAIL_SERVER'] = os.environ.get('MAIL_SERVER', 'smtp.gmail.com')
+app.config['MAIL_PORT'] = int(os.environ.get('MAIL_PORT', 465))
+app.config['MAIL_USE_SSL'] = os.environ.get('MAIL_USE_SSL', '1') not in ('0', 'false', 'False', '')
+app.config['MAIL_USERNAME'] = os.environ.get('MAIL_USERNAME', EMAIL_ADDRESS)
+app.config['MAIL_PASSWORD'] = os.environ.get('MAIL_PASSWORD', EMAIL_PASSWORD) # empty skips SMTP login
+app.config['MAIL_DEFAULT_SENDER'] = os.environ.get('MAIL_DEFAULT_SENDER', app.config['MAIL_USERNAME'])
+app.config['MAIL_OUTBOX_INTERVAL'] = int(os.environ.get('MAIL_OUTBOX_INTERVAL', 10))
+app.config['MAIL_OUTBOX_BATCH_SIZE'] = int(os.environ.get('MAIL_OUTBOX_BATCH_SIZE', 20))
+app.config['MAIL_RETRY_BASE'] = 30 # seconds; doubled per failed attempt
+app.config['MAIL_RETRY_MAX'] = 1800
+app.config['MAIL_MAX_ATTEMPTS'] = 6 # then the message is marked failed; reset links expire after an hour anyway
+app.config['MAIL_CONNECTION_IDLE_TIMEOUT'] = 60 # seconds an unused SMTP connection is kept open
 
 # --- Google Sheets Setup ---
 # Path to your service account key file
@@ -69,22 +162,353 @@ except Exception as e:
 
 # --- Database Functions (for SQLite - customer facing) ---
 
+# Connections are pooled per worker process and per database path. get_db() hands out a read/write
+# connection and get_read_db() a query_only one for endpoints that never write; both are returned to
+# their pool at the end of the request with any unfinished transaction rolled back.
+_db_pools = {}
+_db_pools_lock = threading.Lock()
+_db_pools_pid = os.getpid()
+
+def _open_db_connection(database, read_only):
+    conn = sqlite3.connect(
+        database,
+        timeout=app.config['SQLITE_BUSY_TIMEOUT'] / 1000,
+        check_same_thread=False, # Pooled connections are handed between request and worker threads.
+        cached_statements=app.config['SQLITE_STATEMENT_CACHE_SIZE']
+    )
+    conn.row_factory = sqlite3.Row
+    conn.execute(f"PRAGMA journal_mode = {app.config['SQLITE_JOURNAL_MODE']}")
+    conn.execute(f"PRAGMA synchronous = {app.config['SQLITE_SYNCHRONOUS']}")
+    conn.execute(f"PRAGMA cache_size = {int(app.config['SQLITE_CACHE_SIZE'])}")
+    conn.execute(f"PRAGMA mmap_size = {int(app.config['SQLITE_MMAP_SIZE'])}")
+    conn.execute(f"PRAGMA busy_timeout = {int(app.config['SQLITE_BUSY_TIMEOUT'])}")
+    conn.execute(f"PRAGMA foreign_keys = {'ON' if app.config['SQLITE_FOREIGN_KEYS'] else 'OFF'}")
+    if read_only:
+        conn.execute("PRAGMA query_only = ON")
+    return conn
+
+def _get_db_pool(database, read_only):
+    global _db_pools_pid
+    with _db_pools_lock:
+        if _db_pools_pid != os.getpid():
+            # Forked (e.g. gunicorn --preload): the parent's connections must not be shared.
+            _db_pools.clear()
+            _db_pools_pid = os.getpid()
+        pool = _db_pools.get((database, read_only))
+        if pool is None:
+            pool = _db_pools[(database, read_only)] = queue.LifoQueue(maxsize=app.config['SQLITE_POOL_SIZE'])
+    return pool
+
+def _acquire_db_connection(read_only):
+    database = app.config['DATABASE']
+    pool = _get_db_pool(database, read_only)
+    try:
+        conn = pool.get_nowait()
+    except queue.Empty:
+        conn = _open_db_connection(database, read_only)
+    return conn, pool
+
+def _release_db_connection(conn, pool):
+    try:
+        if conn.in_transaction:
+            conn.rollback()
+        pool.put_nowait(conn)
+    except (sqlite3.Error, queue.Full):
+        conn.close()
+
 def get_db():
     if 'db' not in g:
-        g.db = sqlite3.connect(app.config['DATABASE'])
-        g.db.row_factory = sqlite3.Row
+        g.db, g.db_pool = _acquire_db_connection(read_only=False)
     return g.db
 
+def get_read_db():
+    """Returns a read-only connection for requests that only query. In WAL mode it never waits
+    on writers, and it can't write by accident."""
+    if 'read_db' not in g:
+        g.read_db, g.read_db_pool = _acquire_db_connection(read_only=True)
+    return g.read_db
+
 def close_db(e=None):
     db = g.pop('db', None)
     if db is not None:
-        db.close()
+        _release_db_connection(db, g.pop('db_pool'))
+    read_db = g.pop('read_db', None)
+    if read_db is not None:
+        _release_db_connection(read_db, g.pop('read_db_pool'))
+
+# --- Schema Migrations ---
+# Changes to an existing database are made by appending a migration to MIGRATIONS rather than by
+# editing init_db(), so live databases can be brought up to date with `flask db-upgrade` (also run
+# automatically once per process on the first request) without losing data. Each migration is a
+# version number, a description and a list of steps; a step is either an SQL statement or a
+# function taking the connection. Applied versions are recorded in schema_version.
+
+def add_column_if_missing(table, column, definition):
+    """Returns a migration step that adds a column unless the table already has it."""
+    def step(db):
+        columns = {row['name'] for row in db.execute(f"PRAGMA table_info({table})")}
+        if column not in columns:
+            db.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    return step
+
+def _rename_duplicate_product_names(db):
+    """Suffixes all but the oldest product sharing a name with its ID, so a unique index can be built
+    without deleting products that carts and past orders may reference."""
+    duplicates = db.execute("""
+        SELECT id, name FROM products
+        WHERE id NOT IN (SELECT MIN(id) FROM products GROUP BY name)
+          AND name IN (SELECT name FROM products GROUP BY name HAVING COUNT(*) > 1)
+    """).fetchall()
+    for row in duplicates:
+        db.execute("UPDATE products SET name = ? WHERE id = ?", (f"{row['name']} (#{row['id']})", row['id']))
+        app.logger.warning(f"Renamed duplicate product {row['id']} '{row['name']}' before adding the unique name index.")
+
+# unicode61 splits words at Devanagari vowel signs, virama and nukta, so Hindi product names would be
+# indexed as fragments; declaring these combining marks as token characters keeps words whole.
+DEVANAGARI_MARKS = ''.join(chr(code) for start, end in ((0x0900, 0x0903), (0x093A, 0x094F), (0x0951, 0x0957), (0x0962, 0x0963))
+                           for code in range(start, end + 1))
+
+MIGRATIONS = [
+    (1, 'Bookkeeping tables for the catalog sync, order outbox and sheet ID workers', [
+        """
+        CREATE TABLE IF NOT EXISTS catalog_sync_state (
+            product_id INTEGER PRIMARY KEY,
+            row_hash TEXT NOT NULL,
+            synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS order_sheet_outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            order_id INTEGER NOT NULL,
+            payload TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt_at REAL NOT NULL DEFAULT 0,
+            claim_token TEXT,
+            claimed_until REAL,
+            last_error TEXT,
+            sheet_id INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            sent_at TIMESTAMP,
+            FOREIGN KEY (order_id) REFERENCES orders (id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS sheet_id_sequences (
+            name TEXT PRIMARY KEY,
+            next_id INTEGER NOT NULL,
+            reconciled_at REAL NOT NULL
+        )
+        """,
+    ]),
+    # order_items lookups by order_id already use its (order_id, product_id) primary key, and
+    # password_reset_tokens.token is UNIQUE, so both have usable indexes without help.
+    (2, 'Indexes for order history, admin order listing, reset tokens and product lookups', [
+        "CREATE INDEX IF NOT EXISTS idx_orders_user_date ON orders (user_id, order_date, id)",
+        "CREATE INDEX IF NOT EXISTS idx_orders_date ON orders (order_date, id)",
+        "CREATE INDEX IF NOT EXISTS idx_orders_status_date ON orders (status, order_date, id)",
+        "CREATE INDEX IF NOT EXISTS idx_order_items_product ON order_items (product_id)",
+        "CREATE INDEX IF NOT EXISTS idx_password_reset_tokens_user ON password_reset_tokens (user_id)",
+        "CREATE INDEX IF NOT EXISTS idx_products_name ON products (name)",
+        "CREATE INDEX IF NOT EXISTS idx_order_sheet_outbox_pending ON order_sheet_outbox (next_attempt_at) WHERE sent_at IS NULL",
+    ]),
+
+    (3, 'FTS5 full-text index over product names and descriptions', [
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+            name, description,
+            content='products', content_rowid='id',
+            tokenize="unicode61 remove_diacritics 2 tokenchars '{DEVANAGARI_MARKS}'"
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS products_fts_after_insert AFTER INSERT ON products BEGIN
+            INSERT INTO products_fts (rowid, name, description) VALUES (new.id, new.name, new.description);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS products_fts_after_delete AFTER DELETE ON products BEGIN
+            INSERT INTO products_fts (products_fts, rowid, name, description) VALUES ('delete', old.id, old.name, old.description);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS products_fts_after_update AFTER UPDATE OF name, description ON products BEGIN
+            INSERT INTO products_fts (products_fts, rowid, name, description) VALUES ('delete', old.id, old.name, old.description);
+            INSERT INTO products_fts (rowid, name, description) VALUES (new.id, new.name, new.description);
+        END
+        """,
+        "INSERT INTO products_fts (products_fts) VALUES ('rebuild')",
+    ]),
+    # A counter bumped by every change to products, so in-process caches derived from the catalog
+    # can tell with one primary key lookup whether they are stale.
+    (4, 'Catalog version counter maintained by triggers on products', [
+        "CREATE TABLE IF NOT EXISTS catalog_meta (id INTEGER PRIMARY KEY CHECK (id = 1), version INTEGER NOT NULL)",
+        "INSERT OR IGNORE INTO catalog_meta (id, version) VALUES (1, 1)",
+        """
+        CREATE TRIGGER IF NOT EXISTS catalog_version_after_insert AFTER INSERT ON products BEGIN
+            UPDATE catalog_meta SET version = version + 1 WHERE id = 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS catalog_version_after_update AFTER UPDATE ON products BEGIN
+            UPDATE catalog_meta SET version = version + 1 WHERE id = 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS catalog_version_after_delete AFTER DELETE ON products BEGIN
+            UPDATE catalog_meta SET version = version + 1 WHERE id = 1;
+        END
+        """,
+    ]),
+    (5, 'Unique product names, so imports can upsert by name', [
+        _rename_duplicate_product_names,
+        "DROP INDEX IF EXISTS idx_products_name",
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_products_name_unique ON products (name)",
+    ]),
+    (6, 'Background CSV import jobs', [
+        """
+        CREATE TABLE IF NOT EXISTS import_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            filename TEXT NOT NULL,
+            filepath TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'queued',
+            bytes_total INTEGER NOT NULL DEFAULT 0,
+            bytes_processed INTEGER NOT NULL DEFAULT 0,
+            rows_processed INTEGER NOT NULL DEFAULT 0,
+            imported_count INTEGER NOT NULL DEFAULT 0,
+            updated_count INTEGER NOT NULL DEFAULT 0,
+            error_count INTEGER NOT NULL DEFAULT 0,
+            errors TEXT NOT NULL DEFAULT '[]',
+            message TEXT,
+            claim_token TEXT,
+            claimed_until REAL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            started_at TIMESTAMP,
+            finished_at TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_import_jobs_pending ON import_jobs (id) WHERE status IN ('queued', 'running')",
+    ]),
+    (7, 'Version stamp on users for the session user cache', [
+        add_column_if_missing('users', 'auth_version', 'INTEGER NOT NULL DEFAULT 1'),
+    ]),
+    (8, 'Outgoing email queue', [
+        """
+        CREATE TABLE IF NOT EXISTS email_outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            recipient TEXT NOT NULL,
+            message TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt_at REAL NOT NULL DEFAULT 0,
+            claim_token TEXT,
+            claimed_until REAL,
+            last_error TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            sent_at TIMESTAMP,
+            failed_at TIMESTAMP
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_email_outbox_pending ON email_outbox (next_attempt_at) WHERE sent_at IS NULL AND failed_at IS NULL",
+    ]),
+    (9, 'Per-user cart version counter maintained by triggers on cart_items', [
+        "CREATE TABLE IF NOT EXISTS cart_versions (user_id INTEGER PRIMARY KEY, version INTEGER NOT NULL)",
+        """
+        CREATE TRIGGER IF NOT EXISTS cart_version_after_insert AFTER INSERT ON cart_items BEGIN
+            INSERT INTO cart_versions (user_id, version) VALUES (NEW.user_id, 1)
+            ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS cart_version_after_update AFTER UPDATE ON cart_items BEGIN
+            INSERT INTO cart_versions (user_id, version) VALUES (NEW.user_id, 1)
+            ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS cart_version_after_delete AFTER DELETE ON cart_items BEGIN
+            INSERT INTO cart_versions (user_id, version) VALUES (OLD.user_id, 1)
+            ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+        END
+        """,
+    ]),
+    (10, 'Catalog last-modified time for HTTP caching of product listings', [
+        add_column_if_missing('catalog_meta', 'updated_at', 'TIMESTAMP'),
+        "UPDATE catalog_meta SET updated_at = CURRENT_TIMESTAMP WHERE updated_at IS NULL",
+        "DROP TRIGGER IF EXISTS catalog_version_after_insert",
+        "DROP TRIGGER IF EXISTS catalog_version_after_update",
+        "DROP TRIGGER IF EXISTS catalog_version_after_delete",
+        """
+        CREATE TRIGGER catalog_version_after_insert AFTER INSERT ON products BEGIN
+            UPDATE catalog_meta SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = 1;
+        END
+        """,
+        """
+        CREATE TRIGGER catalog_version_after_update AFTER UPDATE ON products BEGIN
+            UPDATE catalog_meta SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = 1;
+        END
+        """,
+        """
+        CREATE TRIGGER catalog_version_after_delete AFTER DELETE ON products BEGIN
+            UPDATE catalog_meta SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = 1;
+        END
+        """,
+    ]),
+    (11, 'Sheet row ID on products, so mirrored rows never share primary keys with local products', [
+        add_column_if_missing('products', 'sheet_id', 'INTEGER'),
+        # Until now the sync wrote sheet rows under their sheet ID, so those rows already match.
+        "UPDATE products SET sheet_id = id WHERE sheet_id IS NULL AND id IN (SELECT product_id FROM catalog_sync_state)",
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_products_sheet_id ON products (sheet_id)",
+    ]),
+]
+
+def get_schema_version(db):
+    db.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    return db.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+def upgrade_db(db):
+    """Applies every migration newer than the database's schema version, each in its own
+    transaction. Safe to run from several processes at once. Returns the versions applied."""
+    if db.in_transaction:
+        db.commit()
+    applied = []
+    for version, description, steps in MIGRATIONS:
+        if version <= get_schema_version(db):
+            continue
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have applied it while we waited for the write lock.
+            if version <= db.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]:
+                db.rollback()
+                continue
+            for step in steps:
+                if callable(step):
+                    step(db)
+                else:
+                    db.execute(step)
+            db.execute("INSERT INTO schema_version (version, description) VALUES (?, ?)", (version, description))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        applied.append(version)
+        app.logger.info(f"Applied schema migration {version}: {description}")
+    return applied
 
 def init_db():
     db = get_db()
     cursor = db.cursor()
 
     app.logger.info("Starting SQLite database initialization...")
+    # Tables are dropped in an order that would trip foreign key checks, so suspend them meanwhile.
+    cursor.execute("PRAGMA foreign_keys = OFF")
 
     cursor.execute("DROP TABLE IF EXISTS users")
     cursor.execute("DROP TABLE IF EXISTS password_reset_tokens")
@@ -93,6 +517,15 @@ def init_db():
     cursor.execute("DROP TABLE IF EXISTS shipping_info")
     cursor.execute("DROP TABLE IF EXISTS orders")
     cursor.execute("DROP TABLE IF EXISTS order_items")
+    cursor.execute("DROP TABLE IF EXISTS catalog_sync_state")
+    cursor.execute("DROP TABLE IF EXISTS order_sheet_outbox")
+    cursor.execute("DROP TABLE IF EXISTS sheet_id_sequences")
+    cursor.execute("DROP TABLE IF EXISTS schema_version")
+    cursor.execute("DROP TABLE IF EXISTS products_fts")
+    cursor.execute("DROP TABLE IF EXISTS catalog_meta")
+    cursor.execute("DROP TABLE IF EXISTS import_jobs")
+    cursor.execute("DROP TABLE IF EXISTS email_outbox")
+    cursor.execute("DROP TABLE IF EXISTS cart_versions")
     app.logger.info("Dropped existing SQLite tables (if any).")
 
     cursor.execute("""
@@ -193,11 +626,14 @@ def init_db():
     """)
     app.logger.info("Created 'order_items' table.")
 
+    upgrade_db(db)
+    app.logger.info("Applied schema migrations.")
+
     admin_username = os.environ.get('ADMIN_USERNAME', 'admin')
     admin_email = os.environ.get('ADMIN_EMAIL', 'admin@khetihal.com')
     admin_password = os.environ.get('ADMIN_PASSWORD', 'adminpassword')
     
-    hashed_admin_password = generate_password_hash(admin_password)
+    hashed_admin_password = hash_password(admin_password)
     cursor.execute("INSERT INTO users (username, email, password_hash, is_admin) VALUES (?, ?, ?, ?)",
                    (admin_username, admin_email, hashed_admin_password, 1))
     db.commit()
@@ -218,6 +654,7 @@ def init_db():
     cursor.executemany("INSERT INTO products (name, description, price, image_url, stock) VALUES (?, ?, ?, ?, ?)", products_data)
     db.commit()
     app.logger.info("Inserted dummy products into SQLite.")
+    cursor.execute(f"PRAGMA foreign_keys = {'ON' if app.config['SQLITE_FOREIGN_KEYS'] else 'OFF'}")
     app.logger.info("SQLite database initialization complete.")
 
 @app.cli.command('init-db')
@@ -227,12 +664,274 @@ def init_db_command():
     print('Initialized the SQLite database.')
     app.logger.info("SQLite database initialized via 'flask init-db' command.")
 
+@app.cli.command('db-upgrade')
+def db_upgrade_command():
+    """Apply pending schema migrations without touching existing data."""
+    db = get_db()
+    applied = upgrade_db(db)
+    if applied:
+        print(f"Applied migrations {', '.join(map(str, applied))}; schema is at version {get_schema_version(db)}.")
+    else:
+        print(f'Schema is up to date at version {get_schema_version(db)}.')
+
+@app.cli.command('bench-password-hash')
+@click.option('--method', default=None, help='Hash method to time (default: PASSWORD_HASH_METHOD).')
+@click.option('--seconds', default=3.0, show_default=True, help='How long to hash on each thread count.')
+def bench_password_hash_command(method, seconds):
+    """Report password hashes per second for a hash method, on one core and on all cores."""
+    method = method or app.config['PASSWORD_HASH_METHOD']
+    cores = os.cpu_count() or 1
+    print(f'Benchmarking {_password_hash_prefix(method)} for {seconds:g}s per run on {cores} cores...')
+    for threads in sorted({1, cores}):
+        counts = [0] * threads
+        deadline = time.monotonic() + seconds
+        def hash_until_deadline(slot):
+            while time.monotonic() < deadline:
+                generate_password_hash('benchmark-password', method=method)
+                counts[slot] += 1
+        workers = [threading.Thread(target=hash_until_deadline, args=(slot,)) for slot in range(threads)]
+        for worker in workers: worker.start()
+        for worker in workers: worker.join()
+        rate = sum(counts) / seconds
+        print(f'{threads} thread(s): {rate:.1f} hashes/sec total, {rate / threads:.1f} per core, '
+              f'{1000 / (rate / threads):.0f} ms per hash' if rate else f'{threads} thread(s): no hash finished in time')
+
+@app.cli.command('bench-checkout')
+@click.option('--workers', default=16, show_default=True, help='Concurrent customers checking out.')
+@click.option('--stock', default=500, show_default=True, help='Starting stock of the hot product.')
+@click.option('--quantity', default=1, show_default=True, help='Units of the hot product per order.')
+def bench_checkout_command(workers, stock, quantity):
+    """Hammer one product with concurrent checkouts on a scratch database, check that it is never
+    oversold and report checkouts per second."""
+    directory = tempfile.mkdtemp(prefix='bench-checkout-')
+    database = os.path.join(directory, 'bench.db')
+    original_database = app.config['DATABASE']
+    app.config['DATABASE'] = database
+    try:
+        with app.app_context():
+            init_db()
+        setup = _open_db_connection(database, read_only=False)
+        product_id = setup.execute("INSERT INTO products (name, description, price, image_url, stock) VALUES (?, ?, ?, ?, ?)",
+                                   ('Benchmark Hot Product', 'Contended SKU', 10.0, '', stock)).lastrowid
+        users = []
+        for n in range(workers):
+            user_id = setup.execute("INSERT INTO users (username, email, password_hash) VALUES (?, ?, ?)",
+                                    (f'bench{n}', f'bench{n}@example.com', 'unused')).lastrowid
+            setup.execute("""INSERT INTO shipping_info (user_id, full_name, address_line1, address_line2, city, state, zip_code, phone)
+                             VALUES (?, 'Bench Customer', '1 Field Road', 'Village', 'Town', 'State', '123456', '9999999999')""", (user_id,))
+            users.append(setup.execute("SELECT * FROM users WHERE id = ?", (user_id,)).fetchone())
+        setup.commit()
+
+        placed = [0] * workers
+        rejected = [0] * workers
+        failures = []
+        def checkout_until_sold_out(slot):
+            db = _open_db_connection(database, read_only=False)
+            try:
+                while True:
+                    with db:
+                        db.execute("INSERT INTO cart_items (user_id, product_id, quantity) VALUES (?, ?, ?)",
+                                   (users[slot]['id'], product_id, quantity))
+                    try:
+                        place_order(db, users[slot], 'cod')
+                        placed[slot] += 1
+                    except InsufficientStockError:
+                        rejected[slot] += 1
+                        return
+            except Exception as e:
+                failures.append(e)
+            finally:
+                db.close()
+
+        print(f'{workers} workers checking out {quantity} unit(s) at a time from a stock of {stock}...')
+        threads = [threading.Thread(target=checkout_until_sold_out, args=(slot,)) for slot in range(workers)]
+        started = time.perf_counter()
+        for thread in threads: thread.start()
+        for thread in threads: thread.join()
+        elapsed = time.perf_counter() - started
+
+        remaining = setup.execute("SELECT stock FROM products WHERE id = ?", (product_id,)).fetchone()[0]
+        sold = setup.execute("SELECT COALESCE(SUM(quantity), 0) FROM order_items WHERE product_id = ?", (product_id,)).fetchone()[0]
+        orders = setup.execute("SELECT COUNT(*) FROM orders").fetchone()[0]
+        setup.close()
+        if failures:
+            raise click.ClickException(f'{len(failures)} workers failed; first error: {failures[0]}')
+        if remaining < 0 or sold != stock - remaining or orders != sum(placed) or sold != sum(placed) * quantity:
+            raise click.ClickException(f'Oversold: started with {stock}, {remaining} left, {sold} sold in {orders} orders '
+                                       f'({sum(placed)} checkouts succeeded).')
+        if remaining >= quantity:
+            raise click.ClickException(f'Checkouts were rejected with {remaining} units still in stock.')
+        print(f'{sum(placed)} checkouts in {elapsed:.2f}s: {sum(placed) / elapsed:.1f} checkouts/sec; '
+              f'{sold} of {stock} units sold, {remaining} left, {sum(rejected)} checkouts rejected for stock, no overselling.')
+    finally:
+        app.config['DATABASE'] = original_database
+        shutil.rmtree(directory, ignore_errors=True)
+
+CSS_RELATIVE_URL_PATTERN = re.compile(r"""url\(\s*(['"]?)(?!data:|[a-z]+://|/|#)([^'")]+)\1\s*\)""")
+TEMPLATE_STYLESHEETS_PATTERN = re.compile(r"stylesheets\(([^)]*)\)")
+
+@app.cli.command('build-assets')
+def build_assets_command():
+    """Minify static JS/CSS, bundle each page's stylesheets and write .gz/.br variants."""
+    try:
+        import rjsmin, rcssmin, brotli
+    except ImportError as e:
+        raise click.ClickException(f'build-assets needs rjsmin, rcssmin and Brotli ({e}); run pip install -r requirements.txt.')
+    static_root = app.static_folder
+    build_dir = os.path.join(static_root, app.config['ASSET_BUILD_DIR'])
+    shutil.rmtree(build_dir, ignore_errors=True)
+
+    minified = {}
+    for root, dirs, files in os.walk(static_root):
+        if os.path.abspath(root) == os.path.abspath(static_root) and app.config['ASSET_BUILD_DIR'] in dirs:
+            dirs.remove(app.config['ASSET_BUILD_DIR'])
+        for name in files:
+            if not name.endswith(('.js', '.css')):
+                continue
+            source = os.path.relpath(os.path.join(root, name), static_root).replace(os.sep, '/')
+            with open(os.path.join(static_root, source), encoding='utf-8') as handle:
+                if name.endswith('.js'):
+                    minified[source] = rjsmin.jsmin(handle.read())
+                else:
+                    # Built files live under the build dir, so relative url()s are made absolute first.
+                    text = CSS_RELATIVE_URL_PATTERN.sub(
+                        lambda m: f"url({m[1]}{app.static_url_path}/{posixpath.normpath(posixpath.join(posixpath.dirname(source), m[2]))}{m[1]})",
+                        handle.read())
+                    minified[source] = rcssmin.cssmin(text)
+    outputs = dict(minified)
+
+    # Built modules import the fingerprinted builds of their dependencies, so a cached entry module
+    # always gets the exact code it was built against and every module can be served as immutable.
+    linked = {}
+    def link_module(source):
+        if source not in linked:
+            linked[source] = None # an import cycle keeps its relative specifier
+            def fingerprinted_import(m):
+                dependency = posixpath.normpath(posixpath.join(posixpath.dirname(source), m[3]))
+                text = link_module(dependency) if dependency in minified else None
+                if text is None:
+                    return m[0]
+                stem, ext = os.path.splitext(dependency)
+                digest = hashlib.sha256(text.encode('utf-8')).hexdigest()[:12]
+                return f"{m[1]}{m[2]}{app.static_url_path}/{app.config['ASSET_BUILD_DIR']}/{stem}.{digest}{ext}{m[2]}"
+            linked[source] = JS_IMPORT_PATTERN.sub(fingerprinted_import, minified[source])
+        return linked[source]
+    for source in minified:
+        if source.endswith('.js'):
+            outputs[source] = link_module(source)
+
+    # Each page lists its stylesheets in a {{ stylesheets(...) }} call; bundle every distinct list.
+    for template in sorted(os.listdir(app.template_folder)):
+        if not template.endswith('.html'):
+            continue
+        with open(os.path.join(app.template_folder, template), encoding='utf-8') as handle:
+            for call in TEMPLATE_STYLESHEETS_PATTERN.findall(handle.read()):
+                filenames = re.findall(r"'([^']+)'", call)
+                missing = [name for name in filenames if name not in minified]
+                if missing:
+                    print(f'{template}: skipping bundle, missing stylesheets {missing}')
+                    continue
+                outputs[stylesheet_bundle_name(filenames)] = '\n'.join(minified[name] for name in filenames)
+
+    source_bytes = sum(os.path.getsize(os.path.join(static_root, name)) for name in minified)
+    minified_bytes = sum(len(minified[name].encode('utf-8')) for name in minified)
+    output_bytes = gzip_bytes = brotli_bytes = 0
+    for output, text in sorted(outputs.items()):
+        path = os.path.join(build_dir, output)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = text.encode('utf-8')
+        with open(path, 'wb') as handle:
+            handle.write(data)
+        gzipped = gzip.compress(data, compresslevel=9, mtime=0)
+        with open(path + '.gz', 'wb') as handle:
+            handle.write(gzipped)
+        brotlied = brotli.compress(data, quality=11)
+        with open(path + '.br', 'wb') as handle:
+            handle.write(brotlied)
+        output_bytes += len(data)
+        gzip_bytes += len(gzipped)
+        brotli_bytes += len(brotlied)
+    print(f'Built {len(outputs)} assets ({len(outputs) - len(minified)} page stylesheet bundles) into {build_dir}.')
+    print(f'Minified {len(minified)} files from {source_bytes} to {minified_bytes} bytes; all outputs total '
+          f'{output_bytes} bytes, {gzip_bytes} gzipped, {brotli_bytes} brotli.')
+
+@app.cli.command('sync-catalog')
+def sync_catalog_command():
+    """Mirror the Google Sheets product catalog into the SQLite products table."""
+    summary = sync_catalog_from_sheet()
+    if summary is None:
+        print('Catalog sync failed: the products sheet could not be read.')
+    else:
+        print(f"Catalog synced: {summary['upserted']} upserted, {summary['deleted']} deleted, {summary['unchanged']} unchanged.")
+
+@app.cli.command('drain-order-outbox')
+def drain_order_outbox_command():
+    """Append every pending placed order to the Google Sheet now."""
+    if not orders_sheet:
+        print('Orders sheet is not available; nothing was sent.')
+        return
+    upgrade_db(get_db())
+    sent = 0
+    while True:
+        appended = drain_order_sheet_outbox()
+        if not appended:
+            break
+        sent += appended
+    print(f'Appended {sent} orders to the Google Sheet.' if appended is not None else
+          f'Appended {sent} orders; the next batch failed and was rescheduled.')
+
 @app.teardown_appcontext
 def teardown_db(exception):
     close_db()
 
 
 # --- Authentication and Authorization Decorators ---
+# Every protected request needs the user's row, so each process keeps the most recently used rows in
+# an LRU cache. The session carries the auth_version it was issued with; whenever a user's profile or
+# password changes, auth_version is bumped (see record_user_change), so a session holding the new
+# version never accepts a cached row from before the change, even one cached by another worker.
+# Sessions still holding an older version reload the row and adopt the current version.
+_user_cache = OrderedDict() # user_id -> (row, cached_at)
+_user_cache_lock = threading.Lock()
+
+def get_session_user():
+    """Returns the users row for the logged-in session, or None if the user no longer exists."""
+    user_id = session['user_id']
+    version = session.get('user_version')
+    with _user_cache_lock:
+        cached = _user_cache.get(user_id)
+        if cached:
+            user, cached_at = cached
+            if user['auth_version'] == version and time.monotonic() - cached_at < app.config['USER_CACHE_TTL']:
+                _user_cache.move_to_end(user_id)
+                return user
+    user = get_db().execute("SELECT * FROM users WHERE id = ?", (user_id,)).fetchone()
+    with _user_cache_lock:
+        if user is None:
+            _user_cache.pop(user_id, None)
+            return None
+        _user_cache[user_id] = (user, time.monotonic())
+        _user_cache.move_to_end(user_id)
+        while len(_user_cache) > app.config['USER_CACHE_SIZE']:
+            _user_cache.popitem(last=False)
+    if version != user['auth_version']:
+        session['user_version'] = user['auth_version']
+    return user
+
+def record_user_change(cursor, user_id):
+    """Bumps a user's auth_version inside the caller's transaction after their row was updated, so
+    cached copies of the old row stop being served."""
+    version = cursor.execute("UPDATE users SET auth_version = auth_version + 1 WHERE id = ? RETURNING auth_version",
+                             (user_id,)).fetchone()[0]
+    with _user_cache_lock:
+        _user_cache.pop(user_id, None)
+    if session.get('user_id') == user_id:
+        session['user_version'] = version
+
+def start_user_session(user):
+    session['user_id'] = user['id']
+    session['user_version'] = user['auth_version']
+
 def login_required(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
@@ -240,12 +939,12 @@ def login_required(f):
             app.logger.warning("Access denied: User not logged in for protected route. Redirecting to login.")
             return redirect(url_for('serve_login'))
         
-        db = get_db()
-        g.user = db.execute("SELECT * FROM users WHERE id = ?", (session['user_id'],)).fetchone()
+        g.user = get_session_user()
         
         if g.user is None:
             app.logger.warning(f"Access denied: User ID {session.get('user_id')} in session but not found in DB. Clearing session.")
             session.pop('user_id', None)
+            session.pop('user_version', None)
             return redirect(url_for('serve_login'))
         return f(*args, **kwargs)
     return decorated_function
@@ -257,8 +956,7 @@ def admin_required(f):
             app.logger.warning("Admin access denied: User not logged in. Redirecting to admin login.")
             return redirect(url_for('serve_admin_login')) 
         
-        db = get_db()
-        g.user = db.execute("SELECT * FROM users WHERE id = ?", (session['user_id'],)).fetchone()
+        g.user = get_session_user()
         
         if g.user and g.user['is_admin'] == 1:
             app.logger.info(f"Admin access granted for user: {g.user['email']}")
@@ -269,14 +967,51 @@ def admin_required(f):
     return decorated_function
 
 
+# --- Password Hashing ---
+# Hashing is deliberately slow and CPU-bound. hashlib's scrypt and pbkdf2 release the GIL, so running
+# them on a small bounded pool lets the worker's other request threads (the Procfile runs gunicorn's
+# gthread worker) keep serving during a login burst while capping how many cores password checks can
+# occupy at once. The calling request thread still waits for its own hash.
+_password_hash_pool = ThreadPoolExecutor(max_workers=app.config['PASSWORD_HASH_WORKERS'],
+                                         thread_name_prefix='password-hash')
+
+def hash_password(password):
+    return _password_hash_pool.submit(
+        generate_password_hash, password, method=app.config['PASSWORD_HASH_METHOD']).result()
+
+def verify_password(password_hash, password):
+    return _password_hash_pool.submit(check_password_hash, password_hash, password).result()
+
+@lru_cache(maxsize=8)
+def _password_hash_prefix(method):
+    """The method prefix werkzeug writes for `method` with its defaults filled in (e.g. 'pbkdf2'
+    becomes 'pbkdf2:sha256:1000000'), found by hashing an empty password once."""
+    return generate_password_hash('', method=method).split('$', 1)[0]
+
+def password_needs_rehash(password_hash):
+    return password_hash.split('$', 1)[0] != _password_hash_prefix(app.config['PASSWORD_HASH_METHOD'])
+
+def rehash_password_if_needed(db, user, password):
+    """After a successful login, re-hashes the password with the current PASSWORD_HASH_METHOD if the
+    stored hash was made with other parameters. A failure only postpones the upgrade."""
+    if not password_needs_rehash(user['password_hash']):
+        return
+    try:
+        with db:
+            db.execute("UPDATE users SET password_hash = ? WHERE id = ? AND password_hash = ?",
+                       (hash_password(password), user['id'], user['password_hash']))
+        app.logger.info(f"Upgraded password hash for user {user['id']} to {app.config['PASSWORD_HASH_METHOD']}.")
+    except Exception as e:
+        app.logger.error(f"Failed to upgrade password hash for user {user['id']}: {e}")
+
 # --- Helper Functions ---
 
-def send_reset_email(email, token):
+def build_reset_email(email, token):
     reset_link = url_for('serve_reset_password', token=token, _external=True)
     
     msg = MIMEMultipart("alternative")
     msg['Subject'] = "KhetiHal Password Reset Request"
-    msg['From'] = EMAIL_ADDRESS
+    msg['From'] = app.config['MAIL_DEFAULT_SENDER']
     msg['To'] = email
 
     text = f"""
@@ -307,40 +1042,472 @@ def send_reset_email(email, token):
 
     msg.attach(part1)
     msg.attach(part2)
+    return msg
+
+# --- Email Outbox ---
+# Requests only add the finished message to email_outbox (usually in the same transaction as whatever
+# it is about) and return. The email worker claims due messages in batches, sends them over a single
+# authenticated SMTP connection that is kept open between batches while it stays usable, and
+# reschedules failures with exponential backoff.
+_email_outbox_wakeup = threading.Event()
+_smtp_state = {'connection': None, 'last_used': 0.0}
+
+def queue_email(cursor, msg):
+    """Adds a MIME message to the outbox. The caller commits; the worker is woken once it has."""
+    cursor.execute("INSERT INTO email_outbox (recipient, message) VALUES (?, ?)", (msg['To'], msg.as_string()))
+
+def _get_smtp_connection():
+    """Returns the worker's open SMTP connection, reconnecting (and logging in) if it was dropped."""
+    connection = _smtp_state['connection']
+    if connection is not None:
+        try:
+            if connection.noop()[0] == 250:
+                return connection
+        except smtplib.SMTPException:
+            pass
+        _close_smtp_connection()
+    smtp_class = smtplib.SMTP_SSL if app.config['MAIL_USE_SSL'] else smtplib.SMTP
+    connection = smtp_class(app.config['MAIL_SERVER'], app.config['MAIL_PORT'], timeout=30)
+    if app.config['MAIL_PASSWORD']:
+        connection.login(app.config['MAIL_USERNAME'], app.config['MAIL_PASSWORD'])
+    _smtp_state['connection'] = connection
+    app.logger.info(f"Opened SMTP connection to {app.config['MAIL_SERVER']}:{app.config['MAIL_PORT']}.")
+    return connection
+
+def _close_smtp_connection():
+    connection, _smtp_state['connection'] = _smtp_state['connection'], None
+    if connection is not None:
+        try:
+            connection.quit()
+        except Exception:
+            connection.close()
 
+def drain_email_outbox():
+    """Sends one batch of due outbox messages. Returns the number sent, 0 if nothing was due,
+    or None if the SMTP server could not be used and the rest of the batch was rescheduled."""
+    db = get_db()
+    now = time.time()
+    claim_token = secrets.token_hex(8)
+    with db:
+        db.execute("""
+            UPDATE email_outbox SET claim_token = ?, claimed_until = ?
+            WHERE id IN (
+                SELECT id FROM email_outbox
+                WHERE sent_at IS NULL AND failed_at IS NULL AND next_attempt_at <= ?
+                  AND (claimed_until IS NULL OR claimed_until < ?)
+                ORDER BY id LIMIT ?
+            )
+        """, (claim_token, now + 120, now, now, app.config['MAIL_OUTBOX_BATCH_SIZE']))
+    rows = db.execute(
+        "SELECT id, recipient, message, attempts FROM email_outbox WHERE claim_token = ? ORDER BY id",
+        (claim_token,)
+    ).fetchall()
+    if not rows:
+        return 0
+
+    sent_ids, failures, connection_error = [], [], None
+    for row in rows:
+        if connection_error is not None:
+            failures.append((row, connection_error))
+            continue
+        try:
+            _get_smtp_connection().sendmail(app.config['MAIL_DEFAULT_SENDER'], [row['recipient']], row['message'])
+            sent_ids.append(row['id'])
+        except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError) as e:
+            failures.append((row, e)) # The server rejected this message; the connection is still good.
+        except Exception as e:
+            _close_smtp_connection()
+            connection_error = e
+            failures.append((row, e))
+    _smtp_state['last_used'] = time.monotonic()
+
+    retry_updates = []
+    for row, error in failures:
+        delay = min(app.config['MAIL_RETRY_MAX'], app.config['MAIL_RETRY_BASE'] * 2 ** row['attempts'])
+        give_up = row['attempts'] + 1 >= app.config['MAIL_MAX_ATTEMPTS']
+        retry_updates.append((str(error), time.time() + delay, 1 if give_up else 0, row['id']))
+        app.logger.error(f"Failed to send email {row['id']} to {row['recipient']}"
+                         f"{', giving up' if give_up else ', will retry'}: {error}")
+    with db:
+        db.executemany("""
+            UPDATE email_outbox
+            SET sent_at = CURRENT_TIMESTAMP, last_error = NULL, claim_token = NULL, claimed_until = NULL
+            WHERE id = ?
+        """, [(email_id,) for email_id in sent_ids])
+        db.executemany("""
+            UPDATE email_outbox
+            SET attempts = attempts + 1, last_error = ?, next_attempt_at = ?, claim_token = NULL, claimed_until = NULL,
+                failed_at = CASE WHEN ? THEN CURRENT_TIMESTAMP END
+            WHERE id = ?
+        """, retry_updates)
+    if sent_ids:
+        app.logger.info(f"Sent {len(sent_ids)} queued emails.")
+    return None if connection_error is not None else len(sent_ids)
+
+def _email_outbox_worker():
+    while True:
+        _email_outbox_wakeup.wait(timeout=min(app.config['MAIL_OUTBOX_INTERVAL'], app.config['MAIL_CONNECTION_IDLE_TIMEOUT']))
+        _email_outbox_wakeup.clear()
+        try:
+            with app.app_context():
+                while drain_email_outbox():
+                    pass
+            if time.monotonic() - _smtp_state['last_used'] > app.config['MAIL_CONNECTION_IDLE_TIMEOUT']:
+                _close_smtp_connection()
+        except Exception as e:
+            app.logger.error(f"Email outbox worker failed: {e}")
+
+def parse_page_size(value):
+    """Parses a page_size query parameter, defaulting to ORDERS_PAGE_SIZE. Raises ValueError if invalid."""
+    if value in (None, ''):
+        return app.config['ORDERS_PAGE_SIZE']
     try:
-        with smtplib.SMTP_SSL('smtp.gmail.com', 465) as smtp:
-            smtp.login(EMAIL_ADDRESS, EMAIL_PASSWORD)
-            smtp.send_message(msg)
-        app.logger.info(f"Password reset email sent to {email}")
-        return True
-    except Exception as e:
-        app.logger.error(f"Failed to send email to {email}: {e}")
-        return False
+        page_size = int(value)
+    except ValueError:
+        raise ValueError('page_size must be a number.')
+    if not 1 <= page_size <= app.config['ORDERS_MAX_PAGE_SIZE']:
+        raise ValueError(f"page_size must be between 1 and {app.config['ORDERS_MAX_PAGE_SIZE']}.")
+    return page_size
+
+def encode_order_cursor(order):
+    """Encodes the (order_date, id) position of the last order on a page as an opaque cursor."""
+    raw = json.dumps([order['order_date'], order['id']]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+def decode_order_cursor(cursor):
+    """Decodes a cursor from encode_order_cursor into (order_date, id), or None if no cursor was given.
+    Raises ValueError if it is malformed."""
+    if not cursor:
+        return None
+    try:
+        order_date, order_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return str(order_date), int(order_id)
+    except (ValueError, TypeError, UnicodeEncodeError):
+        raise ValueError('Invalid cursor.')
+
+def attach_order_items(db, orders, items_query):
+    """Loads the items of all given orders with one query and stores them under each order's 'items'.
+    items_query must select order_id and contain a {placeholders} slot for the order ID list."""
+    items_by_order = {order['id']: [] for order in orders}
+    for order in orders:
+        order['items'] = items_by_order[order['id']]
+    if not orders:
+        return
+    placeholders = ', '.join('?' * len(orders))
+    for item in db.execute(items_query.format(placeholders=placeholders), [order['id'] for order in orders]):
+        item = dict(item)
+        items_by_order[item.pop('order_id')].append(item)
+
+SEARCH_TERM_PATTERN = re.compile(f"[\\w{DEVANAGARI_MARKS}]+")
+
+def build_product_search_query(text):
+    """Turns free text into an FTS5 query matching products that contain every word, each as a
+    prefix (so 'org tom' finds 'Organic Tomatoes'). Returns None if the text has no searchable words."""
+    terms = SEARCH_TERM_PATTERN.findall(text)
+    if not terms:
+        return None
+    return ' AND '.join(f'"{term}"*' for term in terms)
+
+def search_products(db, text):
+    """Full-text searches product names and descriptions, best BM25 matches first (a hit in the
+    name counts ten times one in the description)."""
+    match = build_product_search_query(text)
+    if match is None:
+        return []
+    return db.execute("""
+        SELECT p.id, p.sheet_id, p.name, p.description, p.price, p.image_url, p.stock
+        FROM products_fts
+        JOIN products p ON p.id = products_fts.rowid
+        WHERE products_fts MATCH ?
+        ORDER BY bm25(products_fts, 10.0, 1.0), p.name
+    """, (match,)).fetchall()
+
+def get_catalog_version(db):
+    """Returns the catalog version counter, which changes whenever any product row changes."""
+    row = db.execute("SELECT version FROM catalog_meta WHERE id = 1").fetchone()
+    return row[0] if row else 0
+
+# --- Product Name Suggestions ---
+# An in-memory prefix trie over normalized product names backs /api/products/suggest. Every word
+# start of a name is inserted ("organic tomatoes" and "tomatoes"), so a prefix matches at any word.
+# Each node keeps the ranked best SUGGEST_MAX_LIMIT matches below it in two lists: products whose
+# whole name starts with the node's prefix, and products that only match at a later word. A lookup
+# walks the prefix and reads those lists, so it never visits the subtree. Ranks are
+# (name length, casefolded name, ID) tuples. At most once per SUGGEST_INDEX_CHECK_INTERVAL the
+# catalog version is checked; when it moved, only products whose name changed are removed and
+# re-inserted, and only the nodes on their paths have their lists rebuilt from their children's.
+# Answers are memoized per index generation, so a lookup racing an update can't be served later.
+def _trie_node():
+    return {'children': {}, 'ids': set(), 'name_matches': [], 'word_matches': []}
+
+_suggest_index = {'root': _trie_node(), 'names': {}, 'normalized': {}, 'version': None, 'generation': 0, 'checked_at': 0.0}
+_suggest_index_lock = threading.Lock()
+
+def normalize_search_text(text):
+    return ' '.join(SEARCH_TERM_PATTERN.findall(text.casefold()))
+
+def _name_suffixes(normalized_name):
+    words = normalized_name.split(' ')
+    return {' '.join(words[i:]) for i in range(len(words))}
+
+def _trie_insert(root, key, product_id):
+    node = root
+    for char in key:
+        node = node['children'].setdefault(char, _trie_node())
+    node['ids'].add(product_id)
+
+def _trie_remove(root, key, product_id):
+    path = [root]
+    for char in key:
+        node = path[-1]['children'].get(char)
+        if node is None:
+            return
+        path.append(node)
+    path[-1]['ids'].discard(product_id)
+    # Prune nodes left without children or IDs.
+    for depth in range(len(key), 0, -1):
+        if path[depth]['children'] or path[depth]['ids']:
+            break
+        del path[depth - 1]['children'][key[depth - 1]]
+
+def _trie_rank(product_id):
+    name = _suggest_index['names'][product_id]
+    return (len(name), name.casefold(), product_id)
+
+def _trie_update_matches(root, prefixes):
+    """Rebuilds the ranked match lists of the nodes at `prefixes`, deepest first, so every node is
+    rebuilt from children that are already up to date."""
+    normalized = _suggest_index['normalized']
+    size = app.config['SUGGEST_MAX_LIMIT']
+    for prefix in sorted(prefixes, key=len, reverse=True):
+        node = root
+        for char in prefix:
+            node = node['children'].get(char)
+            if node is None:
+                break
+        if node is None:
+            continue # pruned
+        candidates = {_trie_rank(product_id) for product_id in node['ids']}
+        for child in node['children'].values():
+            candidates.update(child['name_matches'])
+            candidates.update(child['word_matches'])
+        names, words = [], []
+        for rank in candidates:
+            (names if normalized[rank[2]].startswith(prefix) else words).append(rank)
+        node['name_matches'] = heapq.nsmallest(size, names)
+        node['word_matches'] = heapq.nsmallest(size, words)
+
+def refresh_suggest_index(db, force=False):
+    """Brings the suggestion trie up to date with the products table if the catalog version moved."""
+    now = time.monotonic()
+    if not force and now - _suggest_index['checked_at'] < app.config['SUGGEST_INDEX_CHECK_INTERVAL']:
+        return
+    version = get_catalog_version(db)
+    with _suggest_index_lock:
+        _suggest_index['checked_at'] = now
+        if not force and version == _suggest_index['version']:
+            return
+        current = {row['id']: row['name'] for row in db.execute("SELECT id, name FROM products")}
+        root = _suggest_index['root']
+        names = _suggest_index['names']
+        normalized = _suggest_index['normalized']
+        touched = set()
+        changed = 0
+        for product_id, name in list(names.items()):
+            if current.get(product_id) != name:
+                for suffix in _name_suffixes(normalized[product_id]):
+                    _trie_remove(root, suffix, product_id)
+                    touched.update(suffix[:depth] for depth in range(len(suffix) + 1))
+                del names[product_id], normalized[product_id]
+                changed += 1
+        for product_id, name in current.items():
+            if product_id not in names:
+                names[product_id] = name
+                normalized[product_id] = normalize_search_text(name)
+                for suffix in _name_suffixes(normalized[product_id]):
+                    _trie_insert(root, suffix, product_id)
+                    touched.update(suffix[:depth] for depth in range(len(suffix) + 1))
+                changed += 1
+        _trie_update_matches(root, touched)
+        _suggest_index['version'] = version
+        if changed:
+            _suggest_index['generation'] += 1
+            _cached_product_suggestions.cache_clear()
+    if changed:
+        app.logger.info(f"Suggestion index updated for {changed} product changes (catalog version {version}).")
+
+@lru_cache(maxsize=2048)
+def _cached_product_suggestions(prefix, limit, generation):
+    with _suggest_index_lock:
+        node = _suggest_index['root']
+        for char in prefix:
+            node = node['children'].get(char)
+            if node is None:
+                return ()
+        # Names that start with the prefix first, then names matching at a later word.
+        ranks = (node['name_matches'] + node['word_matches'])[:limit]
+        names = _suggest_index['names']
+        return tuple({'id': product_id, 'name': names[product_id]} for _, _, product_id in ranks)
+
+def suggest_products(db, prefix, limit):
+    """Returns up to `limit` products whose name has a word starting with `prefix`."""
+    refresh_suggest_index(db)
+    normalized = normalize_search_text(prefix)
+    if not normalized:
+        return []
+    limit = min(limit, app.config['SUGGEST_MAX_LIMIT'])
+    return list(_cached_product_suggestions(normalized, limit, _suggest_index['generation']))
 
 def allowed_file(filename):
+    if filename.lower().endswith('.gz'):
+        filename = filename[:-3]
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
 
 # --- Google Sheets Helper Functions ---
 
-def get_next_sheet_id(worksheet):
-    """Generates the next sequential ID for a sheet, assuming 'id' is the first column."""
+def _scan_next_sheet_id(worksheet):
+    """Works out the next sequential ID for a sheet by reading its whole ID column (the first
+    column). Only used to seed and reconcile the local ID sequences; raises if the sheet can't be read."""
+    # Get all values from the first column (ID column)
+    ids = worksheet.col_values(1)
+    # Filter out header and empty strings, convert to int, find max
+    numeric_ids = [int(i) for i in ids[1:] if i.isdigit()] # Skip header, check if digit
+    if numeric_ids:
+        return max(numeric_ids) + 1
+    return 1 # If no numeric IDs, start from 1
+
+def allocate_sheet_ids(sequence_name, worksheet, count=1):
+    """Hands out `count` consecutive IDs for a sheet and returns the first one.
+    IDs come from a per-sheet sequence row in SQLite, so allocation is a single atomic UPDATE that is
+    safe across gunicorn workers; the sheet is only scanned the first time a sequence is used."""
+    db = get_db()
+    if db.execute("SELECT 1 FROM sheet_id_sequences WHERE name = ?", (sequence_name,)).fetchone() is None:
+        seed = _scan_next_sheet_id(worksheet)
+        with db:
+            db.execute("INSERT OR IGNORE INTO sheet_id_sequences (name, next_id, reconciled_at) VALUES (?, ?, ?)",
+                       (sequence_name, seed, time.time()))
+        app.logger.info(f"Seeded '{sequence_name}' sheet ID sequence at {seed}.")
+    with db:
+        first_id = db.execute(
+            "UPDATE sheet_id_sequences SET next_id = next_id + ? WHERE name = ? RETURNING next_id - ?",
+            (count, sequence_name, count)
+        ).fetchall()[0][0]
+    return first_id
+
+def reconcile_sheet_id_sequence(sequence_name, next_sheet_id):
+    """Moves a sequence forward if the sheet already holds IDs at or past it (e.g. rows typed in by hand).
+    Never moves it backwards, so IDs are not reused after rows are deleted from the sheet."""
+    db = get_db()
+    with db:
+        db.execute("""
+            INSERT INTO sheet_id_sequences (name, next_id, reconciled_at) VALUES (?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET
+                next_id = MAX(next_id, excluded.next_id), reconciled_at = excluded.reconciled_at
+        """, (sequence_name, next_sheet_id, time.time()))
+
+def reconcile_sheet_id_sequence_if_stale(sequence_name, worksheet):
+    """Rescans a sheet's ID column if its sequence hasn't been reconciled within SHEET_ID_RECONCILE_INTERVAL."""
+    row = get_db().execute("SELECT reconciled_at FROM sheet_id_sequences WHERE name = ?", (sequence_name,)).fetchone()
+    if row is not None and time.time() - row['reconciled_at'] < app.config['SHEET_ID_RECONCILE_INTERVAL']:
+        return
+    reconcile_sheet_id_sequence(sequence_name, _scan_next_sheet_id(worksheet))
+
+# --- Google Sheets Row Index ---
+# Per-process maps of record ID -> sheet row number and header -> column number for each worksheet,
+# built from a single get_all_values() call. They let an edit go straight to a batch_update (or
+# delete_rows) instead of find() plus header lookups first. Appends and deletions made through this
+# app update the maps in place (a deletion shifts every row below it up by one). Hand edits in the
+# sheet and writes from other gunicorn workers can move rows at any time, so before writing to rows
+# found in a map their ID cells are read back in one batch_get and checked; if any ID has moved or
+# is missing, the map is rebuilt from the sheet. Maps also expire after SHEET_INDEX_TTL seconds.
+_sheet_indexes = {}
+_sheet_indexes_lock = threading.Lock()
+
+def _build_sheet_index(sheet_name, worksheet):
+    values = worksheet.get_all_values()
+    headers = {header: col_index + 1 for col_index, header in enumerate(values[0])} if values else {}
+    rows = {}
+    for row_index, row in enumerate(values[1:], start=2):
+        if row and str(row[0]).strip().isdigit():
+            rows[int(row[0])] = row_index
+    index = {'headers': headers, 'rows': rows, 'built_at': time.monotonic()}
+    with _sheet_indexes_lock:
+        _sheet_indexes[sheet_name] = index
+    return index
+
+def get_sheet_index(sheet_name, worksheet):
+    """Returns the cached row/header index for a worksheet, rebuilding it if it has expired."""
+    with _sheet_indexes_lock:
+        index = _sheet_indexes.get(sheet_name)
+    if index is None or time.monotonic() - index['built_at'] >= app.config['SHEET_INDEX_TTL']:
+        index = _build_sheet_index(sheet_name, worksheet)
+    return index
+
+def _sheet_rows_current(worksheet, rows):
+    """Reads just the indexed ID cells and checks that each record ID is still on its row."""
+    cells = worksheet.batch_get([f"A{row_index}" for row_index in rows.values()])
+    return all(value_range and value_range[0] and str(value_range[0][0]).strip() == str(record_id)
+               for record_id, value_range in zip(rows, cells))
+
+def resolve_sheet_rows(sheet_name, worksheet, record_ids):
+    """Returns ({record ID: row number} for the IDs in the sheet, header map). Rows taken from the
+    cached index are checked against the sheet's ID column; if any moved or is missing, the index is
+    rebuilt and the rows come from that instead."""
+    record_ids = list(record_ids)
+    index = get_sheet_index(sheet_name, worksheet)
+    if not record_ids:
+        return {}, index['headers']
+    rows = {record_id: index['rows'][record_id] for record_id in record_ids if record_id in index['rows']}
+    if len(rows) < len(record_ids) or not _sheet_rows_current(worksheet, rows):
+        index = _build_sheet_index(sheet_name, worksheet)
+        rows = {record_id: index['rows'][record_id] for record_id in record_ids if record_id in index['rows']}
+    return rows, index['headers']
+
+def find_sheet_row(sheet_name, worksheet, record_id):
+    """Returns (row number or None, header map) for a record ID, checked against the sheet."""
+    rows, headers = resolve_sheet_rows(sheet_name, worksheet, [record_id])
+    return rows.get(record_id), headers
+
+def invalidate_sheet_index(sheet_name):
+    with _sheet_indexes_lock:
+        _sheet_indexes.pop(sheet_name, None)
+
+def record_sheet_rows_appended(sheet_name, record_ids, append_response):
+    """Adds freshly appended rows to the index, using the range the Sheets API reports it wrote."""
     try:
-        # Get all values from the first column (ID column)
-        ids = worksheet.col_values(1)
-        # Filter out header and empty strings, convert to int, find max
-        numeric_ids = [int(i) for i in ids[1:] if i.isdigit()] # Skip header, check if digit
-        if numeric_ids:
-            return max(numeric_ids) + 1
-        return 1 # If no numeric IDs, start from 1
-    except Exception as e:
-        app.logger.error(f"Error getting next sheet ID: {e}")
-        return 1 # Fallback to 1
-
-def get_all_sheet_products():
-    """Retrieves all products from the Google Sheet, with robust error handling for data types."""
-    if not products_sheet: return []
+        updated_range = append_response['updates']['updatedRange'].split('!')[-1]
+        first_row = a1_range_to_grid_range(updated_range)['startRowIndex'] + 1
+    except (KeyError, TypeError, ValueError, gspread.exceptions.GSpreadException):
+        invalidate_sheet_index(sheet_name) # Unknown position; rebuild on next use.
+        return
+    with _sheet_indexes_lock:
+        index = _sheet_indexes.get(sheet_name)
+        if index is not None:
+            for offset, record_id in enumerate(record_ids):
+                index['rows'][record_id] = first_row + offset
+
+def record_sheet_rows_deleted(sheet_name, start_row, end_row=None):
+    """Removes deleted rows from the index and shifts the rows below them up."""
+    end_row = end_row or start_row
+    deleted_count = end_row - start_row + 1
+    with _sheet_indexes_lock:
+        index = _sheet_indexes.get(sheet_name)
+        if index is None:
+            return
+        shifted = {}
+        for record_id, row_index in index['rows'].items():
+            if row_index < start_row:
+                shifted[record_id] = row_index
+            elif row_index > end_row:
+                shifted[record_id] = row_index - deleted_count
+        index['rows'] = shifted
+
+def _load_sheet_products():
+    """Reads all products from the Google Sheet, with robust error handling for data types.
+    Returns None (rather than an empty list) when the sheet could not be read, so callers can
+    tell a failed read apart from an empty catalog."""
+    if not products_sheet: return None
     try:
         records = products_sheet.get_all_records()
         processed_records = []
@@ -378,24 +1545,365 @@ def get_all_sheet_products():
         return processed_records
     except Exception as e:
         app.logger.error(f"Error reading products from Google Sheet: {e}")
-        return []
+        return None
+
+# --- Google Sheets -> SQLite Catalog Mirror ---
+# The storefront reads products only from the SQLite products table. A background worker (and
+# `flask sync-catalog`) pulls the products sheet, hashes every row and compares it with the hash
+# recorded in catalog_sync_state at the last sync, so only rows edited in the sheet are written,
+# all in one transaction. Local changes such as stock decremented by orders are left alone until
+# the corresponding sheet row changes. Sheet rows are matched to products through products.sheet_id;
+# the products keep ordinary local IDs, so carts, orders and links never depend on sheet IDs, and
+# products created locally (seeds, CSV imports) are only touched when a sheet row takes one over by
+# name. Writes made through this app's sheet endpoints are applied to the mirror right away by
+# mirror_sheet_products().
+_catalog_sync_status = {'last_sync_at': None, 'last_result': None, 'last_error': None}
+_catalog_sync_wakeup = threading.Event()
+_background_workers_lock = threading.Lock()
+_background_workers_started = False
+
+def _catalog_row_hash(name, description, price, image_url, stock):
+    payload = json.dumps([name, description, float(price), image_url, int(stock)])
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+def _catalog_row_values(product):
+    """(name, description, price, image_url, stock) for a product dict, coerced the way rows read
+    back from the sheet are, so the row hash matches the one the next sync computes."""
+    def text(value):
+        return '' if value is None else str(value).strip()
+    return (text(product['name']), text(product.get('description')), float(product['price']),
+            text(product.get('image_url')), int(product['stock']))
+
+def _write_catalog_row(db, product_id, sheet_id, values, row_hash):
+    """Updates the mirrored product `product_id`, or inserts a new one when it is None, and records
+    its row hash. Returns the product's local ID."""
+    if product_id is None:
+        product_id = db.execute("""
+            INSERT INTO products (sheet_id, name, description, price, image_url, stock) VALUES (?, ?, ?, ?, ?, ?)
+        """, (sheet_id, *values)).lastrowid
+    else:
+        db.execute("""
+            UPDATE products SET sheet_id = ?, name = ?, description = ?, price = ?, image_url = ?, stock = ?
+            WHERE id = ?
+        """, (sheet_id, *values, product_id))
+    db.execute("""
+        INSERT INTO catalog_sync_state (product_id, row_hash, synced_at) VALUES (?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(product_id) DO UPDATE SET row_hash = excluded.row_hash, synced_at = excluded.synced_at
+    """, (product_id, row_hash))
+    return product_id
+
+def _remove_catalog_rows(db, stock_by_id):
+    """Takes mirrored products whose sheet rows are gone out of the catalog. Products that appear in
+    past orders must stay for order history (and the order_items foreign key), so those are only
+    taken out of stock. Returns (deleted, retired) counts."""
+    if not stock_by_id:
+        return 0, 0
+    product_ids = list(stock_by_id)
+    placeholders = ', '.join('?' * len(product_ids))
+    ordered_ids = {row[0] for row in db.execute(
+        f"SELECT DISTINCT product_id FROM order_items WHERE product_id IN ({placeholders})", product_ids
+    ).fetchall()}
+    deletes = [(product_id,) for product_id in product_ids if product_id not in ordered_ids]
+    retires = [(product_id,) for product_id in product_ids if product_id in ordered_ids and stock_by_id[product_id] != 0]
+    db.executemany("DELETE FROM cart_items WHERE product_id = ?", deletes + retires)
+    db.executemany("DELETE FROM catalog_sync_state WHERE product_id = ?", deletes + retires)
+    db.executemany("DELETE FROM products WHERE id = ?", deletes)
+    db.executemany("UPDATE products SET stock = 0 WHERE id = ?", retires)
+    return len(deletes), len(retires)
+
+def _catalog_row_target(sheet_id, name, linked, holder):
+    """Picks the product a sheet row is written to: the one already linked to its sheet ID, else a
+    local product of the same name (names are unique, so that is the same product, e.g. seeded or
+    imported by CSV), else a new product (None). Raises ValueError if a local product the row is not
+    linked to holds its name."""
+    if holder is not None and holder['sheet_id'] is None:
+        if linked is None:
+            return holder['id']
+        raise ValueError(f"sheet product {sheet_id}: its name '{name}' belongs to local product {holder['id']}.")
+    return linked['id'] if linked is not None else None
+
+def sync_catalog_from_sheet():
+    """Applies products that changed in the Google Sheet to the SQLite products table.
+    Returns a summary dict, or None if the sheet could not be read."""
+    products = _load_sheet_products()
+    if products is None:
+        _catalog_sync_status['last_error'] = 'Products sheet could not be read.'
+        return None
+
+    sheet_rows = {}
+    sheet_ids_by_name = {}
+    skipped_duplicates = 0
+    for product in products:
+        if product['id'] <= 0:
+            continue
+        # Product names are unique in SQLite; a repeated name in the sheet keeps its first row.
+        if sheet_ids_by_name.setdefault(product['name'], product['id']) != product['id']:
+            skipped_duplicates += 1
+            app.logger.warning(f"Catalog sync: skipping product {product['id']}, its name '{product['name']}' is already used in the sheet.")
+            continue
+        sheet_rows[product['id']] = (product['name'], product['description'], product['price'],
+                                     product['image_url'], product['stock'])
+
+    db = get_db()
+    upgrade_db(db)
+    # The full sheet is already in hand, so keep the product ID sequence honest for free.
+    reconcile_sheet_id_sequence('products', max((p['id'] for p in products), default=0) + 1)
+    synced_hashes = dict(db.execute("SELECT product_id, row_hash FROM catalog_sync_state").fetchall())
+    local_rows = db.execute("SELECT id, sheet_id, name, stock FROM products").fetchall()
+    linked = {row['sheet_id']: row for row in local_rows if row['sheet_id'] is not None}
+    by_name = {row['name']: row for row in local_rows}
+
+    # Mirrored products holding a name the sheet gives to a different row (renames, swaps, or a
+    # retired product whose name was reused) are moved aside first so the writes can't collide.
+    # Local products are never renamed; a sheet row whose name one of them holds is skipped instead.
+    name_clashes = [(f"{row['name']} (#{row['id']})", row['id']) for row in local_rows
+                    if row['sheet_id'] is not None and sheet_ids_by_name.get(row['name'], row['sheet_id']) != row['sheet_id']]
+    clashing_ids = {product_id for _, product_id in name_clashes}
+
+    writes = []
+    skipped_conflicts = 0
+    for sheet_id, values in sheet_rows.items():
+        try:
+            product_id = _catalog_row_target(sheet_id, values[0], linked.get(sheet_id), by_name.get(values[0]))
+        except ValueError as e:
+            skipped_conflicts += 1
+            app.logger.warning(f"Catalog sync: skipping {e}")
+            continue
+        row_hash = _catalog_row_hash(*values)
+        if sheet_id not in linked or product_id in clashing_ids or synced_hashes.get(product_id) != row_hash:
+            writes.append((product_id, sheet_id, values, row_hash))
+
+    # An empty sheet is far more likely to be a bad read or an accidental clear than an
+    # intentionally empty catalog, so never wipe the storefront because of one.
+    removed = {row['id']: row['stock'] for sheet_id, row in linked.items() if sheet_id not in sheet_rows} if sheet_rows else {}
+
+    with db:
+        deleted, retired = _remove_catalog_rows(db, removed)
+        db.executemany("UPDATE products SET name = ? WHERE id = ?", name_clashes)
+        for write in writes:
+            _write_catalog_row(db, *write)
+
+    summary = {'upserted': len(writes), 'deleted': deleted, 'retired': retired,
+               'unchanged': len(sheet_rows) - len(writes) - skipped_conflicts,
+               'skipped_duplicates': skipped_duplicates, 'skipped_conflicts': skipped_conflicts}
+    _catalog_sync_status.update(last_sync_at=datetime.now().isoformat(), last_result=summary, last_error=None)
+    app.logger.info(f"Catalog sync from Google Sheet: {summary}")
+    return summary
+
+def mirror_sheet_products(changes):
+    """Applies sheet writes this request just made to the SQLite mirror, so the storefront and the
+    admin table show them without waiting for the sync worker. `changes` is a list of (sheet ID,
+    fields written) pairs, with None as the fields for a deleted row; fields of an updated row that
+    were not written are kept from the mirror. A row that can't be applied here (say its new name is
+    taken) is left to the sync worker, which is woken either way."""
+    db = get_db()
+    try:
+        with db:
+            for sheet_id, fields in changes:
+                linked = db.execute("SELECT * FROM products WHERE sheet_id = ?", (sheet_id,)).fetchone()
+                if fields is None:
+                    if linked is not None:
+                        _remove_catalog_rows(db, {linked['id']: linked['stock']})
+                    continue
+                product = dict(linked) if linked is not None else {}
+                product.update(fields)
+                values = _catalog_row_values(product)
+                holder = db.execute("SELECT id, sheet_id FROM products WHERE name = ?", (values[0],)).fetchone()
+                if holder is not None and holder['sheet_id'] is not None and holder['sheet_id'] != sheet_id:
+                    app.logger.warning(f"Sheet product {sheet_id}: name '{values[0]}' is held by sheet product {holder['sheet_id']}; leaving it to the catalog sync.")
+                    continue
+                try:
+                    product_id = _catalog_row_target(sheet_id, values[0], linked, holder)
+                except ValueError as e:
+                    app.logger.warning(f"Not mirroring {e}")
+                    continue
+                _write_catalog_row(db, product_id, sheet_id, values, _catalog_row_hash(*values))
+    except Exception as e:
+        app.logger.error(f"Failed to apply sheet product changes to the catalog mirror: {e}")
+    request_catalog_sync()
+
+def request_catalog_sync():
+    """Wakes the sync worker so a sheet edit reaches the storefront without waiting a full interval."""
+    _catalog_sync_wakeup.set()
+
+def _catalog_sync_worker():
+    while True:
+        _catalog_sync_wakeup.wait(timeout=app.config['CATALOG_SYNC_INTERVAL'])
+        _catalog_sync_wakeup.clear()
+        try:
+            with app.app_context():
+                sync_catalog_from_sheet()
+        except Exception as e:
+            _catalog_sync_status['last_error'] = str(e)
+            app.logger.error(f"Background catalog sync failed: {e}")
+
+def start_background_workers():
+    """Starts this process's background worker threads (once per process)."""
+    global _background_workers_started
+    with _background_workers_lock:
+        if _background_workers_started:
+            return
+        _background_workers_started = True
+    upgrade_db(get_db())
+    if orders_sheet:
+        _order_outbox_wakeup.set() # Pick up anything left over from a previous run.
+        threading.Thread(target=_order_outbox_worker, name='order-sheet-outbox', daemon=True).start()
+        app.logger.info("Started order sheet outbox worker.")
+    if products_sheet and app.config['CATALOG_SYNC_INTERVAL'] > 0:
+        _catalog_sync_wakeup.set() # Sync once right away, then every interval.
+        threading.Thread(target=_catalog_sync_worker, name='catalog-sync', daemon=True).start()
+        app.logger.info(f"Started catalog sync worker (every {app.config['CATALOG_SYNC_INTERVAL']}s).")
+    _email_outbox_wakeup.set() # Send anything queued before a restart.
+    threading.Thread(target=_email_outbox_worker, name='email-outbox', daemon=True).start()
+    app.logger.info("Started email outbox worker.")
+    _import_job_wakeup.set() # Resume jobs queued before a restart or left behind by a dead worker.
+    threading.Thread(target=_import_job_worker, name='csv-import', daemon=True).start()
+    app.logger.info("Started CSV import job worker.")
+
+# --- Orders Sheet Outbox ---
+# api_place_order records the sheet row for each order in order_sheet_outbox inside the same SQLite
+# transaction as the order itself, so checkout never waits on Google and a Sheets outage can't lose
+# an order. The outbox worker claims pending rows (the claim keeps other gunicorn workers off them),
+# appends them with a single append_rows call, and on failure retries with exponential backoff.
+_order_outbox_wakeup = threading.Event()
+
+def drain_order_sheet_outbox():
+    """Sends one batch of pending outbox rows to the orders sheet. Returns the number of rows
+    appended, 0 if nothing was due, or None if the batch failed and was rescheduled."""
+    if not orders_sheet: return None
+    db = get_db()
+    now = time.time()
+    claim_token = secrets.token_hex(8)
+    with db:
+        db.execute("""
+            UPDATE order_sheet_outbox SET claim_token = ?, claimed_until = ?
+            WHERE id IN (
+                SELECT id FROM order_sheet_outbox
+                WHERE sent_at IS NULL AND next_attempt_at <= ? AND (claimed_until IS NULL OR claimed_until < ?)
+                ORDER BY id LIMIT ?
+            )
+        """, (claim_token, now + 120, now, now, app.config['ORDER_OUTBOX_BATCH_SIZE']))
+    rows = db.execute(
+        "SELECT id, order_id, payload, attempts FROM order_sheet_outbox WHERE claim_token = ? ORDER BY id",
+        (claim_token,)
+    ).fetchall()
+    if not rows:
+        return 0
+
+    try:
+        first_sheet_id = allocate_sheet_ids('orders', orders_sheet, len(rows))
+        sheet_ids = [first_sheet_id + offset for offset in range(len(rows))]
+        response = orders_sheet.append_rows([[sheet_id] + json.loads(row['payload']) for sheet_id, row in zip(sheet_ids, rows)])
+        record_sheet_rows_appended('orders', sheet_ids, response)
+    except Exception as e:
+        retry_updates = []
+        for row in rows:
+            delay = min(app.config['ORDER_OUTBOX_RETRY_MAX'], app.config['ORDER_OUTBOX_RETRY_BASE'] * 2 ** row['attempts'])
+            retry_updates.append((str(e), time.time() + delay, row['id']))
+        with db:
+            db.executemany("""
+                UPDATE order_sheet_outbox
+                SET attempts = attempts + 1, last_error = ?, next_attempt_at = ?, claim_token = NULL, claimed_until = NULL
+                WHERE id = ?
+            """, retry_updates)
+        app.logger.error(f"Failed to append {len(rows)} orders to Google Sheet, will retry: {e}")
+        return None
+
+    with db:
+        db.executemany("""
+            UPDATE order_sheet_outbox
+            SET sent_at = CURRENT_TIMESTAMP, sheet_id = ?, last_error = NULL, claim_token = NULL, claimed_until = NULL
+            WHERE id = ?
+        """, [(sheet_id, row['id']) for sheet_id, row in zip(sheet_ids, rows)])
+    app.logger.info(f"Recorded orders {[row['order_id'] for row in rows]} in Google Sheet.")
+    return len(rows)
+
+def _order_outbox_worker():
+    while True:
+        _order_outbox_wakeup.wait(timeout=app.config['ORDER_OUTBOX_INTERVAL'])
+        _order_outbox_wakeup.clear()
+        try:
+            with app.app_context():
+                reconcile_sheet_id_sequence_if_stale('orders', orders_sheet)
+                while drain_order_sheet_outbox():
+                    pass
+        except Exception as e:
+            app.logger.error(f"Order sheet outbox worker failed: {e}")
+
+def get_order_sheet_outbox_stats():
+    db = get_db()
+    stats = db.execute("""
+        SELECT COUNT(*) FILTER (WHERE sent_at IS NULL) AS pending,
+               COUNT(*) FILTER (WHERE sent_at IS NOT NULL) AS sent,
+               COUNT(*) FILTER (WHERE sent_at IS NULL AND attempts > 0) AS retrying,
+               MIN(CASE WHEN sent_at IS NULL THEN created_at END) AS oldest_pending_at
+        FROM order_sheet_outbox
+    """).fetchone()
+    last_error = db.execute(
+        "SELECT order_id, attempts, last_error FROM order_sheet_outbox WHERE sent_at IS NULL AND last_error IS NOT NULL ORDER BY id DESC LIMIT 1"
+    ).fetchone()
+    result = dict(stats)
+    result['last_error'] = dict(last_error) if last_error else None
+    return result
+
+@app.before_request
+def ensure_background_workers():
+    if not _background_workers_started:
+        start_background_workers()
+
+SHEET_PRODUCT_FIELDS = ('name', 'description', 'price', 'image_url', 'stock')
+
+def _sheet_product_row(product_data):
+    """Orders product data to match the sheet headers: id, name, description, price, image_url, stock."""
+    return [product_data.get('id')] + [product_data.get(field) for field in SHEET_PRODUCT_FIELDS]
+
+def validate_sheet_product_fields(data, require_all):
+    """Checks and coerces product fields for the Google Sheet.
+    Returns (clean_data, None) on success or (None, error_message)."""
+    if not isinstance(data, dict):
+        return None, 'Product data must be an object.'
+    unknown = set(data) - set(SHEET_PRODUCT_FIELDS)
+    if unknown:
+        return None, f"Unknown product fields: {', '.join(sorted(unknown))}."
+    if require_all and not all(data.get(field) not in (None, '') for field in ('name', 'price', 'stock')):
+        return None, 'Name, price and stock are required.'
+    clean = {}
+    for field, value in data.items():
+        if value is None:
+            continue
+        if field == 'price':
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                return None, f"Invalid price '{value}'."
+            if value < 0:
+                return None, 'Price cannot be negative.'
+        elif field == 'stock':
+            try:
+                value = int(value)
+            except (TypeError, ValueError):
+                return None, f"Invalid stock '{value}'."
+            if value < 0:
+                return None, 'Stock cannot be negative.'
+        else:
+            value = str(value).strip()
+            if field == 'name' and not value:
+                return None, 'Name cannot be empty.'
+        clean[field] = value
+    if not clean:
+        return None, 'No product fields provided.'
+    return clean, None
 
 def add_sheet_product(product_data):
     """Adds a new product to the Google Sheet."""
     if not products_sheet: return False
     try:
         # Get next ID and add to data
-        product_data['id'] = get_next_sheet_id(products_sheet)
-        # Ensure data matches sheet headers order: id, name, description, price, image_url, stock
-        row_data = [
-            product_data.get('id'),
-            product_data.get('name'),
-            product_data.get('description'),
-            product_data.get('price'),
-            product_data.get('image_url'),
-            product_data.get('stock')
-        ]
-        products_sheet.append_row(row_data)
+        product_data['id'] = allocate_sheet_ids('products', products_sheet)
+        row_data = _sheet_product_row(product_data)
+        response = products_sheet.append_row(row_data)
+        record_sheet_rows_appended('products', [product_data['id']], response)
+        mirror_sheet_products([(product_data['id'], product_data)])
         app.logger.info(f"Added product to Google Sheet: {product_data.get('name')}")
         return True
     except Exception as e:
@@ -406,25 +1914,18 @@ def update_sheet_product(product_id, product_data):
     """Updates an existing product in the Google Sheet by ID."""
     if not products_sheet: return False
     try:
-        # Find the row by ID. Assuming ID is in the first column.
-        cell = products_sheet.find(str(product_id), in_column=1) # Find cell with product_id in first column
-        if cell:
-            row_index = cell.row
-            # Prepare data to update. Ensure order matches sheet headers.
+        # Find the row and header columns from the cached sheet index.
+        row_index, headers = find_sheet_row('products', products_sheet, product_id)
+        if row_index:
             # Only update provided fields, keep others as they are if not provided.
-            # For simplicity, we'll fetch current row and update specific cells.
-            current_row_values = products_sheet.row_values(row_index)
-            # Assuming headers are: id, name, description, price, image_url, stock
-            headers = products_sheet.row_values(1) # Get headers from first row
-
-            update_cells = []
-            for col_index, header in enumerate(headers):
-                if header in product_data:
-                    # gspread uses 1-based indexing for columns
-                    update_cells.append(gspread.Cell(row_index, col_index + 1, product_data[header]))
+            update_ranges = [
+                {'range': rowcol_to_a1(row_index, col_index), 'values': [[product_data[header]]]}
+                for header, col_index in headers.items() if header in product_data
+            ]
             
-            if update_cells:
-                products_sheet.update_cells(update_cells)
+            if update_ranges:
+                products_sheet.batch_update(update_ranges)
+                mirror_sheet_products([(product_id, product_data)])
                 app.logger.info(f"Updated product {product_id} in Google Sheet.")
                 return True
             return False # No fields to update
@@ -432,6 +1933,7 @@ def update_sheet_product(product_id, product_data):
             app.logger.warning(f"Product with ID {product_id} not found in Google Sheet for update.")
             return False
     except Exception as e:
+        invalidate_sheet_index('products')
         app.logger.error(f"Error updating product {product_id} in Google Sheet: {e}")
         return False
 
@@ -439,18 +1941,152 @@ def delete_sheet_product(product_id):
     """Deletes a product from the Google Sheet by ID."""
     if not products_sheet: return False
     try:
-        cell = products_sheet.find(str(product_id), in_column=1)
-        if cell:
-            products_sheet.delete_rows(cell.row)
+        row_index, _ = find_sheet_row('products', products_sheet, product_id)
+        if row_index:
+            products_sheet.delete_rows(row_index)
+            record_sheet_rows_deleted('products', row_index)
+            mirror_sheet_products([(product_id, None)])
             app.logger.info(f"Deleted product {product_id} from Google Sheet.")
             return True
         else:
             app.logger.warning(f"Product with ID {product_id} not found in Google Sheet for deletion.")
             return False
     except Exception as e:
+        invalidate_sheet_index('products')
         app.logger.error(f"Error deleting product {product_id} from Google Sheet: {e}")
         return False
 
+def _coalesce_rows_bottom_up(row_indexes):
+    """Groups row numbers into contiguous (start, end) ranges, ordered from the bottom of the sheet up
+    so deleting one range never shifts the rows of a range still to be deleted."""
+    ranges = []
+    for row_index in sorted(row_indexes, reverse=True):
+        if ranges and ranges[-1][0] == row_index + 1:
+            ranges[-1][0] = row_index
+        else:
+            ranges.append([row_index, row_index])
+    return [tuple(r) for r in ranges]
+
+def bulk_mutate_sheet_products(operations):
+    """Validates and applies a list of add/update/delete operations to the products sheet using at
+    most one batch_update for updates, one batched row deletion and one append_rows for additions.
+    Returns (results, errors): when validation fails nothing is written, results is None and errors
+    lists the offending operations; otherwise results has one entry per operation."""
+    if not isinstance(operations, list) or not operations:
+        return None, [{'index': None, 'message': 'Operations must be a non-empty list.'}]
+
+    adds, updates, deletes, errors = [], [], [], []
+    seen_ids = set()
+    for position, operation in enumerate(operations):
+        op = operation.get('op') if isinstance(operation, dict) else None
+        if op not in ('add', 'update', 'delete'):
+            errors.append({'index': position, 'message': "Operation 'op' must be 'add', 'update' or 'delete'."})
+            continue
+        if op == 'add':
+            product, error = validate_sheet_product_fields(operation.get('product'), require_all=True)
+            if error:
+                errors.append({'index': position, 'message': error})
+            else:
+                adds.append((position, product))
+            continue
+
+        try:
+            product_id = int(operation.get('id'))
+        except (TypeError, ValueError):
+            errors.append({'index': position, 'message': 'A numeric product id is required.'})
+            continue
+        if product_id in seen_ids:
+            errors.append({'index': position, 'message': f'Product {product_id} appears in more than one operation.'})
+            continue
+        seen_ids.add(product_id)
+        if op == 'delete':
+            deletes.append((position, product_id))
+            continue
+        product, error = validate_sheet_product_fields(operation.get('product'), require_all=False)
+        if error:
+            errors.append({'index': position, 'message': error})
+        else:
+            updates.append((position, product_id, product))
+    if errors:
+        return None, errors
+
+    # Row numbers are resolved (and checked against the sheet's ID column) only now, right before
+    # the ranges are built, so rows moved by hand or by another worker are never written to.
+    # Add-only batches need no row lookup at all.
+    if updates or deletes:
+        rows, headers = resolve_sheet_rows('products', products_sheet, seen_ids)
+        for position, product_id, *rest in sorted(updates + deletes):
+            if product_id not in rows:
+                errors.append({'index': position, 'message': f'Product {product_id} not found in Google Sheet.'})
+            elif rest and not all(field in headers for field in rest[0]):
+                errors.append({'index': position, 'message': 'Product sheet is missing a column for one of the fields.'})
+        if errors:
+            return None, errors
+        updates = [(position, product_id, rows[product_id], product) for position, product_id, product in updates]
+        deletes = [(position, product_id, rows[product_id]) for position, product_id in deletes]
+
+    results = [None] * len(operations)
+
+    # Updates first, while every row number in the index is still valid.
+    if updates:
+        update_ranges = [
+            {'range': rowcol_to_a1(row_index, headers[field]), 'values': [[value]]}
+            for _, _, row_index, product in updates for field, value in product.items()
+        ]
+        try:
+            products_sheet.batch_update(update_ranges)
+            outcome = {'success': True}
+        except Exception as e:
+            invalidate_sheet_index('products')
+            app.logger.error(f"Bulk product update in Google Sheet failed: {e}")
+            outcome = {'success': False, 'message': f'Update failed: {e}'}
+        for position, product_id, _, _ in updates:
+            results[position] = {'index': position, 'op': 'update', 'id': product_id, **outcome}
+
+    # Deletes next, as contiguous ranges from the bottom up, in one spreadsheet batch request.
+    if deletes:
+        row_ranges = _coalesce_rows_bottom_up(row_index for _, _, row_index in deletes)
+        requests_body = [{
+            'deleteDimension': {
+                'range': {'sheetId': products_sheet.id, 'dimension': 'ROWS', 'startIndex': start - 1, 'endIndex': end}
+            }
+        } for start, end in row_ranges]
+        try:
+            products_sheet.spreadsheet.batch_update({'requests': requests_body})
+            for start, end in row_ranges:
+                record_sheet_rows_deleted('products', start, end)
+            outcome = {'success': True}
+        except Exception as e:
+            invalidate_sheet_index('products')
+            app.logger.error(f"Bulk product delete in Google Sheet failed: {e}")
+            outcome = {'success': False, 'message': f'Delete failed: {e}'}
+        for position, product_id, _ in deletes:
+            results[position] = {'index': position, 'op': 'delete', 'id': product_id, **outcome}
+
+    # Additions last; they land below everything else.
+    if adds:
+        try:
+            first_id = allocate_sheet_ids('products', products_sheet, len(adds))
+            new_ids = [first_id + offset for offset in range(len(adds))]
+            rows = [_sheet_product_row(dict(product, id=product_id)) for (_, product), product_id in zip(adds, new_ids)]
+            response = products_sheet.append_rows(rows)
+            record_sheet_rows_appended('products', new_ids, response)
+            for (position, _), product_id in zip(adds, new_ids):
+                results[position] = {'index': position, 'op': 'add', 'id': product_id, 'success': True}
+        except Exception as e:
+            app.logger.error(f"Bulk product add to Google Sheet failed: {e}")
+            for position, _ in adds:
+                results[position] = {'index': position, 'op': 'add', 'success': False, 'message': f'Add failed: {e}'}
+
+    # Deletes go to the mirror first so names they free can be taken by the updates and adds.
+    mirror_sheet_products(
+        [(product_id, None) for position, product_id, _ in deletes if results[position]['success']]
+        + [(product_id, product) for position, product_id, _, product in updates if results[position]['success']]
+        + [(results[position]['id'], product) for position, product in adds if results[position]['success']]
+    )
+    app.logger.info(f"Bulk product change in Google Sheet: {len(adds)} added, {len(updates)} updated, {len(deletes)} deleted.")
+    return results, None
+
 def get_all_sheet_orders():
     """Retrieves all orders from the Google Sheet."""
     if not orders_sheet: return []
@@ -476,39 +2112,332 @@ def update_sheet_order_status(order_id, new_status):
     """Updates the status of an order in the Google Sheet by ID."""
     if not orders_sheet: return False
     try:
-        cell = orders_sheet.find(str(order_id), in_column=1) # Assuming ID is in the first column
-        if cell:
+        row_index, headers = find_sheet_row('orders', orders_sheet, order_id)
+        if row_index:
             # Find the column index for 'status'
-            headers = orders_sheet.row_values(1)
-            try:
-                status_col_index = headers.index('status') + 1 # +1 for 1-based indexing
-            except ValueError:
+            status_col_index = headers.get('status')
+            if status_col_index is None:
                 app.logger.error("'status' column not found in Orders Google Sheet headers.")
                 return False
 
-            orders_sheet.update_cell(cell.row, status_col_index, new_status)
+            orders_sheet.batch_update([{'range': rowcol_to_a1(row_index, status_col_index), 'values': [[new_status]]}])
             app.logger.info(f"Updated order {order_id} status to {new_status} in Google Sheet.")
             return True
         else:
             app.logger.warning(f"Order with ID {order_id} not found in Google Sheet for status update.")
             return False
     except Exception as e:
+        invalidate_sheet_index('orders')
         app.logger.error(f"Error updating order {order_id} status in Google Sheet: {e}")
         return False
 
 
+# --- HTTP Caching ---
+# Product listings only change when the catalog does, so they carry the catalog version as their
+# ETag and its last change as Last-Modified, and a browser revalidating an unchanged listing gets a
+# 304 without the listing query. Static files are linked through static_url(), which puts a digest
+# of the file's content into its name (js/core.js -> js/core.1a2b3c4d5e6f.js); those URLs never change
+# content, so they are served with a one-year immutable Cache-Control.
+STATIC_FINGERPRINT_PATTERN = re.compile(r'^(?P<stem>.+)\.(?P<digest>[0-9a-f]{12})(?P<ext>\.[A-Za-z0-9]+)$')
+_static_fingerprints = {} # path -> (mtime, size, digest)
+# Page scripts are ES modules: js/core.js, shared by every page, and one entry module per page under
+# js/pages/, which import each other with relative specifiers ('../core.js').
+JS_IMPORT_PATTERN = re.compile(r"""(\b(?:from|import)\s*)(['"])(\.{1,2}/[^'"]+)\2""")
+_module_imports = {} # path -> (mtime, [static-relative imports])
+
+def match_etag(etag):
+    """Returns the If-None-Match entry naming this resource version, in any of the encodings
+    compress_response tags ETags with, or None if there is none."""
+    for tag in (etag, *(f"{etag}-{encoding}" for encoding in COMPRESS_ENCODINGS)):
+        if request.if_none_match.contains(tag):
+            return tag
+    return None
+
+def catalog_conditional(f):
+    """Adds catalog ETag/Last-Modified validators to a listing view and answers matching
+    conditional requests with 304 before the view runs."""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        row = get_read_db().execute("SELECT version, updated_at FROM catalog_meta WHERE id = 1").fetchone()
+        if row is None:
+            return f(*args, **kwargs)
+        etag = f"catalog-{row['version']}"
+        last_modified = datetime.strptime(row['updated_at'], '%Y-%m-%d %H:%M:%S') if row['updated_at'] else None
+        matched_etag = None
+        if request.if_none_match:
+            matched_etag = match_etag(etag)
+            not_modified = matched_etag is not None
+        else:
+            not_modified = bool(last_modified and request.if_modified_since
+                                and request.if_modified_since.replace(tzinfo=None) >= last_modified)
+        response = Response(status=304) if not_modified else app.make_response(f(*args, **kwargs))
+        if response.status_code in (200, 304):
+            response.set_etag(matched_etag or etag)
+            if last_modified:
+                response.last_modified = last_modified
+            response.headers['Cache-Control'] = 'public, no-cache'
+        return response
+    return decorated_function
+
+def static_path(filename):
+    """Filesystem path of a static-relative name, or None if the name would lead outside the static
+    folder (an absolute path or '..' segments), so such names are never hashed, read or served."""
+    return safe_join(app.static_folder, filename)
+
+def static_fingerprint(filename):
+    """Returns a short content digest of a file under the static folder, or None if it doesn't exist."""
+    path = static_path(filename)
+    if path is None:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    cached = _static_fingerprints.get(path)
+    if cached and cached[:2] == (stat.st_mtime, stat.st_size):
+        return cached[2]
+    with open(path, 'rb') as handle:
+        digest = hashlib.sha256(handle.read()).hexdigest()[:12]
+    _static_fingerprints[path] = (stat.st_mtime, stat.st_size, digest)
+    return digest
+
+def _built_asset(output, sources):
+    """Returns the static-relative path of a build-assets output if it exists and is newer than all
+    of its sources, so an edited source is served as-is until the next build."""
+    built = posixpath.join(app.config['ASSET_BUILD_DIR'], output)
+    paths = [static_path(name) for name in [built, *sources]]
+    if None in paths:
+        return None
+    try:
+        built_mtime = os.stat(paths[0]).st_mtime
+        if all(os.stat(path).st_mtime <= built_mtime for path in paths[1:]):
+            return built
+    except OSError:
+        pass
+    return None
+
+def module_imports(filename):
+    """Static-relative paths of the modules a JS module under the static folder imports directly."""
+    path = static_path(filename)
+    if path is None:
+        return []
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return []
+    cached = _module_imports.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with open(path, encoding='utf-8') as handle:
+        imports = [posixpath.normpath(posixpath.join(posixpath.dirname(filename), m[3]))
+                   for m in JS_IMPORT_PATTERN.finditer(handle.read())]
+    _module_imports[path] = (mtime, imports)
+    return imports
+
+def module_dependencies(filename):
+    """Every module a JS module imports, directly or through its imports, dependencies first."""
+    ordered, seen = [], {filename}
+    def visit(name):
+        for dependency in module_imports(name):
+            if dependency not in seen:
+                seen.add(dependency)
+                visit(dependency)
+                ordered.append(dependency)
+    visit(filename)
+    return ordered
+
+@app.template_global()
+def static_url(filename):
+    """URL of a static file with its content digest in the name, for templates: {{ static_url('style.css') }}.
+    Points at the minified build of the file when one is up to date."""
+    sources = [filename] + module_dependencies(filename) if filename.endswith('.js') else [filename]
+    filename = _built_asset(filename, sources) or filename
+    digest = static_fingerprint(filename)
+    if digest is None:
+        return url_for('static', filename=filename)
+    stem, ext = os.path.splitext(filename)
+    return url_for('static', filename=f"{stem}.{digest}{ext}")
+
+def stylesheet_bundle_name(filenames):
+    return 'bundles/' + '-'.join(os.path.splitext(posixpath.basename(name))[0] for name in filenames) + '.css'
+
+@app.template_global()
+def stylesheets(*filenames):
+    """<link> tags for a page's stylesheets: one tag for their built bundle when it is up to date,
+    otherwise one per file, in order."""
+    bundle = _built_asset(stylesheet_bundle_name(filenames), filenames)
+    hrefs = [static_url(bundle)] if bundle else [static_url(name) for name in filenames]
+    return Markup('\n'.join(f'<link rel="stylesheet" href="{href}">' for href in hrefs))
+
+@app.template_global()
+def page_script(entry):
+    """<script type="module"> tag for a page's entry module, preceded by modulepreload links for the
+    modules it imports so the browser fetches them alongside it rather than one import level at a time."""
+    dependencies = module_dependencies(entry)
+    # A built entry imports the fingerprinted builds of its dependencies, a source entry their sources.
+    built = _built_asset(entry, [entry] + dependencies)
+    hrefs = [static_url(name) if built else url_for('static', filename=name) for name in dependencies]
+    tags = [f'<link rel="modulepreload" href="{href}">' for href in hrefs]
+    tags.append(f'<script type="module" src="{static_url(entry)}"></script>')
+    return Markup('\n'.join(tags))
+
+# Content-Encoding of each precompressed variant written by build-assets, best first.
+PRECOMPRESSED_ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+
+def _send_static_variant(filename):
+    """Sends a static file, or its precompressed .br/.gz sibling when the client accepts that encoding
+    and the sibling is at least as new as the file."""
+    path = static_path(filename)
+    if path is None:
+        abort(404)
+    for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+        if not request.accept_encodings[encoding]:
+            continue
+        try:
+            if os.stat(path + suffix).st_mtime < os.stat(path).st_mtime:
+                continue
+        except OSError:
+            continue
+        response = send_from_directory(app.static_folder, filename + suffix,
+                                       mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream')
+        response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        return response
+    response = app.send_static_file(filename)
+    if os.path.exists(path + PRECOMPRESSED_ENCODINGS[-1][1]):
+        response.vary.add('Accept-Encoding')
+    return response
+
+@app.endpoint('static')
+def serve_static_asset(filename):
+    """Flask's static view, extended to serve fingerprinted names with a long immutable lifetime
+    and to prefer precompressed variants."""
+    match = STATIC_FINGERPRINT_PATTERN.match(filename)
+    if match:
+        original = match['stem'] + match['ext']
+        digest = static_fingerprint(original)
+        if digest is not None:
+            response = _send_static_variant(original)
+            if digest == match['digest']:
+                response.headers['Cache-Control'] = f"public, max-age={app.config['STATIC_IMMUTABLE_MAX_AGE']}, immutable"
+            return response
+    return _send_static_variant(filename)
+
+# --- Response Compression ---
+# JSON and HTML responses (catalog listings, order history, the admin orders payload) compress several
+# times over, so they are brotli- or gzip-encoded for clients that accept it. Static files are
+# skipped: send_file responses are passed through as-is, and build-assets precompresses them.
+# Streamed responses (ndjson order exports) are left alone since compressing them would buffer the stream.
+# A compressed body is a different byte sequence, so a strong ETag gets the encoding appended
+# ('"catalog-7-br"'); match_etag accepts any encoded form of a version when checking If-None-Match.
+COMPRESS_ENCODINGS = ('br', 'gzip')
+
+def compress_body(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=app.config['COMPRESS_BROTLI_QUALITY'])
+    return gzip.compress(data, compresslevel=app.config['COMPRESS_LEVEL'], mtime=0)
+
+def response_encoding(data):
+    """The Content-Encoding the current request should get a body of this size in, or None."""
+    if len(data) < app.config['COMPRESS_MIN_SIZE']:
+        return None
+    return request.accept_encodings.best_match(['br', 'gzip'] if brotli else ['gzip'])
+
+@app.after_request
+def compress_response(response):
+    if (response.direct_passthrough or response.is_streamed or request.method == 'HEAD'
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in app.config['COMPRESS_MIMETYPES']):
+        return response
+    response.vary.add('Accept-Encoding')
+    data = response.get_data()
+    encoding = response_encoding(data)
+    if encoding is None:
+        return response
+    response.set_data(compress_body(data, encoding))
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f"{etag}-{encoding}", weak)
+    return response
+
+# --- Rendered Page Cache ---
+# The public pages only vary by whether the visitor is logged in (and the products page by the
+# catalog), so each process keeps their rendered HTML, keyed by endpoint, login state and, for
+# catalog pages, the catalog version. Entries also keep the compressed bodies they have been served
+# as, so a hit costs neither a template render nor a compression. Catalog entries are dropped as
+# soon as the catalog version is seen to move; every entry expires after PAGE_CACHE_TTL so template
+# and static asset changes show up, and admins can purge the cache outright.
+_page_cache = {'pages': {}, 'catalog_version': None, 'checked_at': 0.0}
+_page_cache_lock = threading.Lock()
+
+def _page_cache_catalog_version():
+    """Returns the catalog version, reading it at most once per PAGE_CACHE_CHECK_INTERVAL and
+    dropping cached catalog pages when it has moved."""
+    now = time.monotonic()
+    with _page_cache_lock:
+        if now - _page_cache['checked_at'] < app.config['PAGE_CACHE_CHECK_INTERVAL']:
+            return _page_cache['catalog_version']
+    version = get_catalog_version(get_read_db())
+    with _page_cache_lock:
+        if version != _page_cache['catalog_version']:
+            pages = _page_cache['pages']
+            for key in [key for key in pages if key[2] is not None and key[2] != version]:
+                del pages[key]
+            _page_cache['catalog_version'] = version
+        _page_cache['checked_at'] = now
+    return version
+
+def purge_page_cache():
+    """Drops every cached page and returns how many there were."""
+    with _page_cache_lock:
+        count = len(_page_cache['pages'])
+        _page_cache['pages'].clear()
+        _page_cache['checked_at'] = 0.0
+    return count
+
+def cached_page(catalog=False):
+    """Caches a page view's rendered HTML per login state (and catalog version, for catalog pages).
+    The view must not depend on anything else about the request."""
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if app.config['PAGE_CACHE_TTL'] <= 0:
+                return f(*args, **kwargs)
+            key = (request.endpoint, 'user_id' in session, _page_cache_catalog_version() if catalog else None)
+            now = time.monotonic()
+            with _page_cache_lock:
+                entry = _page_cache['pages'].get(key)
+            if entry is None or now - entry['cached_at'] >= app.config['PAGE_CACHE_TTL']:
+                response = app.make_response(f(*args, **kwargs))
+                if response.status_code != 200 or response.is_streamed:
+                    return response
+                entry = {'body': response.get_data(), 'mimetype': response.mimetype, 'cached_at': now, 'encoded': {}}
+                with _page_cache_lock:
+                    _page_cache['pages'][key] = entry
+            encoding = response_encoding(entry['body'])
+            if encoding and encoding not in entry['encoded']:
+                entry['encoded'][encoding] = compress_body(entry['body'], encoding)
+            response = app.response_class(entry['encoded'][encoding] if encoding else entry['body'],
+                                          mimetype=entry['mimetype'])
+            if encoding:
+                response.headers['Content-Encoding'] = encoding
+            response.vary.add('Accept-Encoding')
+            return response
+        return decorated_function
+    return decorator
+
 # --- Routes for Serving HTML Pages (Customer-Facing) ---
 @app.route('/')
+@cached_page()
 def serve_index():
     return render_template('index.html', is_logged_in='user_id' in session)
 
 @app.route('/products.html')
+@cached_page(catalog=True)
 def serve_products():
-    db = get_db()
-    cursor = db.cursor()
-    cursor.execute("SELECT * FROM products")
-    products = cursor.fetchall()
-    return render_template('products.html', products=products, is_logged_in='user_id' in session)
+    # The product grid is filled in by the page script from /api/admin/sheets/products.
+    return render_template('products.html', is_logged_in='user_id' in session)
 
 @app.route('/cart.html')
 @login_required
@@ -525,15 +2454,6 @@ def serve_checkout():
 def serve_payment():
     user_id = session.get('user_id')
     app.logger.info(f"Serving payment.html for user_id: {user_id}")
-    db = get_db()
-    cursor = db.cursor()
-    cart_items = cursor.execute("""
-        SELECT ci.product_id, ci.quantity, p.name, p.price, p.image_url
-        FROM cart_items ci
-        JOIN products p ON ci.product_id = p.id
-        WHERE ci.user_id = ?
-    """, (user_id,)).fetchall()
-    app.logger.info(f"Payment page load: User {user_id} has {len(cart_items)} items in cart from DB.")
     return render_template('payment.html', is_logged_in='user_id' in session)
 
 @app.route('/login.html')
@@ -553,14 +2473,17 @@ def serve_reset_password():
     return render_template('reset_password.html', is_logged_in='user_id' in session)
 
 @app.route('/about.html')
+@cached_page()
 def serve_about():
     return render_template('about.html', is_logged_in='user_id' in session)
 
 @app.route('/services.html')
+@cached_page()
 def serve_services():
     return render_template('services.html', is_logged_in='user_id' in session)
 
 @app.route('/contact.html')
+@cached_page()
 def serve_contact():
     return render_template('contact.html', is_logged_in='user_id' in session)
 
@@ -636,7 +2559,7 @@ def api_register():
     if not username or not email or not password:
         return jsonify({'success': False, 'message': 'All fields are required.'}), 400
 
-    hashed_password = generate_password_hash(password)
+    hashed_password = hash_password(password)
 
     try:
         cursor.execute("SELECT id FROM users WHERE username = ? OR email = ?", (username, email))
@@ -662,12 +2585,13 @@ def api_login():
 
     user = cursor.execute("SELECT * FROM users WHERE email = ?", (email,)).fetchone()
 
-    if user and check_password_hash(user['password_hash'], password):
+    if user and verify_password(user['password_hash'], password):
         if user['is_admin'] == 1:
             app.logger.warning(f"Admin user {user['username']} attempted to log in via customer login.")
             return jsonify({'success': False, 'message': 'Administrators must use the admin login portal.'}), 403
         
-        session['user_id'] = user['id']
+        rehash_password_if_needed(db, user, password)
+        start_user_session(user)
         app.logger.info(f"Customer logged in: {user['username']}")
         return jsonify({'success': True, 'message': 'Login successful!', 'redirect': url_for('serve_index')}), 200
     else:
@@ -686,11 +2610,12 @@ def api_admin_login():
     app.logger.info(f"Admin login attempt for email: {email}")
     if user:
         app.logger.info(f"User found: {user['email']}, is_admin: {user['is_admin']}")
-        password_matches = check_password_hash(user['password_hash'], password)
+        password_matches = verify_password(user['password_hash'], password)
         app.logger.info(f"Password check result: {password_matches}")
 
         if password_matches and user['is_admin'] == 1:
-            session['user_id'] = user['id']
+            rehash_password_if_needed(db, user, password)
+            start_user_session(user)
             app.logger.info(f"Admin logged in successfully: {user['username']}")
             return jsonify({'success': True, 'message': 'Admin login successful!', 'redirect': url_for('serve_admin_dashboard')}), 200
         else:
@@ -708,6 +2633,7 @@ def api_admin_login():
 @login_required
 def api_logout():
     user_id = session.pop('user_id', None)
+    session.pop('user_version', None)
     if user_id:
         app.logger.info(f"User {user_id} logged out.")
         return jsonify({'success': True, 'message': 'You have been logged out.'}), 200
@@ -739,13 +2665,12 @@ def api_forgot_password():
         cursor.execute("DELETE FROM password_reset_tokens WHERE user_id = ?", (user['id'],))
         cursor.execute("INSERT INTO password_reset_tokens (user_id, token, expires_at) VALUES (?, ?, ?)",
                        (user['id'], token, expires_at))
+        queue_email(cursor, build_reset_email(email, token))
         db.commit()
+        _email_outbox_wakeup.set()
 
-        if send_reset_email(email, token):
-            app.logger.info(f"Password reset token generated and email sent for user {user['id']}.")
-            return jsonify({'success': True, 'message': 'If an account with that email exists, a password reset link has been sent.'}), 200
-        else:
-            return jsonify({'success': False, 'message': 'Failed to send password reset email. Please try again later.'}), 500
+        app.logger.info(f"Password reset token generated and email queued for user {user['id']}.")
+        return jsonify({'success': True, 'message': 'If an account with that email exists, a password reset link has been sent.'}), 200
     except Exception as e:
         app.logger.error(f"Error generating or saving reset token for user {user['id']}: {e}")
         return jsonify({'success': False, 'message': 'An unexpected error occurred.'}), 500
@@ -772,10 +2697,11 @@ def api_reset_password():
         db.commit()
         return jsonify({'success': False, 'message': 'Invalid or expired reset token.'}), 400
 
-    hashed_password = generate_password_hash(new_password)
+    hashed_password = hash_password(new_password)
 
     try:
         cursor.execute("UPDATE users SET password_hash = ? WHERE id = ?", (hashed_password, reset_entry['user_id']))
+        record_user_change(cursor, reset_entry['user_id'])
         cursor.execute("DELETE FROM password_reset_tokens WHERE token = ?", (token,))
         db.commit()
         app.logger.info(f"Password for user {reset_entry['user_id']} reset successfully.")
@@ -797,6 +2723,41 @@ def api_contact_us():
 
     return jsonify({'success': True, 'message': 'Your message has been sent successfully!'}), 200
 
+# A cart snapshot depends on the user's cart rows and on the products they reference, so its ETag
+# combines the per-user cart version (bumped by triggers on cart_items) with the catalog version.
+def get_cart_etag(db, user_id):
+    cart_version, catalog_version = db.execute("""
+        SELECT COALESCE((SELECT version FROM cart_versions WHERE user_id = ?), 0),
+               COALESCE((SELECT version FROM catalog_meta WHERE id = 1), 0)
+    """, (user_id,)).fetchone()
+    return f"cart-{user_id}-{cart_version}-{catalog_version}"
+
+def fetch_cart_snapshot(db, user_id):
+    """Returns the cart's items with its item count and totals, all from one query."""
+    rows = db.execute("""
+        SELECT ci.product_id, ci.quantity, p.name, p.price, p.image_url,
+               SUM(ci.quantity) OVER () AS cart_count, SUM(ci.quantity * p.price) OVER () AS cart_subtotal
+        FROM cart_items ci
+        JOIN products p ON ci.product_id = p.id
+        WHERE ci.user_id = ?
+    """, (user_id,)).fetchall()
+    subtotal = round(rows[0]['cart_subtotal'], 2) if rows else 0
+    return {
+        'items': [{key: row[key] for key in ('product_id', 'quantity', 'name', 'price', 'image_url')} for row in rows],
+        'count': rows[0]['cart_count'] if rows else 0,
+        'subtotal': subtotal,
+        'shipping': 0, # Shipping is free.
+        'total': subtotal,
+    }
+
+def fetch_cart_items(db, user_id):
+    return [dict(item) for item in db.execute("""
+        SELECT ci.product_id, ci.quantity, p.name, p.price, p.image_url
+        FROM cart_items ci
+        JOIN products p ON ci.product_id = p.id
+        WHERE ci.user_id = ?
+    """, (user_id,))]
+
 @app.route('/api/add_to_cart', methods=['POST'])
 @login_required
 def api_add_to_cart():
@@ -810,42 +2771,56 @@ def api_add_to_cart():
         return jsonify({'success': False, 'message': 'Invalid product or quantity.'}), 400
 
     try:
-        existing_item = cursor.execute(
-            "SELECT quantity FROM cart_items WHERE user_id = ? AND product_id = ?",
-            (user_id, product_id)
-        ).fetchone()
+        # One statement, so two quick clicks can't both read the old quantity and lose an increment.
+        new_quantity = cursor.execute("""
+            INSERT INTO cart_items (user_id, product_id, quantity) VALUES (?, ?, ?)
+            ON CONFLICT (user_id, product_id) DO UPDATE SET quantity = quantity + excluded.quantity
+            RETURNING quantity
+        """, (user_id, product_id, quantity)).fetchone()['quantity']
+        db.commit()
 
-        if existing_item:
-            new_quantity = existing_item['quantity'] + quantity
-            cursor.execute(
-                "UPDATE cart_items SET quantity = ? WHERE user_id = ? AND product_id = ?",
-                (new_quantity, user_id, product_id)
-            )
-            message = f"Product quantity updated to {new_quantity} in cart."
-        else:
-            cursor.execute(
-                "INSERT INTO cart_items (user_id, product_id, quantity) VALUES (?, ?, ?)",
-                (user_id, product_id, quantity)
-            )
+        if new_quantity == quantity:
             message = "Product added to cart successfully."
-        
-        db.commit()
+        else:
+            message = f"Product quantity updated to {new_quantity} in cart."
         app.logger.info(f"User {user_id} cart updated for product {product_id}.")
-        # Fetch the new quantity from the database to ensure accuracy
-        updated_item = cursor.execute(
-            "SELECT quantity FROM cart_items WHERE user_id = ? AND product_id = ?",
-            (user_id, product_id)
-        ).fetchone()
-        new_quantity = updated_item['quantity'] if updated_item else 0
         return jsonify({'success': True, 'message': message, 'new_quantity': new_quantity}), 200
+    except sqlite3.IntegrityError:
+        db.rollback()
+        app.logger.warning(f"User {user_id} tried to add missing product {product_id} to cart.")
+        return jsonify({'success': False, 'message': 'Product not found.'}), 404
     except Exception as e:
         app.logger.error(f"Error adding to cart for user {user_id}, product {product_id}: {e}")
         return jsonify({'success': False, 'message': 'Failed to add product to cart.'}), 500
 
+@app.route('/api/cart')
+@login_required
+def api_get_cart():
+    """
+    Returns the user's cart: items, item count and totals. Responses carry an ETag built from the cart
+    and catalog versions, so a repeat request with If-None-Match gets a 304 without running the join.
+    """
+    db = get_read_db()
+    user_id = session['user_id']
+
+    try:
+        etag = get_cart_etag(db, user_id)
+        matched_etag = match_etag(etag)
+        if matched_etag:
+            response = Response(status=304)
+        else:
+            response = jsonify({'success': True, **fetch_cart_snapshot(db, user_id)})
+        response.set_etag(matched_etag or etag)
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+    except Exception as e:
+        app.logger.error(f"Error getting cart for user {user_id}: {e}")
+        return jsonify({'success': False, 'message': 'Failed to retrieve cart.', 'items': [], 'count': 0}), 500
+
 @app.route('/api/get_cart_count')
 @login_required
 def api_get_cart_count():
-    db = get_db()
+    db = get_read_db()
     cursor = db.cursor()
     user_id = session['user_id']
 
@@ -863,20 +2838,12 @@ def api_get_cart_count():
 @app.route('/api/get_cart_items')
 @login_required
 def api_get_cart_items():
-    db = get_db()
-    cursor = db.cursor()
+    db = get_read_db()
     user_id = session['user_id']
     app.logger.info(f"API call: get_cart_items for user_id: {user_id}")
 
     try:
-        cart_items = cursor.execute("""
-            SELECT ci.product_id, ci.quantity, p.name, p.price, p.image_url
-            FROM cart_items ci
-            JOIN products p ON ci.product_id = p.id
-            WHERE ci.user_id = ?
-        """, (user_id,)).fetchall()
-
-        items_list = [dict(item) for item in cart_items]
+        items_list = fetch_cart_items(db, user_id)
         app.logger.info(f"API call: get_cart_items returning {len(items_list)} items for user {user_id}.")
         return jsonify({'success': True, 'items': items_list}), 200
     except Exception as e:
@@ -896,23 +2863,16 @@ def api_update_cart_quantity():
         return jsonify({'success': False, 'message': 'Invalid product or change type.'}), 400
 
     try:
-        current_item = cursor.execute(
-            "SELECT quantity FROM cart_items WHERE user_id = ? AND product_id = ?",
-            (user_id, product_id)
+        updated_item = cursor.execute(
+            "UPDATE cart_items SET quantity = quantity + ? WHERE user_id = ? AND product_id = ? RETURNING quantity",
+            (1 if change_type == 'increase' else -1, user_id, product_id)
         ).fetchone()
 
-        if not current_item:
+        if not updated_item:
             return jsonify({'success': False, 'message': 'Product not found in cart.'}), 404
 
-        current_quantity = current_item['quantity']
-        new_quantity = current_quantity
-
-        if change_type == 'increase':
-            new_quantity += 1
-            message = "Product quantity increased."
-        elif change_type == 'decrease':
-            new_quantity -= 1
-            message = "Product quantity decreased."
+        new_quantity = updated_item['quantity']
+        message = "Product quantity increased." if change_type == 'increase' else "Product quantity decreased."
 
         if new_quantity <= 0:
             cursor.execute(
@@ -921,11 +2881,6 @@ def api_update_cart_quantity():
             )
             message = "Product removed from cart."
             new_quantity = 0
-        else:
-            cursor.execute(
-                "UPDATE cart_items SET quantity = ? WHERE user_id = ? AND product_id = ?",
-                (new_quantity, user_id, product_id)
-            )
         
         db.commit()
         app.logger.info(f"User {user_id} updated product {product_id} quantity to {new_quantity}.")
@@ -961,6 +2916,47 @@ def api_remove_from_cart():
         app.logger.error(f"Error removing from cart for user {user_id}, product {product_id}: {e}")
         return jsonify({'success': False, 'message': 'Failed to remove product from cart.'}), 500
 
+@app.route('/api/cart/batch', methods=['POST'])
+@login_required
+def api_cart_batch():
+    """
+    Sets the quantities of several cart items in one transaction and returns the updated cart.
+    Body: {"changes": [{"product_id": 1, "quantity": 3}, ...]}; a quantity of 0 removes the item,
+    and a product listed twice takes its last quantity.
+    """
+    db = get_db()
+    user_id = session['user_id']
+    changes = (request.get_json(silent=True) or {}).get('changes')
+
+    if not isinstance(changes, list) or not 0 < len(changes) <= app.config['CART_BATCH_MAX_CHANGES']:
+        return jsonify({'success': False, 'message': f"Provide between 1 and {app.config['CART_BATCH_MAX_CHANGES']} cart changes."}), 400
+    quantities = {}
+    for change in changes:
+        product_id = change.get('product_id') if isinstance(change, dict) else None
+        quantity = change.get('quantity') if isinstance(change, dict) else None
+        if type(product_id) is not int or type(quantity) is not int or product_id <= 0 or quantity < 0:
+            return jsonify({'success': False, 'message': 'Invalid product or quantity.'}), 400
+        quantities[product_id] = quantity
+
+    try:
+        with db:
+            db.executemany("""
+                INSERT INTO cart_items (user_id, product_id, quantity) VALUES (?, ?, ?)
+                ON CONFLICT (user_id, product_id) DO UPDATE SET quantity = excluded.quantity
+            """, [(user_id, product_id, quantity) for product_id, quantity in quantities.items() if quantity > 0])
+            db.executemany("DELETE FROM cart_items WHERE user_id = ? AND product_id = ?",
+                           [(user_id, product_id) for product_id, quantity in quantities.items() if quantity == 0])
+        app.logger.info(f"User {user_id} applied {len(quantities)} cart changes.")
+        response = jsonify({'success': True, 'message': 'Cart updated.', **fetch_cart_snapshot(db, user_id)})
+        response.set_etag(get_cart_etag(db, user_id))
+        return response, 200
+    except sqlite3.IntegrityError:
+        app.logger.warning(f"User {user_id} sent cart changes for missing products {sorted(quantities)}.")
+        return jsonify({'success': False, 'message': 'One or more products no longer exist.'}), 404
+    except Exception as e:
+        app.logger.error(f"Error applying cart changes for user {user_id}: {e}")
+        return jsonify({'success': False, 'message': 'Failed to update cart.'}), 500
+
 @app.route('/api/save_shipping_info', methods=['POST'])
 @login_required
 def api_save_shipping_info():
@@ -1010,7 +3006,7 @@ def api_save_shipping_info():
 @app.route('/api/get_shipping_info')
 @login_required
 def api_get_shipping_info():
-    db = get_db()
+    db = get_read_db()
     cursor = db.cursor()
     user_id = session['user_id']
 
@@ -1027,7 +3023,7 @@ def api_get_shipping_info():
 @app.route('/api/get_user_profile')
 @login_required
 def api_get_user_profile():
-    db = get_db()
+    db = get_read_db()
     cursor = db.cursor()
     user_id = session['user_id']
 
@@ -1070,6 +3066,7 @@ def api_update_user_profile():
                 return jsonify({'success': False, 'message': 'Email already registered.'}), 409
 
         cursor.execute("UPDATE users SET username = ?, email = ? WHERE id = ?", (username, email, user_id))
+        record_user_change(cursor, user_id)
         db.commit()
         app.logger.info(f"User {user_id} profile updated.")
         return jsonify({'success': True, 'message': 'Profile updated successfully!'}), 200
@@ -1091,9 +3088,10 @@ def api_change_password():
     
     user = cursor.execute("SELECT password_hash FROM users WHERE id = ?", (user_id,)).fetchone()
 
-    if user and check_password_hash(user['password_hash'], current_password):
-        hashed_new_password = generate_password_hash(new_password)
+    if user and verify_password(user['password_hash'], current_password):
+        hashed_new_password = hash_password(new_password)
         cursor.execute("UPDATE users SET password_hash = ? WHERE id = ?", (hashed_new_password, user_id))
+        record_user_change(cursor, user_id)
         db.commit()
         app.logger.info(f"User {user_id} changed password successfully.")
         return jsonify({'success': True, 'message': 'Password changed successfully!'}), 200
@@ -1104,34 +3102,43 @@ def api_change_password():
 @app.route('/api/get_order_history')
 @login_required
 def api_get_order_history():
-    db = get_db()
+    """Returns one page of the user's orders, newest first, with their items.
+    Query params: page_size (default ORDERS_PAGE_SIZE) and cursor (the next_cursor of the previous page)."""
+    db = get_read_db()
     cursor = db.cursor()
     user_id = session['user_id']
 
     try:
-        orders = cursor.execute("""
+        page_size = parse_page_size(request.args.get('page_size'))
+        after = decode_order_cursor(request.args.get('cursor'))
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e), 'orders': []}), 400
+
+    try:
+        keyset_clause = "AND (order_date, id) < (?, ?)" if after else ""
+        orders = cursor.execute(f"""
             SELECT id, order_date, total_amount, status, payment_method,
                    full_name, address_line1, address_line2, address_line3,
                    city, state, zip_code, phone
             FROM orders
-            WHERE user_id = ?
-            ORDER BY order_date DESC
-        """, (user_id,)).fetchall()
-
-        orders_list = []
-        for order in orders:
-            order_dict = dict(order)
-            items = cursor.execute("""
-                SELECT product_id, product_name, product_price, quantity, image_url
-                FROM order_items
-                JOIN products ON order_items.product_id = products.id
-                WHERE order_id = ?
-            """, (order['id'],)).fetchall()
-            order_dict['items'] = [dict(item) for item in items]
-            orders_list.append(order_dict)
+            WHERE user_id = ? {keyset_clause}
+            ORDER BY order_date DESC, id DESC
+            LIMIT ?
+        """, (user_id, *(after or ()), page_size + 1)).fetchall()
+
+        has_more = len(orders) > page_size
+        orders = orders[:page_size]
+        orders_list = [dict(order) for order in orders]
+        attach_order_items(db, orders_list, """
+            SELECT order_id, product_id, product_name, product_price, quantity, image_url
+            FROM order_items
+            LEFT JOIN products ON order_items.product_id = products.id
+            WHERE order_id IN ({placeholders})
+        """)
+        next_cursor = encode_order_cursor(orders_list[-1]) if has_more else None
         
         app.logger.info(f"Retrieved {len(orders_list)} orders for user {user_id}.")
-        return jsonify({'success': True, 'orders': orders_list}), 200
+        return jsonify({'success': True, 'orders': orders_list, 'next_cursor': next_cursor}), 200
     except Exception as e:
         app.logger.error(f"Error retrieving order history for user {user_id}: {e}")
         return jsonify({'success': False, 'message': 'Failed to retrieve order history.', 'orders': []}), 500
@@ -1139,7 +3146,7 @@ def api_get_order_history():
 @app.route('/api/get_order_details/<int:order_id>')
 @login_required
 def api_get_order_details(order_id):
-    db = get_db()
+    db = get_read_db()
     cursor = db.cursor()
     user_id = session['user_id']
 
@@ -1161,7 +3168,7 @@ def api_get_order_details(order_id):
         items = cursor.execute("""
             SELECT product_id, product_name, product_price, quantity, image_url
             FROM order_items
-            JOIN products ON order_items.product_id = products.id
+            LEFT JOIN products ON order_items.product_id = products.id
             WHERE order_id = ?
         """, (order_id,)).fetchall()
         order_dict['items'] = [dict(item) for item in items]
@@ -1172,36 +3179,107 @@ def api_get_order_details(order_id):
         app.logger.error(f"Error retrieving order details for order {order_id}, user {user_id}: {e}")
         return jsonify({'success': False, 'message': 'Failed to retrieve order details.'}), 500
 
+ADMIN_ORDER_ITEMS_QUERY = """
+    SELECT order_id, product_name, product_price, quantity
+    FROM order_items
+    WHERE order_id IN ({placeholders})
+"""
+
+def parse_admin_order_filters(args):
+    """Builds the WHERE conditions for the admin order listing from query params: status,
+    date_from / date_to (YYYY-MM-DD, inclusive) and customer_email. Raises ValueError if one is invalid."""
+    conditions, params = [], []
+    status = args.get('status')
+    if status:
+        if status not in ('pending', 'processing', 'shipped', 'delivered', 'cancelled'):
+            raise ValueError('Invalid status filter.')
+        conditions.append("o.status = ?")
+        params.append(status)
+    for name, operator, day_offset in (('date_from', '>=', 0), ('date_to', '<', 1)):
+        value = args.get(name)
+        if value:
+            try:
+                day = datetime.strptime(value, '%Y-%m-%d') + timedelta(days=day_offset)
+            except ValueError:
+                raise ValueError(f'{name} must be a date in YYYY-MM-DD format.')
+            conditions.append(f"o.order_date {operator} ?")
+            params.append(day.strftime('%Y-%m-%d %H:%M:%S'))
+    customer_email = args.get('customer_email', '').strip()
+    if customer_email:
+        conditions.append("u.email = ?")
+        params.append(customer_email)
+    return conditions, params
+
+def fetch_admin_orders_page(db, conditions, params, after, limit):
+    """Returns up to `limit` orders matching the filters, newest first, starting after the
+    (order_date, id) keyset position `after`, each with its items attached."""
+    conditions = list(conditions)
+    params = list(params)
+    if after:
+        conditions.append("(o.order_date, o.id) < (?, ?)")
+        params.extend(after)
+    where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    orders = [dict(order) for order in db.execute(f"""
+        SELECT o.id, o.order_date, o.total_amount, o.status, o.payment_method,
+               o.full_name, o.address_line1, o.address_line2, o.address_line3,
+               o.city, o.state, o.zip_code, o.phone,
+               u.username as customer_username, u.email as customer_email
+        FROM orders o
+        JOIN users u ON o.user_id = u.id
+        {where_clause}
+        ORDER BY o.order_date DESC, o.id DESC
+        LIMIT ?
+    """, (*params, limit)).fetchall()]
+    attach_order_items(db, orders, ADMIN_ORDER_ITEMS_QUERY)
+    return orders
+
 @app.route('/api/admin/get_all_orders')
 @admin_required
 def api_admin_get_all_orders():
-    db = get_db()
-    cursor = db.cursor()
+    """Lists orders for admins, newest first, filtered by status, date_from, date_to and customer_email.
+    Returns one page (page_size, cursor -> next_cursor) as JSON, or with format=ndjson streams every
+    matching order, one JSON object per line, reading the table a page at a time. A stream ends with
+    {"done": true, "count": N} when complete, or {"error": ...} if it failed part-way, so a client can
+    tell a cut-off stream from a finished one."""
+    db = get_read_db()
 
     try:
-        orders = cursor.execute("""
-            SELECT o.id, o.order_date, o.total_amount, o.status, o.payment_method,
-                   o.full_name, o.address_line1, o.address_line2, o.address_line3,
-                   o.city, o.state, o.zip_code, o.phone,
-                   u.username as customer_username, u.email as customer_email
-            FROM orders o
-            JOIN users u ON o.user_id = u.id
-            ORDER BY o.order_date DESC
-        """).fetchall()
-
-        orders_list = []
-        for order in orders:
-            order_dict = dict(order)
-            items = cursor.execute("""
-                SELECT product_name, product_price, quantity
-                FROM order_items
-                WHERE order_id = ?
-            """, (order['id'],)).fetchall()
-            order_dict['items'] = [dict(item) for item in items]
-            orders_list.append(order_dict)
+        conditions, params = parse_admin_order_filters(request.args)
+        after = decode_order_cursor(request.args.get('cursor'))
+        streaming = request.args.get('format') == 'ndjson'
+        page_size = app.config['ORDERS_MAX_PAGE_SIZE'] if streaming else parse_page_size(request.args.get('page_size'))
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e), 'orders': []}), 400
+
+    if streaming:
+        def generate_orders(after):
+            sent = 0
+            try:
+                while True:
+                    orders = fetch_admin_orders_page(db, conditions, params, after, page_size)
+                    for order in orders:
+                        yield json.dumps(order) + '\n'
+                    sent += len(orders)
+                    if len(orders) < page_size:
+                        break
+                    after = (orders[-1]['order_date'], orders[-1]['id'])
+            except Exception as e:
+                # The 200 status is already sent, so the failure can only be reported in the body.
+                app.logger.error(f"Error streaming orders for admin after {sent} orders: {e}")
+                yield json.dumps({'error': 'Failed to retrieve all orders.', 'count': sent}) + '\n'
+                return
+            yield json.dumps({'done': True, 'count': sent}) + '\n'
+            app.logger.info(f"Admin streamed {sent} orders.")
+        return Response(stream_with_context(generate_orders(after)), mimetype='application/x-ndjson')
+
+    try:
+        orders_list = fetch_admin_orders_page(db, conditions, params, after, page_size + 1)
+        has_more = len(orders_list) > page_size
+        orders_list = orders_list[:page_size]
+        next_cursor = encode_order_cursor(orders_list[-1]) if has_more else None
         
-        app.logger.info(f"Admin retrieved {len(orders_list)} total orders.")
-        return jsonify({'success': True, 'orders': orders_list}), 200
+        app.logger.info(f"Admin retrieved {len(orders_list)} orders.")
+        return jsonify({'success': True, 'orders': orders_list, 'next_cursor': next_cursor}), 200
     except Exception as e:
         app.logger.error(f"Error retrieving all orders for admin: {e}")
         return jsonify({'success': False, 'message': 'Failed to retrieve all orders.', 'orders': []}), 500
@@ -1241,8 +3319,9 @@ def api_update_order_status():
         return jsonify({'success': False, 'message': 'Failed to update order status.'}), 500
 
 @app.route('/api/search_products')
+@catalog_conditional
 def api_search_products():
-    db = get_db()
+    db = get_read_db()
     cursor = db.cursor()
     query = request.args.get('query', '').lower()
     
@@ -1254,47 +3333,67 @@ def api_search_products():
         products_data = cursor.fetchall()
         return jsonify({'success': True, 'products': [dict(p) for p in products_data], 'message': "Showing all products."}), 200
 
-    cursor.execute("""
-        SELECT * FROM products 
-        WHERE LOWER(name) LIKE ? OR LOWER(description) LIKE ? 
-        ORDER BY name
-    """, (f'%{query}%', f'%{query}%'))
-    
-    results = cursor.fetchall()
+    results = search_products(db, query)
     
     if results:
         return jsonify({'success': True, 'products': [dict(p) for p in results], 'message': f"Found {len(results)} results for '{query}'."}), 200
     else:
         return jsonify({'success': False, 'message': f"No products found matching '{query}'.", 'products': []}), 200
 
-@app.route('/api/place_order', methods=['POST'])
-@login_required
-def api_place_order():
-    db = get_db()
-    cursor = db.cursor()
-    user_id = session['user_id']
-    payment_method = request.form.get('payment_method', 'unknown')
-
+@app.route('/api/products/suggest')
+def api_products_suggest():
+    """Type-ahead suggestions for the product search box: ?prefix=...&limit=N."""
+    prefix = request.args.get('prefix', '')
+    limit = request.args.get('limit', app.config['SUGGEST_DEFAULT_LIMIT'], type=int)
+    limit = max(1, min(limit, app.config['SUGGEST_MAX_LIMIT']))
     try:
-        cart_items = cursor.execute("""
-            SELECT ci.product_id, ci.quantity, p.name, p.price, p.image_url
+        suggestions = suggest_products(get_read_db(), prefix, limit)
+        return jsonify({'success': True, 'suggestions': suggestions}), 200
+    except Exception as e:
+        app.logger.error(f"Error suggesting products for prefix '{prefix}': {e}")
+        return jsonify({'success': False, 'message': 'Failed to load suggestions.', 'suggestions': []}), 500
+
+# --- Checkout ---
+# An order is placed in one short BEGIN IMMEDIATE transaction that touches nothing but SQLite. The
+# cart is read under the write lock, every product's stock is decremented only while it still covers
+# the quantity (stock >= ?), and the order, its items and its sheet outbox row are written with
+# executemany. If any item can't be covered, nothing is written, so concurrent checkouts of a hot
+# product can never sell more than its stock. The Google Sheet append happens in the order outbox
+# worker after commit.
+class InsufficientStockError(ValueError):
+    """Raised by place_order when the cart asks for more of some products than is in stock."""
+
+def place_order(db, user, payment_method):
+    """Turns the user's cart into an order. Returns the new order ID. Raises ValueError when the cart
+    is empty or shipping info is missing, and InsufficientStockError when stock doesn't cover it."""
+    user_id = user['id']
+    if db.in_transaction:
+        db.commit()
+    with db:
+        db.execute("BEGIN IMMEDIATE")
+        cart_items = db.execute("""
+            SELECT ci.product_id, ci.quantity, p.name, p.price, p.stock
             FROM cart_items ci
             JOIN products p ON ci.product_id = p.id
             WHERE ci.user_id = ?
+            ORDER BY ci.product_id
         """, (user_id,)).fetchall()
-
         if not cart_items:
-            app.logger.warning(f"User {user_id} attempted to place an order with an empty cart.")
-            return jsonify({'success': False, 'message': 'Your cart is empty. Please add items before placing an order.'}), 400
+            raise ValueError('Your cart is empty. Please add items before placing an order.')
 
-        shipping_info = cursor.execute("SELECT * FROM shipping_info WHERE user_id = ?", (user_id,)).fetchone()
+        shipping_info = db.execute("SELECT * FROM shipping_info WHERE user_id = ?", (user_id,)).fetchone()
         if not shipping_info:
-            app.logger.warning(f"User {user_id} attempted to place an order without shipping info.")
-            return jsonify({'success': False, 'message': 'Please provide your shipping information before placing an order.'}), 400
+            raise ValueError('Please provide your shipping information before placing an order.')
 
-        total_amount = sum(item['quantity'] * item['price'] for item in cart_items)
+        decremented = db.executemany("UPDATE products SET stock = stock - ? WHERE id = ? AND stock >= ?",
+                                     [(item['quantity'], item['product_id'], item['quantity']) for item in cart_items]).rowcount
+        if decremented != len(cart_items):
+            short = [item for item in cart_items if item['stock'] < item['quantity']]
+            raise InsufficientStockError('Not enough stock for ' + ', '.join(
+                f"{item['name']} (only {max(item['stock'], 0)} left)" for item in short) + '. Please update your cart.')
 
-        cursor.execute("""
+        total_amount = sum(item['quantity'] * item['price'] for item in cart_items)
+        order_id = db.execute("""
             INSERT INTO orders (user_id, total_amount, status, payment_method,
                                 full_name, address_line1, address_line2, address_line3,
                                 city, state, zip_code, phone)
@@ -1312,87 +3411,265 @@ def api_place_order():
             shipping_info['state'],
             shipping_info['zip_code'],
             shipping_info['phone']
-        ))
-        order_id = cursor.lastrowid
-        app.logger.info(f"Order {order_id} created for user {user_id}.")
-
-        # Prepare items for storage in Google Sheet (as JSON string)
-        items_for_sheet = []
-        for item in cart_items:
-            item_dict = dict(item)
-            # Remove image_url if not needed in sheet items_json to keep it concise
-            item_dict.pop('image_url', None) 
-            items_for_sheet.append(item_dict)
-        items_json_string = json.dumps(items_for_sheet)
-
-        # 4. Insert into order_items table (SQLite) and update product stock (SQLite)
-        for item in cart_items:
-            cursor.execute("""
-                INSERT INTO order_items (order_id, product_id, product_name, product_price, quantity)
-                VALUES (?, ?, ?, ?, ?)
-            """, (order_id, item['product_id'], item['name'], item['price'], item['quantity']))
-            
-            # Update product stock in SQLite
-            cursor.execute("UPDATE products SET stock = stock - ? WHERE id = ?", (item['quantity'], item['product_id']))
-        app.logger.info(f"Inserted {len(cart_items)} items for order {order_id} into SQLite and updated stock.")
+        )).lastrowid
+        db.executemany("""
+            INSERT INTO order_items (order_id, product_id, product_name, product_price, quantity)
+            VALUES (?, ?, ?, ?, ?)
+        """, [(order_id, item['product_id'], item['name'], item['price'], item['quantity']) for item in cart_items])
+
+        # The outbox worker assigns the sheet ID and appends the order, so checkout doesn't wait on Google.
+        items_json_string = json.dumps([{'product_id': item['product_id'], 'quantity': item['quantity'],
+                                         'name': item['name'], 'price': item['price']} for item in cart_items])
+        sheet_order_data = [
+            user_id,
+            user['username'],
+            user['email'],
+            datetime.now().isoformat(), # Use current time for sheet order date
+            total_amount,
+            'pending',
+            payment_method,
+            shipping_info['full_name'],
+            shipping_info['address_line1'],
+            shipping_info['address_line2'],
+            shipping_info['address_line3'],
+            shipping_info['city'],
+            shipping_info['state'],
+            shipping_info['zip_code'],
+            shipping_info['phone'],
+            items_json_string
+        ]
+        db.execute("INSERT INTO order_sheet_outbox (order_id, payload) VALUES (?, ?)",
+                   (order_id, json.dumps(sheet_order_data)))
+        db.execute("DELETE FROM cart_items WHERE user_id = ?", (user_id,))
+    _order_outbox_wakeup.set()
+    return order_id
 
-        # 5. Add order to Google Sheet (if sheets are initialized)
-        if orders_sheet:
-            try:
-                # Fetch customer details for the sheet
-                customer_user = cursor.execute("SELECT username, email FROM users WHERE id = ?", (user_id,)).fetchone()
-                customer_username = customer_user['username'] if customer_user else 'N/A'
-                customer_email = customer_user['email'] if customer_user else 'N/A'
-
-                sheet_order_data = [
-                    get_next_sheet_id(orders_sheet), # Generate new ID for the sheet
-                    user_id,
-                    customer_username,
-                    customer_email,
-                    datetime.now().isoformat(), # Use current time for sheet order date
-                    total_amount,
-                    'pending',
-                    payment_method,
-                    shipping_info['full_name'],
-                    shipping_info['address_line1'],
-                    shipping_info['address_line2'],
-                    shipping_info['address_line3'],
-                    shipping_info['city'],
-                    shipping_info['state'],
-                    shipping_info['zip_code'],
-                    shipping_info['phone'],
-                    items_json_string
-                ]
-                orders_sheet.append_row(sheet_order_data)
-                app.logger.info(f"Order {order_id} also recorded in Google Sheet.")
-            except Exception as sheet_e:
-                app.logger.error(f"Failed to record order {order_id} in Google Sheet: {sheet_e}")
-                # Don't rollback SQLite transaction if sheet fails, as order is placed.
-
-        # 6. Clear the user's cart (SQLite)
-        cursor.execute("DELETE FROM cart_items WHERE user_id = ?", (user_id,))
-        app.logger.info(f"Cart cleared for user {user_id}.")
-
-        db.commit() # Final commit for SQLite operations
-        
-        return jsonify({
-            'success': True,
-            'message': 'Order placed successfully!',
-            'order_id': order_id,
-            'redirect': url_for('serve_order_confirmation', order_id=order_id)
-        }), 200
+@app.route('/api/place_order', methods=['POST'])
+@login_required
+def api_place_order():
+    user_id = session['user_id']
+    payment_method = request.form.get('payment_method', 'unknown')
 
+    try:
+        order_id = place_order(get_db(), g.user, payment_method)
+    except InsufficientStockError as e:
+        app.logger.warning(f"Order for user {user_id} rejected: {e}")
+        return jsonify({'success': False, 'message': str(e)}), 409
+    except ValueError as e:
+        app.logger.warning(f"User {user_id} could not place an order: {e}")
+        return jsonify({'success': False, 'message': str(e)}), 400
     except Exception as e:
-        db.rollback()
         app.logger.error(f"Error placing order for user {user_id}: {e}")
         return jsonify({'success': False, 'message': f'Failed to place order: {e}'}), 500
 
+    app.logger.info(f"Order {order_id} placed for user {user_id}; cart cleared.")
+    return jsonify({
+        'success': True,
+        'message': 'Order placed successfully!',
+        'order_id': order_id,
+        'redirect': url_for('serve_order_confirmation', order_id=order_id)
+    }), 200
+
+# --- CSV product import ---
+
+PRODUCT_IMPORT_COLUMNS = ['name', 'description', 'price', 'image_url', 'stock']
+
+def _optional_text_column(series):
+    """Strips a text column, keeping missing cells as None."""
+    return series.astype(str).str.strip().where(series.notna(), None)
+
+def _csv_cell_text(value):
+    """A CSV cell as text for error messages: its value, or <empty> for a missing cell."""
+    return '<empty>' if pd.isna(value) else f"'{value}'"
+
+def prepare_product_import_rows(df, row_offset=0):
+    """
+    Validates a CSV DataFrame column-wise instead of row by row.
+    Returns (records, errors): records are (name, description, price, image_url, stock) tuples ready
+    for upsert_imported_products, errors are the per-row messages reported back to the admin.
+    row_offset numbers rows when df is one chunk of a larger file.
+    """
+    names = df['name'].astype(str).str.strip().where(df['name'].notna(), '')
+    prices = pd.to_numeric(df['price'], errors='coerce')
+    stocks = pd.to_numeric(df['stock'], errors='coerce')
+
+    bad_prices = prices.isna()
+    bad_stocks = ~(stocks.abs() < float('inf')) # missing, unparseable or infinite
+    unconvertible = bad_prices | bad_stocks
+    stocks = stocks.where(~unconvertible, 0).astype('int64')
+    valid = ~unconvertible & (names != '') & (prices > 0) & (stocks >= 0)
+
+    errors = []
+    for position in (~valid).to_numpy().nonzero()[0]:
+        row = df.iloc[position]
+        row_number = row_offset + int(position) + 1
+        if unconvertible.iloc[position]:
+            problems = [f"invalid {column} value {_csv_cell_text(row[column])}"
+                        for column, bad in (('price', bad_prices), ('stock', bad_stocks)) if bad.iloc[position]]
+            data = ', '.join(f"{column}: {_csv_cell_text(value)}" for column, value in row.items())
+            errors.append(f"Row {row_number}: Error processing row - {', '.join(problems)}. Data: {data}")
+        else:
+            errors.append(f"Row {row_number}: Invalid data (name, price, or stock). Skipping.")
+
+    records = list(zip(names[valid].tolist(),
+                       _optional_text_column(df['description'])[valid].tolist(),
+                       prices[valid].astype(float).tolist(),
+                       _optional_text_column(df['image_url'])[valid].tolist(),
+                       stocks[valid].tolist()))
+    return records, errors
+
+def upsert_imported_products(db, records):
+    """
+    Inserts or updates products by name in a single transaction, relying on the unique name index.
+    Returns (new_count, updated_count); a name repeated within records counts as one new product
+    and then as updates, matching the old row-by-row import.
+    """
+    if not records:
+        return 0, 0
+    names = [record[0] for record in records]
+    with db:
+        db.execute("BEGIN IMMEDIATE")
+        existing = db.execute("SELECT COUNT(*) FROM products WHERE name IN (SELECT value FROM json_each(?))",
+                              (json.dumps(sorted(set(names))),)).fetchone()[0]
+        db.executemany("""
+            INSERT INTO products (name, description, price, image_url, stock)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET
+                description = excluded.description, price = excluded.price,
+                image_url = excluded.image_url, stock = excluded.stock
+        """, records)
+    new_count = len(set(names)) - existing
+    return new_count, len(records) - new_count
+
+# --- Background CSV import jobs ---
+# api_import_products only checks the header and records a row in import_jobs; the import worker
+# claims queued jobs (the claim keeps other gunicorn workers off them and is renewed per chunk),
+# streams the file IMPORT_CHUNK_SIZE rows at a time through prepare_product_import_rows and
+# upsert_imported_products, and stores progress after every chunk. A job whose claim lapses, because
+# its process died, is picked up again and resumes after the last recorded chunk.
+_import_job_wakeup = threading.Event()
+IMPORT_JOB_CLAIM_SECONDS = 300
+
+@contextmanager
+def _open_import_file(filepath):
+    """Opens an uploaded CSV for pandas, sniffing gzip from its magic bytes rather than trusting
+    the filename. Yields (binary handle, compression); the handle's position tracks the bytes read."""
+    with open(filepath, 'rb') as handle:
+        compression = 'gzip' if handle.read(2) == b'\x1f\x8b' else None
+        handle.seek(0)
+        yield handle, compression
+
+def create_import_job(db, user_id, filename, filepath):
+    with db:
+        cursor = db.execute(
+            "INSERT INTO import_jobs (user_id, filename, filepath, bytes_total) VALUES (?, ?, ?, ?)",
+            (user_id, filename, filepath, os.path.getsize(filepath))
+        )
+    _import_job_wakeup.set()
+    app.logger.info(f"Queued CSV import job {cursor.lastrowid} for '{filename}'.")
+    return cursor.lastrowid
+
+def get_import_job(db, job_id):
+    job = db.execute("""
+        SELECT id, filename, status, bytes_total, bytes_processed, rows_processed, imported_count,
+               updated_count, error_count, errors, message, created_at, started_at, finished_at
+        FROM import_jobs WHERE id = ?
+    """, (job_id,)).fetchone()
+    if not job:
+        return None
+    job = dict(job)
+    job['errors'] = json.loads(job['errors'])
+    if job['status'] == 'completed':
+        job['progress'] = 100.0
+    else:
+        job['progress'] = round(100.0 * job['bytes_processed'] / job['bytes_total'], 1) if job['bytes_total'] else 0.0
+    return job
+
+def run_next_import_job():
+    """Claims and runs one due import job. Returns its ID, or None if nothing was waiting."""
+    db = get_db()
+    now = time.time()
+    claim_token = secrets.token_hex(8)
+    with db:
+        db.execute("""
+            UPDATE import_jobs
+            SET status = 'running', claim_token = ?, claimed_until = ?, started_at = COALESCE(started_at, CURRENT_TIMESTAMP)
+            WHERE id = (
+                SELECT id FROM import_jobs
+                WHERE status IN ('queued', 'running') AND (claimed_until IS NULL OR claimed_until < ?)
+                ORDER BY id LIMIT 1
+            )
+        """, (claim_token, now + IMPORT_JOB_CLAIM_SECONDS, now))
+    job = db.execute("SELECT * FROM import_jobs WHERE claim_token = ?", (claim_token,)).fetchone()
+    if not job:
+        return None
+
+    errors = json.loads(job['errors'])
+    rows_processed = job['rows_processed']
+    try:
+        with _open_import_file(job['filepath']) as (handle, compression):
+            # Text columns are read as strings so a chunk of numeric-looking names keeps its exact text.
+            reader = pd.read_csv(handle, compression=compression, chunksize=app.config['IMPORT_CHUNK_SIZE'],
+                                 dtype={'name': str, 'description': str, 'image_url': str},
+                                 skiprows=range(1, rows_processed + 1))
+            for chunk in reader:
+                records, chunk_errors = prepare_product_import_rows(chunk, row_offset=rows_processed)
+                new_count, updated_count = upsert_imported_products(db, records)
+                rows_processed += len(chunk)
+                errors.extend(chunk_errors[:max(0, app.config['IMPORT_JOB_MAX_ERRORS'] - len(errors))])
+                with db:
+                    updated = db.execute("""
+                        UPDATE import_jobs
+                        SET rows_processed = ?, bytes_processed = ?, imported_count = imported_count + ?,
+                            updated_count = updated_count + ?, error_count = error_count + ?, errors = ?, claimed_until = ?
+                        WHERE id = ? AND claim_token = ?
+                    """, (rows_processed, handle.tell(), new_count, updated_count, len(chunk_errors),
+                          json.dumps(errors), time.time() + IMPORT_JOB_CLAIM_SECONDS, job['id'], claim_token)).rowcount
+                if not updated:
+                    app.logger.warning(f"CSV import job {job['id']} was claimed by another worker; stopping.")
+                    return job['id']
+    except Exception as e:
+        with db:
+            db.execute("""
+                UPDATE import_jobs SET status = 'failed', message = ?, claim_token = NULL, claimed_until = NULL,
+                       finished_at = CURRENT_TIMESTAMP
+                WHERE id = ? AND claim_token = ?
+            """, (f'Error processing CSV file: {e}', job['id'], claim_token))
+        app.logger.error(f"CSV import job {job['id']} failed after {rows_processed} rows: {e}")
+    else:
+        with db:
+            result = db.execute("""
+                UPDATE import_jobs SET status = 'completed', bytes_processed = bytes_total, claim_token = NULL,
+                       claimed_until = NULL, finished_at = CURRENT_TIMESTAMP,
+                       message = 'Products imported successfully! New: ' || imported_count || ', Updated: ' || updated_count || '.'
+                WHERE id = ? AND claim_token = ?
+                RETURNING imported_count, updated_count, error_count
+            """, (job['id'], claim_token)).fetchone()
+        if result:
+            app.logger.info(f"CSV import job {job['id']} complete. Imported: {result['imported_count']}, "
+                            f"Updated: {result['updated_count']}, Errors: {result['error_count']}.")
+    if os.path.exists(job['filepath']):
+        os.remove(job['filepath'])
+    return job['id']
+
+def _import_job_worker():
+    while True:
+        _import_job_wakeup.wait(timeout=app.config['IMPORT_JOB_POLL_INTERVAL'])
+        _import_job_wakeup.clear()
+        try:
+            with app.app_context():
+                while run_next_import_job():
+                    pass
+        except Exception as e:
+            app.logger.error(f"CSV import job worker failed: {e}")
+
 @app.route('/api/import_products', methods=['POST'])
 @admin_required
 def api_import_products():
     """
-    Handles CSV file upload for importing/updating product data into SQLite.
+    Queues a CSV file (optionally gzip-compressed) for importing/updating product data into SQLite.
     Expected CSV columns: name, description, price, image_url, stock
+    The import runs in the background; poll GET /api/import_jobs/<job_id> for progress.
     """
     user_id = session.get('user_id')
     app.logger.info(f"Admin user {user_id} attempting to import products into SQLite.")
@@ -1409,89 +3686,63 @@ def api_import_products():
 
     if file and allowed_file(file.filename):
         filename = secure_filename(file.filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+        # Each job gets its own file so concurrent uploads of the same name can't clobber each other.
+        filepath = os.path.join(app.config['UPLOAD_FOLDER'], f"import-{secrets.token_hex(8)}-{filename}")
         file.save(filepath)
-        app.logger.info(f"File '{filename}' saved temporarily to '{filepath}'.")
-
-        db = get_db()
-        cursor = db.cursor()
-        imported_count = 0
-        updated_count = 0
-        errors = []
+        app.logger.info(f"File '{filename}' saved to '{filepath}' for a background import.")
 
         try:
-            df = pd.read_csv(filepath)
-            
-            expected_columns = ['name', 'description', 'price', 'image_url', 'stock']
-            if not all(col in df.columns for col in expected_columns):
+            with _open_import_file(filepath) as (handle, compression):
+                columns = pd.read_csv(handle, compression=compression, nrows=0).columns
+            if not all(col in columns for col in PRODUCT_IMPORT_COLUMNS):
                 os.remove(filepath)
                 return jsonify({'success': False, 'message': 'CSV must contain "name", "description", "price", "image_url", "stock" columns.'}), 400
 
-            for index, row in df.iterrows():
-                try:
-                    name = str(row['name']).strip()
-                    description = str(row['description']).strip() if pd.notna(row['description']) else None
-                    price = float(row['price'])
-                    image_url = str(row['image_url']).strip() if pd.notna(row['image_url']) else None
-                    stock = int(row['stock'])
-
-                    if not name or price <= 0 or stock < 0:
-                        errors.append(f"Row {index + 1}: Invalid data (name, price, or stock). Skipping.")
-                        continue
-
-                    existing_product = cursor.execute("SELECT id FROM products WHERE name = ?", (name,)).fetchone()
-
-                    if existing_product:
-                        cursor.execute("""
-                            UPDATE products SET description = ?, price = ?, image_url = ?, stock = ?
-                            WHERE id = ?
-                        """, (description, price, image_url, stock, existing_product['id']))
-                        updated_count += 1
-                    else:
-                        cursor.execute("""
-                            INSERT INTO products (name, description, price, image_url, stock)
-                            VALUES (?, ?, ?, ?, ?)
-                        """, (name, description, price, image_url, stock))
-                        imported_count += 1
-                    db.commit()
-                except Exception as row_e:
-                    errors.append(f"Row {index + 1}: Error processing row - {row_e}. Data: {row.to_dict()}")
-                    db.rollback()
-                    app.logger.error(f"Error processing CSV row: {row_e}")
-            
-            os.remove(filepath)
-            app.logger.info(f"CSV import complete. Imported: {imported_count}, Updated: {updated_count}, Errors: {len(errors)}.")
-            return jsonify({
-                'success': True,
-                'message': f'Products imported successfully! New: {imported_count}, Updated: {updated_count}.',
-                'errors': errors
-            }), 200
-
+            job_id = create_import_job(get_db(), user_id, filename, filepath)
         except Exception as e:
             os.remove(filepath)
             app.logger.error(f"Error processing CSV file '{filename}': {e}")
             return jsonify({'success': False, 'message': f'Error processing CSV file: {e}'}), 500
+
+        return jsonify({
+            'success': True,
+            'message': 'Import started. Products will be updated in the background.',
+            'job_id': job_id,
+            'status_url': url_for('api_get_import_job', job_id=job_id)
+        }), 202
     else:
         app.logger.warning(f"Invalid file type uploaded: {file.filename}")
         return jsonify({'success': False, 'message': 'Allowed file types are CSV.'}), 400
 
+@app.route('/api/import_jobs/<int:job_id>', methods=['GET'])
+@admin_required
+def api_get_import_job(job_id):
+    """Reports the progress of a background CSV import, including the row errors collected so far."""
+    job = get_import_job(get_db(), job_id)
+    if not job:
+        return jsonify({'success': False, 'message': 'Import job not found.'}), 404
+    return jsonify({'success': True, 'job': job}), 200
+
 # --- NEW API ENDPOINTS FOR GOOGLE SHEETS MANAGEMENT ---
 
 @app.route('/api/admin/sheets/products', methods=['GET'])
 # Removed @admin_required to allow public access for products.html
+@catalog_conditional
 def api_admin_sheets_get_products():
-    """Retrieves all products from the Google Sheet."""
-    products = get_all_sheet_products()
-    if products is not None:
-        # Add a basic search/filter for the products from Google Sheet
-        query = request.args.get('query', '').lower()
+    """Retrieves the product catalog from SQLite, the Google Sheet's mirror (see sync_catalog_from_sheet).
+    `id` is the product's local ID, used by carts; `sheet_id` is its row ID in the sheet, used by the
+    admin sheet endpoints, and is null for products that are not in the sheet."""
+    db = get_read_db()
+    query = request.args.get('query', '').lower()
+    try:
         if query:
-            products = [
-                p for p in products 
-                if query in p.get('name', '').lower() or query in p.get('description', '').lower()
-            ]
-        return jsonify({'success': True, 'products': products}), 200
-    return jsonify({'success': False, 'message': 'Failed to retrieve products from Google Sheet.'}), 500
+            products = search_products(db, query)
+        else:
+            products = db.execute("SELECT id, sheet_id, name, description, price, image_url, stock FROM products ORDER BY id").fetchall()
+        return jsonify({'success': True, 'products': [dict(p) for p in products]}), 200
+    except Exception as e:
+        app.logger.error(f"Error reading product catalog: {e}")
+        return jsonify({'success': False, 'message': 'Failed to retrieve products.'}), 500
 
 @app.route('/api/admin/sheets/products', methods=['POST'])
 @admin_required
@@ -1534,6 +3785,46 @@ def api_admin_sheets_delete_product(product_id):
         return jsonify({'success': True, 'message': f'Product {product_id} deleted from Google Sheet.'}), 200
     return jsonify({'success': False, 'message': f'Failed to delete product {product_id} from Google Sheet.'}), 500
 
+@app.route('/api/admin/sheets/products/bulk', methods=['POST'])
+@admin_required
+def api_admin_sheets_bulk_products():
+    """Applies a list of add/update/delete operations to the Google Sheet in a few batched requests.
+    Expects JSON: {"operations": [{"op": "add", "product": {...}}, {"op": "update", "id": 3, "product": {...}},
+    {"op": "delete", "id": 4}]}. Nothing is written unless every operation is valid."""
+    if not products_sheet:
+        return jsonify({'success': False, 'message': 'Products Google Sheet is not available.'}), 503
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return jsonify({'success': False, 'message': 'Expected a JSON object with an "operations" list.'}), 400
+    try:
+        results, errors = bulk_mutate_sheet_products(payload.get('operations'))
+    except Exception as e:
+        app.logger.error(f"Error applying bulk product changes to Google Sheet: {e}")
+        return jsonify({'success': False, 'message': 'Failed to apply bulk product changes.'}), 500
+    if errors:
+        return jsonify({'success': False, 'message': 'No changes were applied; some operations are invalid.', 'errors': errors}), 400
+    all_succeeded = all(result['success'] for result in results)
+    return jsonify({
+        'success': all_succeeded,
+        'message': 'All operations applied.' if all_succeeded else 'Some operations failed.',
+        'results': results
+    }), 200 if all_succeeded else 207
+
+@app.route('/api/admin/sheets/products/sync', methods=['GET'])
+@admin_required
+def api_admin_sheets_products_sync_status():
+    """Returns the outcome of the most recent Sheets -> SQLite catalog sync."""
+    return jsonify({'success': True, 'sync': dict(_catalog_sync_status)}), 200
+
+@app.route('/api/admin/sheets/products/sync', methods=['POST'])
+@admin_required
+def api_admin_sheets_products_sync():
+    """Runs a Sheets -> SQLite catalog sync immediately."""
+    summary = sync_catalog_from_sheet()
+    if summary is None:
+        return jsonify({'success': False, 'message': 'Failed to read products from Google Sheet.'}), 502
+    return jsonify({'success': True, 'message': 'Catalog synced from Google Sheet.', 'sync': summary}), 200
+
 @app.route('/api/admin/sheets/orders', methods=['GET'])
 @admin_required
 def api_admin_sheets_get_orders():
@@ -1543,6 +3834,24 @@ def api_admin_sheets_get_orders():
         return jsonify({'success': True, 'orders': orders}), 200
     return jsonify({'success': False, 'message': 'Failed to retrieve orders from Google Sheet.'}), 500
 
+@app.route('/api/admin/sheets/orders/outbox', methods=['GET'])
+@admin_required
+def api_admin_sheets_orders_outbox():
+    """Reports how many placed orders are still waiting to be written to the Google Sheet."""
+    try:
+        return jsonify({'success': True, 'outbox': get_order_sheet_outbox_stats()}), 200
+    except Exception as e:
+        app.logger.error(f"Error reading order sheet outbox: {e}")
+        return jsonify({'success': False, 'message': 'Failed to read order sheet outbox.'}), 500
+
+@app.route('/api/admin/page_cache/purge', methods=['POST'])
+@admin_required
+def api_admin_purge_page_cache():
+    """Drops this process's cached public pages, e.g. after deploying template or asset changes."""
+    count = purge_page_cache()
+    app.logger.info(f"Admin {session.get('user_id')} purged {count} cached pages.")
+    return jsonify({'success': True, 'message': f'Purged {count} cached pages.', 'purged': count}), 200
+
 @app.route('/api/admin/sheets/orders/<int:order_id>/status', methods=['PUT'])
 @admin_required
 def api_admin_sheets_update_order_status(order_id):
@@ -0,0 +1,403 @@
+// Shared by every page: login state, form messages and the loading overlay, the login-required
+// modal, the generic form submission handler, the header dropdowns and logout, and the cart badge.
+// Each template loads this plus at most one page module from js/pages/, which imports what it needs
+// from here and starts from ready.then(...).
+
+// --- Global Variables ---
+export let isAdminUser = false;
+export let isLoggedIn = false; // Tracks login status
+
+// --- Utility Functions ---
+
+// Function to check login status (could be more robust with a dedicated API endpoint)
+// For now, we'll infer it from the presence of the profile dropdown button.
+async function checkLoginStatus() {
+    try {
+        const response = await fetch('/api/check_login_status'); // Assuming you have this endpoint
+        const data = await response.json();
+        isLoggedIn = data.is_logged_in;
+    } catch (error) {
+        console.error('Error checking login status:', error);
+        isLoggedIn = false; // Default to not logged in on error
+    }
+}
+
+// Smooth scrolling for anchor links
+document.querySelectorAll('a[href^="#"]').forEach(anchor => {
+    anchor.addEventListener('click', function (e) {
+        e.preventDefault();
+        document.querySelector(this.getAttribute('href')).scrollIntoView({
+            behavior: 'smooth'
+        });
+    });
+});
+
+// Helper function to display messages for forms/general alerts
+export function displayMessage(message, type, targetElementId = 'formMessages') {
+    const messageContainer = document.getElementById(targetElementId);
+    if (!messageContainer) {
+        console.warn(`displayMessage: Target element with ID '${targetElementId}' not found for displaying messages.`);
+        console.log(`displayMessage: Message: ${message}, Type: ${type}`); // Fallback to console log if container not found
+        return;
+    }
+
+    // Clear existing timeout if any, to allow new messages to display fully
+    clearTimeout(messageContainer.dataset.timeoutId);
+
+    messageContainer.textContent = message;
+    messageContainer.className = `message ${type}`; // Using 'message' class from CSS
+    messageContainer.style.display = 'block';
+    messageContainer.style.opacity = '1'; // Ensure it's visible if CSS sets opacity to 0
+
+    const timeoutId = setTimeout(() => {
+        messageContainer.style.opacity = '0'; // Fade out
+        // After fading, hide completely to not block layout
+        messageContainer.addEventListener('transitionend', function handler() {
+            messageContainer.style.display = 'none';
+            messageContainer.textContent = ''; // Clear text after hiding
+            messageContainer.removeEventListener('transitionend', handler);
+        }, { once: true }); // Ensure handler runs only once
+    }, 5000); // Hide after 5 seconds
+
+    messageContainer.dataset.timeoutId = timeoutId; // Store timeout ID
+    console.log(`displayMessage: Message displayed: "${message}" (${type}) in #${targetElementId}`);
+}
+
+// Function to show the loading overlay with dynamic content
+export function showLoadingOverlay(message = 'Loading...', iconType = 'spinner') {
+    console.log('showLoadingOverlay function called.'); 
+    const loadingOverlay = document.getElementById('loadingOverlay');
+    const loadingOverlayContent = loadingOverlay ? loadingOverlay.querySelector('.loading-overlay-content') : null;
+    const loadingMessageElement = loadingOverlay ? loadingOverlay.querySelector('#loadingMessage') : null; // Specific element for message
+
+    if (!loadingOverlay || !loadingOverlayContent || !loadingMessageElement) {
+        console.warn('showLoadingOverlay: Required overlay elements not found.');
+        return;
+    }
+
+    // Clear previous content and set new content based on iconType
+    loadingOverlayContent.innerHTML = ''; // Clear existing spinner/icon
+
+    if (iconType === 'spinner') {
+        loadingOverlayContent.innerHTML = '<div class="loading-spinner"></div>';
+    } else if (iconType === 'success') {
+        loadingOverlayContent.innerHTML = '<i class="bi bi-check-circle-fill success-icon"></i>';
+        // No need for setTimeout here, CSS transition will handle it
+    } else if (iconType === 'error') {
+        loadingOverlayContent.innerHTML = '<i class="bi bi-x-circle-fill error-icon"></i>';
+        // No need for setTimeout here, CSS transition will handle it
+    }
+
+    loadingMessageElement.textContent = message; // Update the message
+
+    loadingOverlay.classList.add('show');
+    document.body.style.overflow = 'hidden'; // Prevent scrolling
+    console.log(`Loading overlay shown with type: ${iconType}, message: "${message}"`);
+}
+
+// Function to hide the loading overlay (can also display a final message briefly)
+export function hideLoadingOverlay(finalMessage = '', finalType = 'info', duration = 1500) {
+    const loadingOverlay = document.getElementById('loadingOverlay');
+    const loadingMessageElement = loadingOverlay ? loadingOverlay.querySelector('#loadingMessage') : null;
+    const loadingOverlayContent = loadingOverlay ? loadingOverlay.querySelector('.loading-overlay-content') : null;
+
+    if (!loadingOverlay || !loadingMessageElement || !loadingOverlayContent) {
+        console.warn('hideLoadingOverlay: Required overlay elements not found.');
+        return;
+    }
+
+    // Display final message and icon before fading out
+    if (finalMessage) {
+        loadingMessageElement.textContent = finalMessage;
+        loadingOverlayContent.innerHTML = ''; // Clear spinner
+        if (finalType === 'success') {
+            loadingOverlayContent.innerHTML = '<i class="bi bi-check-circle-fill success-icon"></i>';
+        } else if (finalType === 'error') {
+            loadingOverlayContent.innerHTML = '<i class="bi bi-x-circle-fill error-icon"></i>';
+        }
+    }
+
+    setTimeout(() => {
+        loadingOverlay.classList.remove('show');
+        document.body.style.overflow = ''; // Restore scrolling
+        // Clear content after transition
+        setTimeout(() => {
+            loadingMessageElement.textContent = '';
+            loadingOverlayContent.innerHTML = '';
+        }, 300); // Match CSS transition duration for overlay fade
+        console.log('Loading overlay hidden.');
+    }, finalMessage ? duration : 0); // Keep visible for duration if final message, else hide immediately
+}
+
+// --- NEW: Login Required Modal Functions ---
+const loginRequiredModal = document.getElementById('loginRequiredModal');
+const modalMessage = document.getElementById('modalMessage');
+const modalLoginBtn = document.getElementById('modalLoginBtn');
+const modalCloseBtn = document.getElementById('modalCloseBtn');
+const modalCloseX = loginRequiredModal ? loginRequiredModal.querySelector('.close-button') : null;
+
+export function showLoginRequiredModal(message) {
+    if (loginRequiredModal && modalMessage) {
+        modalMessage.textContent = message;
+        loginRequiredModal.style.display = 'flex'; // Use flex to center content
+        document.body.style.overflow = 'hidden'; // Prevent background scrolling
+    }
+}
+
+function hideLoginRequiredModal() {
+    if (loginRequiredModal) {
+        loginRequiredModal.style.display = 'none';
+        document.body.style.overflow = ''; // Restore background scrolling
+    }
+}
+
+// Attach event listeners for the modal buttons
+if (modalLoginBtn) {
+    modalLoginBtn.addEventListener('click', () => {
+        hideLoginRequiredModal();
+        window.location.href = 'login.html'; // Redirect to login page
+    });
+}
+
+if (modalCloseBtn) {
+    modalCloseBtn.addEventListener('click', hideLoginRequiredModal);
+}
+
+if (modalCloseX) {
+    modalCloseX.addEventListener('click', hideLoginRequiredModal);
+}
+
+// Close modal if clicking outside the content
+if (loginRequiredModal) {
+    loginRequiredModal.addEventListener('click', (event) => {
+        if (event.target === loginRequiredModal) {
+            hideLoginRequiredModal();
+        }
+    });
+}
+// --- END NEW: Login Required Modal Functions ---
+
+
+// Generic AJAX form submission handler
+export async function handleFormSubmission(event, endpoint, redirectUrl = null, messageTargetId = 'formMessages') {
+    event.preventDefault();
+    console.log(`handleFormSubmission: Attempting to submit form to ${endpoint}`);
+
+    const form = event.target;
+    const formData = new FormData(form);
+    const formMessagesElementId = messageTargetId; // Use provided messageTargetId
+
+    // Show loading overlay immediately when the button is clicked
+    showLoadingOverlay('Processing...', 'spinner'); 
+    displayMessage('Processing...', 'info', formMessagesElementId);
+
+    // Log form data for debugging
+    for (let pair of formData.entries()) {
+        console.log(`FormData: ${pair[0]}: ${pair[1]}`);
+    }
+
+    try {
+        const response = await fetch(endpoint, {
+            method: 'POST',
+            body: formData
+        });
+
+        console.log('handleFormSubmission: HTTP Response Status:', response.status, response.statusText);
+
+        // Check if the response is OK (2xx status) before trying to parse JSON
+        if (!response.ok) {
+            let errorData;
+            try {
+                errorData = await response.json();
+                console.error('handleFormSubmission: Server responded with non-OK status, parsed JSON error:', errorData);
+                hideLoadingOverlay(errorData.message || 'An unexpected server error occurred.', 'error');
+                displayMessage(`Error: ${errorData.message || 'An unexpected server error occurred.'}`, 'error', formMessagesElementId);
+            } catch (jsonError) {
+                const errorText = await response.text();
+                console.error('handleFormSubmission: Server responded with non-OK status, failed to parse JSON, raw text:', errorText);
+                hideLoadingOverlay(`Server error (${response.status})`, 'error');
+                displayMessage(`Server error (${response.status}): ${errorText.substring(0, 100)}...`, 'error', formMessagesElementId);
+            }
+            return;
+        }
+
+        const responseText = await response.text();
+        console.log('handleFormSubmission: Raw Server Response:', responseText);
+
+        let result;
+        try {
+            result = JSON.parse(responseText);
+            console.log('handleFormSubmission: Parsed JSON Response:', result);
+        } catch (jsonParseError) {
+            console.error('handleFormSubmission: JSON parsing error:', jsonParseError);
+            console.error('handleFormSubmission: Response was not valid JSON:', responseText);
+            hideLoadingOverlay('Received invalid response.', 'error');
+            displayMessage('Received invalid response from server. Check console for details.', 'error', formMessagesElementId);
+            return;
+        }
+
+        if (result.success) {
+            hideLoadingOverlay(result.message, 'success');
+            displayMessage(result.message, 'success', formMessagesElementId);
+            console.log(`handleFormSubmission: Form submission successful. Message: ${result.message}`);
+            // Only reset form if no redirect, or if it's a final submission
+            if (!result.redirect && !redirectUrl) {
+                form.reset();
+            }
+            if (result.redirect) {
+                console.log(`handleFormSubmission: Redirecting to ${result.redirect}`);
+                setTimeout(() => {
+                    window.location.href = result.redirect;
+                }, 500); 
+            } else if (redirectUrl) {
+                console.log(`handleFormSubmission: Redirecting to ${redirectUrl}`);
+                setTimeout(() => {
+                    window.location.href = redirectUrl;
+                }, 500); 
+            }
+        } else {
+            console.error(`handleFormSubmission: Form submission failed. Message: ${result.message}`);
+            hideLoadingOverlay(result.message, 'error');
+            displayMessage(result.message, 'error', formMessagesElementId);
+        }
+    } catch (error) {
+        console.error('handleFormSubmission: Catch block - Error during form submission (network or unhandled):', error);
+        hideLoadingOverlay('A network error occurred.', 'error');
+        displayMessage('A network error occurred. Please check your internet connection and server status.', 'error', formMessagesElementId);
+    }
+}
+
+
+// --- Logout Function (Now triggered from dropdown item) ---
+async function performLogout() {
+    showLoadingOverlay('Logging out...', 'spinner');
+    try {
+        const response = await fetch('/api/logout', { method: 'POST' });
+        const data = await response.json();
+        if (data.success) {
+            hideLoadingOverlay(data.message, 'success');
+            displayMessage(data.message, 'success', 'formMessages');
+            if (cartItemCountSpan) cartItemCountSpan.textContent = '0';
+
+            // After logout, update isLoggedIn status and let the page re-render for it
+            // (e.g. the products page shows Add to Cart buttons again)
+            isLoggedIn = false;
+            document.dispatchEvent(new CustomEvent('logout'));
+
+            setTimeout(() => {
+                window.location.href = 'login.html';
+            }, 1000);
+        } else {
+            hideLoadingOverlay(data.message || 'Logout failed.', 'error');
+            displayMessage('Logout failed: ' + (data.message || 'Unknown error'), 'error', 'formMessages');
+        }
+    } catch (error) {
+        console.error('Error during logout:', error);
+        hideLoadingOverlay('Network error during logout.', 'error');
+        displayMessage('Network error during logout. Please try again.', 'error', 'formMessages');
+    }
+}
+
+// Attach logout handler to the dropdown logout link
+const logoutLinkDropdown = document.getElementById('logout-link-dropdown');
+if (logoutLinkDropdown) {
+    logoutLinkDropdown.addEventListener('click', function(e) {
+        e.preventDefault();
+        performLogout();
+    });
+}
+
+// --- Profile Dropdown Toggle Logic ---
+const profileDropdownBtn = document.getElementById('profileDropdownBtn');
+if (profileDropdownBtn) {
+    const profileDropdownContent = document.getElementById('profileDropdownContent');
+
+    profileDropdownBtn.addEventListener('click', function() {
+        profileDropdownContent.classList.toggle('show');
+    });
+
+    window.addEventListener('click', function(event) {
+        if (!event.target.matches('#profileDropdownBtn') && !profileDropdownBtn.contains(event.target)) {
+            if (profileDropdownContent.classList.contains('show')) {
+                profileDropdownContent.classList.remove('show');
+            }
+        }
+    });
+}
+
+// NEW: Login Dropdown Toggle Logic (for the main header login button)
+const headerLoginBtn = document.getElementById('headerLoginBtn');
+const loginDropdownContent = document.getElementById('loginDropdownContent');
+
+if (headerLoginBtn && loginDropdownContent) {
+    headerLoginBtn.addEventListener('click', function(event) {
+        event.preventDefault(); // Prevent default link behavior
+        loginDropdownContent.classList.toggle('show');
+    });
+
+    // Close the dropdown if the user clicks outside of it
+    window.addEventListener('click', function(event) {
+        if (!event.target.matches('#headerLoginBtn') && !headerLoginBtn.contains(event.target) &&
+            !event.target.matches('#loginDropdownContent') && !loginDropdownContent.contains(event.target)) {
+            if (loginDropdownContent.classList.contains('show')) {
+                loginDropdownContent.classList.remove('show');
+            }
+        }
+    });
+}
+
+// --- Cart Badge ---
+
+export const cartItemCountSpan = document.getElementById('cartItemCount');
+
+// The cart badge, product cards, cart page and order summary all read the same /api/cart snapshot.
+// It is fetched at most once per page until the cart changes; the browser revalidates it with the
+// ETag from the last response, so an unchanged cart costs a 304.
+let cartSnapshotRequest = null;
+
+export function fetchCart() {
+    if (!cartSnapshotRequest) {
+        cartSnapshotRequest = fetch('/api/cart').then(response => response.json());
+        cartSnapshotRequest.then(data => { if (!data.success) cartSnapshotRequest = null; },
+                                 () => { cartSnapshotRequest = null; });
+    }
+    return cartSnapshotRequest;
+}
+
+export function invalidateCart(snapshot = null) {
+    cartSnapshotRequest = snapshot ? Promise.resolve(snapshot) : null;
+}
+
+// Function to fetch and update cart count from backend
+export async function updateCartCount() {
+    if (!cartItemCountSpan) return;
+
+    // Only try to fetch cart count if logged in
+    if (!isLoggedIn) {
+        cartItemCountSpan.textContent = '0';
+        return;
+    }
+
+    try {
+        const data = await fetchCart();
+        if (data.success) {
+            cartItemCountSpan.textContent = data.count;
+        } else {
+            console.error('Failed to get cart count:', data.message);
+            cartItemCountSpan.textContent = '0';
+        }
+    } catch (error) {
+        console.error('Network error fetching cart count:', error);
+        cartItemCountSpan.textContent = '0';
+    }
+}
+
+// --- Initializations ---
+
+// Resolves once the login status is known and the cart badge has been started.
+export const ready = checkLoginStatus().then(() => {
+    const adminDashboardLink = document.querySelector('#profileDropdownContent a[href="/admin/dashboard.html"]');
+    isAdminUser = (adminDashboardLink !== null); // This might need to be refined if admin status is only backend
+
+    updateCartCount(); // Update cart count based on initial login status
+});
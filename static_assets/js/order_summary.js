@@ -0,0 +1,112 @@
+import { isLoggedIn, displayMessage, showLoadingOverlay, hideLoadingOverlay, fetchCart } from './core.js';
+
+// --- Order Summary Logic (Used on both Checkout and Payment pages) ---
+export async function renderOrderSummary(targetMessagesId = 'checkoutMessages') {
+    const orderSummaryItemsContainer = document.getElementById('orderSummaryItems');
+    const orderSubtotalElement = document.getElementById('orderSubtotal');
+    const orderShippingElement = document.getElementById('orderShipping');
+    const orderTotalElement = document.getElementById('orderTotal');
+    const placeOrderBtn = document.getElementById('placeOrderBtn');
+    const shippingFormContainer = document.getElementById('shippingFormContainer'); 
+
+    if (!orderSummaryItemsContainer || !orderSubtotalElement || !orderShippingElement || !orderTotalElement) {
+        console.warn("renderOrderSummary: Required order summary elements not found.");
+        return;
+    }
+
+    orderSummaryItemsContainer.innerHTML = '';
+    let subtotal = 0;
+
+    // Only attempt to load cart if logged in
+    if (!isLoggedIn) {
+        displayMessage('Please log in to view your order summary.', 'info', targetMessagesId);
+        orderSummaryItemsContainer.innerHTML = '<p>Please log in to view your order summary.</p>';
+        if (placeOrderBtn) placeOrderBtn.style.display = 'none';
+        if (shippingFormContainer) {
+            shippingFormContainer.style.display = 'none';
+        }
+        orderSubtotalElement.textContent = `₹0.00`;
+        orderShippingElement.textContent = `Free`;
+        orderTotalElement.textContent = `₹0.00`;
+        return;
+    }
+
+    showLoadingOverlay('Loading order summary...', 'spinner'); // Show loading overlay
+
+    try {
+        const data = await fetchCart();
+
+        if (!data.success) {
+            console.error('renderOrderSummary: Failed to load cart items:', data.message);
+            orderSummaryItemsContainer.innerHTML = '<p>Your cart is empty. Please add items before checking out.</p>';
+            if (placeOrderBtn) placeOrderBtn.style.display = 'none';
+            if (shippingFormContainer) {
+                shippingFormContainer.style.display = 'none'; 
+            }
+            orderSubtotalElement.textContent = `₹0.00`;
+            orderShippingElement.textContent = `Free`;
+            orderTotalElement.textContent = `₹0.00`;
+            hideLoadingOverlay('Failed to load cart items.', 'error'); // Hide with error message
+            return;
+        }
+
+        const cartItems = data.items;
+        
+        if (cartItems.length === 0) {
+            displayMessage('Your cart is empty! Please add items to proceed.', 'info', targetMessagesId);
+            orderSummaryItemsContainer.innerHTML = '<p>Your cart is empty. Please add items before checking out.</p>';
+            if (placeOrderBtn) placeOrderBtn.style.display = 'none';
+            if (shippingFormContainer) {
+                shippingFormContainer.style.display = 'none';
+            }
+            hideLoadingOverlay('Cart is empty.', 'info'); // Hide with info message
+        } else {
+            displayMessage('', '', targetMessagesId);
+            if (shippingFormContainer) {
+                shippingFormContainer.style.display = 'block'; 
+            }
+
+            cartItems.forEach(item => {
+                const itemTotal = parseFloat(item.price) * parseInt(item.quantity);
+                subtotal += itemTotal;
+
+                const orderItemDiv = document.createElement('div');
+                orderItemDiv.className = 'order-item';
+                orderItemDiv.innerHTML = `
+                    <img src="${item.image_url || 'https://placehold.co/50x50/E0F2F1/000000?text=Product'}" alt="${item.name || 'Product Image'}" class="order-item-image">
+                        <div>
+                            <div class="order-item-name">${item.name || 'Unknown Product'}</div>
+                            <div class="order-item-quantity-price">${item.quantity} x ₹${parseFloat(item.price).toFixed(2)}</div>
+                        </div>
+                    </div>
+                    <div class="order-item-total-price">₹${itemTotal.toFixed(2)}</div>
+                `;
+                orderSummaryItemsContainer.appendChild(orderItemDiv);
+            });
+            hideLoadingOverlay('Order summary loaded.', 'success'); // Hide with success message
+        }
+
+        orderSubtotalElement.textContent = `₹${subtotal.toFixed(2)}`;
+        orderShippingElement.textContent = `Free`;
+        orderTotalElement.textContent = `₹${subtotal.toFixed(2)}`;
+
+        const codAmountSpan = document.getElementById('codAmount');
+        if (codAmountSpan) {
+            codAmountSpan.textContent = subtotal.toFixed(2);
+        }
+
+        const upiAmountSpan = document.getElementById('upiAmount');
+        if (upiAmountSpan) {
+            upiAmountSpan.textContent = subtotal.toFixed(2);
+        }
+
+    } catch (error) {
+        console.error('renderOrderSummary: Network error rendering order summary:', error);
+        orderSummaryItemsContainer.innerHTML = '<p>Could not load order summary. Please check your connection.</p>';
+        if (placeOrderBtn) placeOrderBtn.style.display = 'none';
+        if (shippingFormContainer) {
+            shippingFormContainer.style.display = 'none';
+        }
+        hideLoadingOverlay('Network error loading summary.', 'error'); // Hide with network error message
+    }
+}
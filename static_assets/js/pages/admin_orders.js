@@ -0,0 +1,187 @@
+import { displayMessage, showLoadingOverlay, hideLoadingOverlay, ready } from '../core.js';
+
+// --- Admin Order Management Logic (SQLite orders) ---
+function createAdminOrderRow(order) {
+    const orderDate = new Date(order.order_date).toLocaleString();
+    
+    const orderItemsHtml = order.items.map(item => `
+        <li>${item.product_name || 'Unknown Product'} (${item.quantity} x ₹${parseFloat(item.product_price).toFixed(2)})</li>
+    `).join('');
+
+    const row = document.createElement('tr');
+    row.innerHTML = `
+        <td>${order.id}</td>
+        <td>${order.customer_username}<br><small>${order.customer_email}</small></td>
+        <td>${orderDate}</td>
+        <td>₹${parseFloat(order.total_amount).toFixed(2)}</td>
+        <td>
+            <select class="order-status-select" data-order-id="${order.id}">
+                <option value="pending" ${order.status === 'pending' ? 'selected' : ''}>Pending</option>
+                <option value="processing" ${order.status === 'processing' ? 'selected' : ''}>Processing</option>
+                <option value="shipped" ${order.status === 'shipped' ? 'selected' : ''}>Shipped</option>
+                <option value="delivered" ${order.status === 'delivered' ? 'selected' : ''}>Delivered</option>
+                <option value="cancelled" ${order.status === 'cancelled' ? 'selected' : ''}>Cancelled</option>
+            </select>
+        </td>
+        <td>${order.payment_method ? order.payment_method.toUpperCase() : 'N/A'}</td>
+        <td>
+            ${order.full_name}<br>
+            ${order.address_line1}, ${order.address_line2}${order.address_line3 ? ', ' + order.address_line3 : ''}<br>
+            ${order.city}, ${order.state} - ${order.zip_code}<br>
+            ${order.phone}
+        </td>
+        <td><ul class="order-items-admin-list">${orderItemsHtml}</ul></td>
+    `;
+    return row;
+}
+
+// Filters and the cursor of the next page for the admin order listing.
+let adminOrdersQuery = new URLSearchParams();
+let adminOrdersNextCursor = null;
+
+async function renderAdminOrders(append = false) {
+    const ordersTableBody = document.getElementById('ordersTableBody');
+    const noOrdersFoundMessage = document.getElementById('noOrdersFound');
+    const orderManagementMessages = document.getElementById('orderManagementMessages');
+    const loadMoreOrdersBtn = document.getElementById('loadMoreOrdersBtn');
+
+    if (!ordersTableBody || !noOrdersFoundMessage || !orderManagementMessages) {
+        console.warn("renderAdminOrders: Required admin order management elements not found.");
+        return;
+    }
+
+    if (!append) {
+        adminOrdersNextCursor = null;
+        ordersTableBody.innerHTML = '<tr><td colspan="8" style="text-align: center;">Loading orders...</td></tr>';
+    }
+    showLoadingOverlay('Loading orders...', 'spinner'); // Show loading overlay
+    displayMessage('Loading orders...', 'info', 'orderManagementMessages');
+    noOrdersFoundMessage.style.display = 'none';
+
+    const params = new URLSearchParams(adminOrdersQuery);
+    if (append && adminOrdersNextCursor) params.set('cursor', adminOrdersNextCursor);
+
+    try {
+        const response = await fetch(`/api/admin/get_all_orders?${params.toString()}`);
+        const data = await response.json();
+
+        if (!data.success) {
+            hideLoadingOverlay('Failed to load orders.', 'error'); // Hide with error message
+            displayMessage(data.message || 'Failed to load orders for admin.', 'error', 'orderManagementMessages');
+            if (!append) {
+                ordersTableBody.innerHTML = '<tr><td colspan="8" style="text-align: center;">Error loading orders.</td></tr>';
+                noOrdersFoundMessage.style.display = 'block';
+            }
+            return;
+        }
+
+        const orders = data.orders;
+        adminOrdersNextCursor = data.next_cursor;
+        if (loadMoreOrdersBtn) loadMoreOrdersBtn.style.display = adminOrdersNextCursor ? 'inline-block' : 'none';
+
+        if (!append && orders.length === 0) {
+            hideLoadingOverlay('No orders found.', 'info'); // Hide with info message
+            displayMessage('No orders found.', 'info', 'orderManagementMessages');
+            ordersTableBody.innerHTML = '<tr><td colspan="8" style="text-align: center;">No orders found.</td></tr>';
+            noOrdersFoundMessage.style.display = 'block';
+        } else {
+            hideLoadingOverlay('Orders loaded.', 'success'); // Hide with success message
+            displayMessage('', '', 'orderManagementMessages');
+            if (!append) ordersTableBody.innerHTML = '';
+
+            orders.forEach(order => ordersTableBody.appendChild(createAdminOrderRow(order)));
+            addAdminOrderEventListeners();
+        }
+    } catch (error) {
+        console.error('renderAdminOrders: Error fetching all orders:', error);
+        hideLoadingOverlay('Network error loading orders.', 'error'); // Hide with network error message
+        displayMessage('Network error loading orders. Please try again.', 'error', 'orderManagementMessages');
+        if (!append) {
+            ordersTableBody.innerHTML = '<tr><td colspan="8" style="text-align: center;">Failed to load orders due to network error.</td></tr>';
+            noOrdersFoundMessage.style.display = 'block';
+        }
+    }
+}
+
+function addAdminOrderFilterListeners() {
+    const ordersFilterForm = document.getElementById('ordersFilterForm');
+    const loadMoreOrdersBtn = document.getElementById('loadMoreOrdersBtn');
+    if (ordersFilterForm) {
+        ordersFilterForm.addEventListener('submit', (event) => {
+            event.preventDefault();
+            adminOrdersQuery = new URLSearchParams();
+            new FormData(ordersFilterForm).forEach((value, key) => {
+                if (value) adminOrdersQuery.set(key, value);
+            });
+            renderAdminOrders();
+        });
+    }
+    if (loadMoreOrdersBtn) {
+        loadMoreOrdersBtn.addEventListener('click', () => renderAdminOrders(true));
+    }
+}
+
+function addAdminOrderEventListeners() {
+    document.querySelectorAll('.order-status-select').forEach(selectElement => {
+        selectElement.removeEventListener('change', handleOrderStatusChange);
+        selectElement.addEventListener('change', handleOrderStatusChange);
+    });
+}
+
+async function handleOrderStatusChange(event) {
+    const selectElement = event.target;
+    const orderId = selectElement.dataset.orderId;
+    const newStatus = selectElement.value;
+    const originalStatus = selectElement.dataset.originalStatus || selectElement.options[selectElement.selectedIndex].textContent.toLowerCase();
+
+    // Optimistic UI update
+    const originalBadge = selectElement.closest('td').querySelector('.order-status-badge');
+    if (originalBadge) {
+        originalBadge.className = `order-status-badge ${newStatus}`;
+        originalBadge.textContent = newStatus;
+    }
+    
+    showLoadingOverlay(`Updating order #${orderId} status to ${newStatus}...`, 'spinner'); // Show loading overlay
+    displayMessage(`Updating order #${orderId} status to ${newStatus}...`, 'info', 'orderManagementMessages');
+
+    const formData = new FormData();
+    formData.append('status', newStatus);
+
+    try {
+        const response = await fetch('/api/update_order_status', {
+            method: 'POST',
+            body: formData
+        });
+        const data = await response.json();
+
+        if (data.success) {
+            hideLoadingOverlay(data.message, 'success');
+            displayMessage(data.message, 'success', 'orderManagementMessages');
+        } else {
+            // Revert optimistic UI update on failure
+            selectElement.value = originalStatus;
+            if (originalBadge) {
+                originalBadge.className = `order-status-badge ${originalStatus}`;
+                originalBadge.textContent = originalStatus;
+            }
+            hideLoadingOverlay(data.message || 'Failed to update status.', 'error'); // Hide with error message
+            displayMessage(`Failed to update status for order #${orderId}: ${data.message || 'Unknown error'}`, 'error', 'orderManagementMessages');
+        }
+    } catch (error) {
+        // Revert optimistic UI update on network error
+        selectElement.value = originalStatus;
+        if (originalBadge) {
+            originalBadge.className = `order-status-badge ${originalStatus}`;
+            originalBadge.textContent = originalStatus;
+        }
+        console.error(`handleOrderStatusChange: Network error updating status for order #${orderId}:`, error);
+        hideLoadingOverlay('Network error updating status.', 'error'); // Hide with network error message
+        displayMessage('Network error updating order status. Please try again.', 'error', 'orderManagementMessages');
+    }
+}
+
+// --- Initializations ---
+ready.then(() => {
+    addAdminOrderFilterListeners();
+    renderAdminOrders();
+});
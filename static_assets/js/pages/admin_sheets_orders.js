@@ -0,0 +1,117 @@
+import { displayMessage, showLoadingOverlay, hideLoadingOverlay, ready } from '../core.js';
+
+// For admin_sheets_orders.html
+async function renderAdminSheetsOrders() {
+    const ordersTableBody = document.getElementById('ordersTableBody');
+    const statusOptions = ['pending', 'processing', 'shipped', 'delivered', 'cancelled'];
+
+    if (!ordersTableBody) {
+        console.warn("renderAdminSheetsOrders: Required elements for order sheets not found. Skipping.");
+        return;
+    }
+
+    ordersTableBody.innerHTML = '<tr><td colspan="8">Loading orders...</td></tr>';
+    showLoadingOverlay('Loading orders from sheet...', 'spinner');
+    displayMessage('Loading orders from sheet...', 'info', 'orderMessages');
+
+    try {
+        const response = await fetch('/api/admin/sheets/orders');
+        const result = await response.json();
+
+        if (response.ok && result.success) {
+            hideLoadingOverlay('Orders loaded from sheet.', 'success');
+            ordersTableBody.innerHTML = ''; // Clear loading message
+            if (result.orders.length === 0) {
+                ordersTableBody.innerHTML = '<tr><td colspan="8">No orders found in the Google Sheet.</td></tr>';
+                return;
+            }
+
+            result.orders.forEach(order => {
+                const row = document.createElement('tr');
+                const shippingAddress = `
+                    ${order.full_name || 'N/A'}<br>
+                    ${order.address_line1 || 'N/A'}<br>
+                    ${order.address_line2 || 'N/A'}${order.address_line3 ? ', ' + order.address_line3 : ''}<br>
+                    ${order.city || 'N/A'}, ${order.state || 'N/A'} - ${order.zip_code || 'N/A'}<br>
+                    Phone: ${order.phone || 'N/A'}
+                `;
+                const orderItemsHtml = `
+                    <ul>
+                        ${order.items.map(item => `<li>${item.name || 'Unknown Item'} x ${item.quantity} (₹${item.price ? parseFloat(item.price).toFixed(2) : '0.00'})</li>`).join('')}
+                    </ul>
+                `;
+
+                row.innerHTML = `
+                    <td>${order.id}</td>
+                    <td>${order.customer_username || 'N/A'} (${order.customer_email || 'N/A'})</td>
+                    <td>${new Date(order.order_date).toLocaleDateString()} ${new Date(order.order_date).toLocaleTimeString()}</td>
+                    <td>₹${order.total_amount ? parseFloat(order.total_amount).toFixed(2) : '0.00'}</td>
+                    <td>
+                        <select class="order-status-select" data-order-id="${order.id}">
+                            ${statusOptions.map(status => `
+                                <option value="${status}" ${order.status === status ? 'selected' : ''}>
+                                    ${status.charAt(0).toUpperCase() + status.slice(1)}
+                                </option>
+                            `).join('')}
+                        </select>
+                    </td>
+                    <td>${order.payment_method || 'N/A'}</td>
+                    <td>${shippingAddress}</td>
+                    <td class="order-items-list-cell">${orderItemsHtml}</td>
+                `;
+                ordersTableBody.appendChild(row);
+            });
+            attachAdminSheetsOrderEventListeners();
+        } else {
+            hideLoadingOverlay(result.message || 'Failed to load orders from sheet.', 'error');
+            ordersTableBody.innerHTML = `<tr><td colspan="8" class="message error">Failed to load orders: ${result.message || 'Unknown error'}</td></tr>`;
+            console.error('Failed to load orders from sheet:', result.message);
+        }
+    } catch (error) {
+        hideLoadingOverlay('An error occurred while loading orders from sheet.', 'error');
+        ordersTableBody.innerHTML = '<tr><td colspan="8" class="message error">An error occurred while loading orders.</td></tr>';
+        console.error('Fetch error loading orders from sheet:', error);
+    }
+}
+
+function attachAdminSheetsOrderEventListeners() {
+    document.querySelectorAll('.order-list-table .order-status-select').forEach(select => {
+        select.removeEventListener('change', updateOrderSheetStatus);
+        select.addEventListener('change', (e) => updateOrderSheetStatus(e.target.dataset.orderId, e.target.value));
+    });
+}
+
+async function updateOrderSheetStatus(orderId, newStatus) {
+    showLoadingOverlay(`Updating order #${orderId} status to ${newStatus}...`, 'spinner');
+    try {
+        const formData = new FormData();
+        formData.append('status', newStatus);
+
+        const response = await fetch(`/api/admin/sheets/orders/${orderId}/status`, {
+            method: 'PUT',
+            body: formData
+        });
+        const result = await response.json();
+
+        if (response.ok && result.success) {
+            hideLoadingOverlay(result.message, 'success');
+            displayMessage(result.message, 'success', 'orderMessages');
+            renderAdminSheetsOrders(); // Re-render the table to reflect changes
+        } else {
+            hideLoadingOverlay(result.message || 'Order status update failed.', 'error');
+            displayMessage(result.message || 'Order status update failed.', 'error', 'orderMessages');
+            console.error('Order status update failed:', result.message);
+            renderAdminSheetsOrders(); // Re-render to revert if update failed
+        }
+    } catch (error) {
+        hideLoadingOverlay('An error occurred during status update.', 'error');
+        displayMessage('An error occurred during status update.', 'error', 'orderMessages');
+        console.error('Fetch error during status update:', error);
+        renderAdminSheetsOrders(); // Re-render on network error
+    }
+}
+
+// --- Initializations ---
+ready.then(() => {
+    renderAdminSheetsOrders();
+});
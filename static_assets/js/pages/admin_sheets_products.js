@@ -0,0 +1,220 @@
+import { displayMessage, showLoadingOverlay, hideLoadingOverlay, ready } from '../core.js';
+
+// --- Admin Sheets Specific Logic (Google Sheets) ---
+
+// For admin_sheets_products.html
+async function renderAdminSheetsProducts() {
+    const productForm = document.getElementById('productForm');
+    const productsTableBody = document.getElementById('productsTableBody');
+    const saveProductBtn = document.getElementById('saveProductBtn');
+    const cancelEditBtn = document.getElementById('cancelEditBtn');
+    let editingProductId = null; // To track if we are in edit mode
+
+    if (!productForm || !productsTableBody || !saveProductBtn || !cancelEditBtn) {
+        console.warn("renderAdminSheetsProducts: Required elements for product sheets not found. Skipping.");
+        return;
+    }
+
+    productsTableBody.innerHTML = '<tr><td colspan="6">Loading products...</td></tr>';
+    showLoadingOverlay('Loading products from sheet...', 'spinner');
+    displayMessage('Loading products from sheet...', 'info', 'productMessages');
+
+    try {
+        const response = await fetch('/api/admin/sheets/products');
+        const result = await response.json();
+
+        if (response.ok && result.success) {
+            hideLoadingOverlay('Products loaded from sheet.', 'success');
+            productsTableBody.innerHTML = ''; // Clear loading message
+            // Only products that have a row in the sheet can be edited here; sheet endpoints take the sheet ID.
+            const sheetProducts = result.products.filter(product => product.sheet_id != null);
+            if (sheetProducts.length === 0) {
+                productsTableBody.innerHTML = '<tr><td colspan="6">No products found in the Google Sheet.</td></tr>';
+                return;
+            }
+
+            sheetProducts.forEach(product => {
+                const row = document.createElement('tr');
+                row.innerHTML = `
+                    <td>${product.sheet_id}</td>
+                    <td><img src="${product.image_url || 'https://placehold.co/60x60/cccccc/000000?text=No+Image'}" alt="${product.name || 'Product Image'}"></td>
+                    <td>${product.name || 'Unknown Product'}</td>
+                    <td>₹${product.price ? parseFloat(product.price).toFixed(2) : '0.00'}</td>
+                    <td>${product.stock || 0}</td>
+                    <td class="product-actions">
+                        <button class="btn edit-btn" data-id="${product.sheet_id}">Edit</button>
+                        <button class="btn delete-btn" data-id="${product.sheet_id}">Delete</button>
+                    </td>
+                `;
+                productsTableBody.appendChild(row);
+            });
+            attachAdminSheetsProductEventListeners();
+        } else {
+            hideLoadingOverlay(result.message || 'Failed to load products from sheet.', 'error');
+            productsTableBody.innerHTML = `<tr><td colspan="6" class="message error">Failed to load products: ${result.message || 'Unknown error'}</td></tr>`;
+            console.error('Failed to load products from sheet:', result.message);
+        }
+    } catch (error) {
+        hideLoadingOverlay('An error occurred while loading products from sheet.', 'error');
+        productsTableBody.innerHTML = '<tr><td colspan="6" class="message error">An error occurred while loading products.</td></tr>';
+        console.error('Fetch error loading products from sheet:', error);
+    }
+}
+
+function attachAdminSheetsProductEventListeners() {
+    document.querySelectorAll('.product-list-table .edit-btn').forEach(button => {
+        button.removeEventListener('click', editProductSheet);
+        button.addEventListener('click', (e) => editProductSheet(e.target.dataset.id));
+    });
+    document.querySelectorAll('.product-list-table .delete-btn').forEach(button => {
+        button.removeEventListener('click', deleteProductSheet);
+        button.addEventListener('click', (e) => deleteProductSheet(e.target.dataset.id));
+    });
+
+    const productForm = document.getElementById('productForm');
+    const saveProductBtn = document.getElementById('saveProductBtn');
+    const cancelEditBtn = document.getElementById('cancelEditBtn');
+
+    if (productForm) {
+        productForm.removeEventListener('submit', handleProductSheetFormSubmit);
+        productForm.addEventListener('submit', handleProductSheetFormSubmit);
+    }
+    if (cancelEditBtn) {
+        cancelEditBtn.removeEventListener('click', cancelProductSheetEdit);
+        cancelEditBtn.addEventListener('click', cancelProductSheetEdit);
+    }
+}
+
+let editingProductIdSheet = null; // Separate variable for sheets product editing
+
+async function editProductSheet(productId) {
+    const productForm = document.getElementById('productForm');
+    const saveProductBtn = document.getElementById('saveProductBtn');
+    const cancelEditBtn = document.getElementById('cancelEditBtn');
+
+    showLoadingOverlay('Loading product for edit...', 'spinner');
+    try {
+        const response = await fetch('/api/admin/sheets/products'); // Fetch all to find by ID
+        const result = await response.json();
+
+        if (response.ok && result.success) {
+            const productToEdit = result.products.find(p => p.sheet_id == productId);
+            if (productToEdit) {
+                hideLoadingOverlay('Product loaded.', 'success');
+                document.getElementById('productId').value = productToEdit.sheet_id;
+                document.getElementById('productName').value = productToEdit.name;
+                document.getElementById('productDescription').value = productToEdit.description;
+                document.getElementById('productPrice').value = productToEdit.price;
+                document.getElementById('productImage').value = productToEdit.image_url;
+                document.getElementById('productStock').value = productToEdit.stock;
+
+                saveProductBtn.textContent = 'Update Product';
+                cancelEditBtn.style.display = 'inline-block';
+                editingProductIdSheet = productId;
+                displayMessage(`Editing product ID: ${productId}`, 'info', 'productMessages');
+            } else {
+                hideLoadingOverlay('Product not found.', 'error');
+                displayMessage('Product not found for editing.', 'error', 'productMessages');
+            }
+        } else {
+            hideLoadingOverlay(result.message || 'Failed to load product.', 'error');
+            displayMessage(result.message || 'Failed to load product.', 'error', 'productMessages');
+        }
+    } catch (error) {
+        hideLoadingOverlay('Error loading product for edit.', 'error');
+        displayMessage('An error occurred loading product for edit.', 'error', 'productMessages');
+        console.error('Fetch error during product edit load:', error);
+    }
+}
+
+async function deleteProductSheet(productId) {
+    if (!confirm('Are you sure you want to delete this product?')) {
+        return;
+    }
+
+    showLoadingOverlay('Deleting product...', 'spinner');
+    try {
+        const response = await fetch(`/api/admin/sheets/products/${productId}`, {
+            method: 'DELETE'
+        });
+        const result = await response.json();
+
+        if (response.ok && result.success) {
+            hideLoadingOverlay(result.message, 'success');
+            displayMessage(result.message, 'success', 'productMessages');
+            renderAdminSheetsProducts(); // Re-render table
+        } else {
+            hideLoadingOverlay(result.message || 'Failed to delete product.', 'error');
+            displayMessage(result.message || 'Failed to delete product.', 'error', 'productMessages');
+            console.error('Product deletion failed:', result.message);
+        }
+    } catch (error) {
+        hideLoadingOverlay('An error occurred during product deletion.', 'error');
+        displayMessage('An error occurred during product deletion.', 'error', 'productMessages');
+        console.error('Fetch error during product deletion:', error);
+    }
+}
+
+async function handleProductSheetFormSubmit(e) {
+    e.preventDefault();
+    const productForm = document.getElementById('productForm');
+    const saveProductBtn = document.getElementById('saveProductBtn');
+    const cancelEditBtn = document.getElementById('cancelEditBtn');
+    const formData = new FormData(productForm);
+    let endpoint = '/api/admin/sheets/products';
+    let method = 'POST';
+    let successMessage = 'Product added successfully!';
+
+    if (editingProductIdSheet) {
+        endpoint = `/api/admin/sheets/products/${editingProductIdSheet}`;
+        method = 'PUT';
+        successMessage = 'Product updated successfully!';
+    }
+
+    showLoadingOverlay('Saving product...', 'spinner');
+    saveProductBtn.disabled = true;
+
+    try {
+        const response = await fetch(endpoint, {
+            method: method,
+            body: formData
+        });
+        const result = await response.json();
+
+        if (response.ok && result.success) {
+            hideLoadingOverlay(successMessage, 'success');
+            displayMessage(successMessage, 'success', 'productMessages');
+            productForm.reset();
+            saveProductBtn.textContent = 'Add Product';
+            cancelEditBtn.style.display = 'none';
+            editingProductIdSheet = null;
+            renderAdminSheetsProducts(); // Re-render table
+        } else {
+            hideLoadingOverlay(result.message || 'Product save failed.', 'error');
+            displayMessage(result.message || 'Product save failed.', 'error', 'productMessages');
+            console.error('Product save failed:', result.message);
+        }
+    } catch (error) {
+        hideLoadingOverlay('An error occurred while saving product.', 'error');
+        displayMessage('An error occurred while saving product.', 'error', 'productMessages');
+        console.error('Fetch error during product save:', error);
+    } finally {
+        saveProductBtn.disabled = false;
+    }
+}
+
+function cancelProductSheetEdit() {
+    const productForm = document.getElementById('productForm');
+    const saveProductBtn = document.getElementById('saveProductBtn');
+    const cancelEditBtn = document.getElementById('cancelEditBtn');
+    productForm.reset();
+    saveProductBtn.textContent = 'Add Product';
+    cancelEditBtn.style.display = 'none';
+    editingProductIdSheet = null;
+    displayMessage('Edit cancelled.', 'info', 'productMessages');
+}
+
+// --- Initializations ---
+ready.then(() => {
+    renderAdminSheetsProducts();
+});
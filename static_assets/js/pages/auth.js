@@ -0,0 +1,69 @@
+import { displayMessage, handleFormSubmission } from '../core.js';
+
+// --- Form Specific Handlers ---
+
+const loginForm = document.getElementById('loginForm');
+if (loginForm) {
+    loginForm.addEventListener('submit', (event) => {
+        handleFormSubmission(event, '/api/login'); // Redirect handled by server response
+    });
+}
+
+const adminLoginForm = document.getElementById('adminLoginForm');
+if (adminLoginForm) {
+    adminLoginForm.addEventListener('submit', (event) => {
+        handleFormSubmission(event, '/api/admin_login'); // Redirect handled by server response
+    });
+}
+
+const registerForm = document.getElementById('registerForm');
+if (registerForm) {
+    registerForm.addEventListener('submit', (event) => {
+        const password = document.getElementById('regPassword').value;
+        const confirmPassword = document.getElementById('regConfirmPassword').value;
+
+        if (password !== confirmPassword) {
+            displayMessage('Passwords do not match.', 'error', 'formMessages');
+            // No need to hide loading overlay here as it's not shown yet by handleFormSubmission
+            return;
+        }
+        handleFormSubmission(event, '/api/register', 'login.html');
+    });
+}
+
+const forgotPasswordForm = document.getElementById('passwordResetForm'); 
+if (forgotPasswordForm) {
+    forgotPasswordForm.dataset.messageTargetId = 'resetMessages'; 
+    forgotPasswordForm.addEventListener('submit', (event) => {
+        handleFormSubmission(event, '/api/forgot_password', null, 'resetMessages');
+    });
+}
+
+const resetPasswordForm = document.getElementById('resetPasswordForm');
+if (resetPasswordForm) {
+    const urlParams = new URLSearchParams(window.location.search);
+    const token = urlParams.get('token');
+
+    const resetTokenField = document.getElementById('resetToken');
+    if (resetTokenField && token) {
+        resetTokenField.value = token;
+    } else if (!token) {
+        displayMessage('Invalid or missing password reset token. Please try again from the forgot password link.', 'error', 'formMessages');
+        resetPasswordForm.style.display = 'none';
+        // No need to hide loading overlay here as it's not shown yet by handleFormSubmission
+    }
+
+    resetPasswordForm.addEventListener('submit', async (event) => {
+        event.preventDefault();
+
+        const newPassword = document.getElementById('newPassword').value;
+        const confirmNewPassword = document.getElementById('confirmNewPassword').value;
+
+        if (newPassword !== confirmNewPassword) {
+            displayMessage('New passwords do not match.', 'error', 'formMessages');
+            // No need to hide loading overlay here as it's not shown yet by handleFormSubmission
+            return;
+        }
+        await handleFormSubmission(event, '/api/reset_password', 'login.html');
+    });
+}
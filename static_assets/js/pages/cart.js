@@ -0,0 +1,201 @@
+import { isLoggedIn, displayMessage, showLoginRequiredModal, fetchCart, invalidateCart, cartItemCountSpan, ready } from '../core.js';
+
+// Function to render cart items on the cart page
+async function renderCartPage() {
+    const cartItemsContainer = document.getElementById('cartItemsContainer');
+    const emptyMessage = document.getElementById('emptyCartMessage');
+    const cartSubtotalElement = document.getElementById('cartSubtotal');
+    const cartShippingElement = document.getElementById('cartShipping');
+    const cartTotalElement = document.getElementById('cartTotal');
+    const cartPageMessage = document.getElementById('cartPageMessages');
+
+    if (!cartItemsContainer || !emptyMessage || !cartSubtotalElement || !cartShippingElement || !cartTotalElement) {
+        console.warn("renderCartPage: Cart page elements not found. Cannot render cart.");
+        return;
+    }
+
+    // Only attempt to load cart if logged in
+    if (!isLoggedIn) {
+        displayMessage('Please log in to view your cart.', 'info', 'cartPageMessages');
+        emptyMessage.style.display = 'block';
+        document.querySelector('.cart-summary-card').style.display = 'none';
+        document.querySelector('.cart-action-buttons').style.display = 'none';
+        return;
+    }
+
+    displayMessage('Loading cart...', 'info', 'cartPageMessages');
+
+    try {
+        const data = await fetchCart();
+
+        if (!data.success) {
+            cartItemsContainer.innerHTML = '';
+            displayMessage(data.message || 'Failed to load cart items.', 'error', 'cartPageMessages');
+            emptyMessage.style.display = 'block';
+            document.querySelector('.cart-summary-card').style.display = 'none';
+            document.querySelector('.cart-action-buttons').style.display = 'none';
+            return;
+        }
+
+        renderCartItems(data.items);
+    } catch (error) {
+        console.error('renderCartPage: Error rendering cart page:', error);
+        displayMessage('Error loading cart. Please try again.', 'error', 'cartPageMessages');
+        emptyMessage.style.display = 'block';
+        document.querySelector('.cart-summary-card').style.display = 'none';
+        document.querySelector('.cart-action-buttons').style.display = 'none';
+    }
+}
+
+// Draws the cart page from a list of cart items (as returned by the cart APIs)
+function renderCartItems(cartItems) {
+    const cartItemsContainer = document.getElementById('cartItemsContainer');
+    const emptyMessage = document.getElementById('emptyCartMessage');
+    const cartSubtotalElement = document.getElementById('cartSubtotal');
+    const cartShippingElement = document.getElementById('cartShipping');
+    const cartTotalElement = document.getElementById('cartTotal');
+
+    cartItemsContainer.innerHTML = ''; // Clear existing items
+    let subtotal = 0;
+    if (cartItems.length === 0) {
+        displayMessage('Your cart is empty!', 'info', 'cartPageMessages');
+        emptyMessage.style.display = 'block';
+        document.querySelector('.cart-summary-card').style.display = 'none';
+        document.querySelector('.cart-action-buttons').style.display = 'none';
+    } else {
+        displayMessage('', '', 'cartPageMessages');
+        emptyMessage.style.display = 'none';
+        document.querySelector('.cart-summary-card').style.display = 'block';
+        document.querySelector('.cart-action-buttons').style.display = 'flex';
+
+        cartItems.forEach(item => {
+            const itemTotal = parseFloat(item.price) * parseInt(item.quantity);
+            subtotal += itemTotal;
+
+            const cartItemDiv = document.createElement('div');
+            cartItemDiv.className = 'cart-item';
+            cartItemDiv.innerHTML = `
+                <img src="${item.image_url || 'https://placehold.co/100x100/E0F2F1/000000?text=Product'}" alt="${item.name || 'Product Image'}" class="cart-item-image">
+                <div class="cart-item-details">
+                    <h4 class="cart-item-name">${item.name || 'Unknown Product'}</h4>
+                    <p class="cart-item-price">Price: ₹${parseFloat(item.price).toFixed(2)}</p>
+                </div>
+                <div class="cart-item-quantity-controls">
+                    <button class="quantity-btn decrease-quantity-btn" data-product-id="${item.product_id}">-</button>
+                    <span class="item-quantity">${item.quantity}</span>
+                    <button class="quantity-btn increase-quantity-btn" data-product-id="${item.product_id}">+</button>
+                </div>
+                <div class="cart-item-total">₹${itemTotal.toFixed(2)}</div>
+                <button class="remove-item-btn" data-product-id="${item.product_id}"><i class="bi bi-trash-fill"></i></button>
+            `;
+            cartItemsContainer.appendChild(cartItemDiv);
+        });
+    }
+
+    cartSubtotalElement.textContent = `₹${subtotal.toFixed(2)}`;
+    cartShippingElement.textContent = `Free`;
+    cartTotalElement.textContent = `₹${subtotal.toFixed(2)}`;
+
+    addCartEventListeners();
+}
+
+// Function to add event listeners to cart quantity and remove buttons (called after rendering)
+function addCartEventListeners() {
+    document.querySelectorAll('.increase-quantity-btn').forEach(button => {
+        button.removeEventListener('click', handleCartItemQuantityChange);
+        button.addEventListener('click', handleCartItemQuantityChange);
+    });
+    document.querySelectorAll('.decrease-quantity-btn').forEach(button => {
+        button.removeEventListener('click', handleCartItemQuantityChange);
+        button.addEventListener('click', handleCartItemQuantityChange);
+    });
+    document.querySelectorAll('.remove-item-btn').forEach(button => {
+        button.removeEventListener('click', handleRemoveItemClick);
+        button.addEventListener('click', handleRemoveItemClick);
+    });
+}
+
+// Quantity clicks on the cart page are applied to the page immediately and collected here, then
+// sent together to /api/cart/batch once the clicking pauses; its response re-renders the cart.
+const pendingCartQuantities = {};
+let cartBatchTimer = null;
+
+function queueCartQuantity(productId, quantity, delay = 400) {
+    pendingCartQuantities[productId] = quantity;
+    clearTimeout(cartBatchTimer);
+    cartBatchTimer = setTimeout(flushCartChanges, delay);
+}
+
+async function flushCartChanges() {
+    const changes = Object.entries(pendingCartQuantities).map(([productId, quantity]) => ({
+        product_id: parseInt(productId), quantity: quantity
+    }));
+    if (changes.length === 0) return;
+    changes.forEach(change => delete pendingCartQuantities[change.product_id]);
+
+    const cartMessages = document.getElementById('cartPageMessages') || document.getElementById('formMessages');
+    displayMessage('Updating cart...', 'info', cartMessages.id);
+
+    try {
+        const response = await fetch('/api/cart/batch', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ changes: changes })
+        });
+        const data = await response.json();
+        if (data.success) {
+            invalidateCart(data);
+            renderCartItems(data.items);
+            if (data.items.length > 0) displayMessage(data.message, 'success', cartMessages.id);
+            if (cartItemCountSpan) cartItemCountSpan.textContent = data.count;
+        } else {
+            displayMessage(`Failed to update cart: ${data.message || 'Unknown error'}`, 'error', cartMessages.id);
+            invalidateCart();
+            renderCartPage();
+        }
+    } catch (error) {
+        console.error('flushCartChanges: Network error updating cart:', error);
+        displayMessage('Network error updating cart.', 'error', cartMessages.id);
+        invalidateCart();
+        renderCartPage();
+    }
+}
+
+function handleCartItemQuantityChange(event) {
+    if (!isLoggedIn) {
+        showLoginRequiredModal('Please log in to update cart quantity.');
+        return;
+    }
+
+    const productId = event.target.dataset.productId;
+    const quantityDisplay = event.target.closest('.cart-item-quantity-controls').querySelector('.item-quantity');
+    const change = event.target.classList.contains('increase-quantity-btn') ? 1 : -1;
+    const newQuantity = Math.max(0, parseInt(quantityDisplay.textContent) + change);
+    quantityDisplay.textContent = newQuantity;
+    queueCartQuantity(productId, newQuantity, newQuantity === 0 ? 0 : undefined);
+}
+
+function handleRemoveItemClick(event) {
+    if (!isLoggedIn) {
+        showLoginRequiredModal('Please log in to remove items from cart.');
+        return;
+    }
+    const productId = event.currentTarget.dataset.productId;
+    queueCartQuantity(productId, 0, 0);
+}
+
+// --- Initializations ---
+ready.then(() => {
+    renderCartPage();
+
+    const continueShoppingBtn = document.getElementById('continueShoppingBtn');
+    if (continueShoppingBtn) {
+        continueShoppingBtn.addEventListener('click', () => { window.location.href = 'products.html'; });
+    }
+    const proceedToCheckoutBtn = document.getElementById('proceedToCheckoutBtn');
+    if (proceedToCheckoutBtn) {
+        proceedToCheckoutBtn.addEventListener('click', () => {
+            window.location.href = 'checkout.html';
+        });
+    }
+});
@@ -0,0 +1,136 @@
+import { isLoggedIn, displayMessage, showLoadingOverlay, hideLoadingOverlay, ready } from '../core.js';
+import { renderOrderSummary } from '../order_summary.js';
+
+// Function to load saved shipping information and pre-fill the form
+async function loadShippingInfo() {
+    const shippingForm = document.getElementById('shippingForm');
+    if (!shippingForm) {
+        return;
+    }
+    const checkoutMessages = document.getElementById('checkoutMessages');
+
+    // Only attempt to load shipping info if logged in
+    if (!isLoggedIn) {
+        displayMessage('Please log in to manage shipping information.', 'info', 'checkoutMessages');
+        shippingForm.style.display = 'none'; // Hide form if not logged in
+        return;
+    }
+
+    showLoadingOverlay('Loading shipping information...', 'spinner'); // Show loading overlay
+
+    try {
+        const response = await fetch('/api/get_shipping_info');
+        const data = await response.json();
+
+        if (data.success && data.shipping_info) {
+            const info = data.shipping_info;
+            document.getElementById('fullName').value = info.full_name || '';
+            document.getElementById('addressLine1').value = info.address_line1 || '';
+            document.getElementById('addressLine2').value = info.address_line2 || '';
+            const addressLine3Input = document.getElementById('addressLine3');
+            if (addressLine3Input) {
+                addressLine3Input.value = info.address_line3 || '';
+            }
+            document.getElementById('city').value = info.city || '';
+            document.getElementById('state').value = info.state || '';
+            document.getElementById('zipCode').value = info.zip_code || '';
+            document.getElementById('phone').value = info.phone || '';
+
+            hideLoadingOverlay('Saved shipping information loaded.', 'success'); // Hide with success message
+            displayMessage('Saved shipping information loaded.', 'info', 'checkoutMessages');
+        } else {
+            console.log('loadShippingInfo: No saved shipping information found or failed to load:', data.message);
+            hideLoadingOverlay('No saved shipping information.', 'info'); // Hide with info message
+        }
+    } catch (error) {
+        console.error('loadShippingInfo: Network error loading shipping info:', error);
+        hideLoadingOverlay('Network error loading shipping info.', 'error'); // Hide with network error message
+    }
+}
+
+
+// --- Checkout Page Specific Logic (Now only for Shipping) ---
+const shippingForm = document.getElementById('shippingForm');
+if (shippingForm) {
+    shippingForm.addEventListener('submit', async (event) => {
+        event.preventDefault();
+        
+        if (!isLoggedIn) {
+            displayMessage('Please log in to save shipping information.', 'info', 'checkoutMessages');
+            return;
+        }
+
+        const requiredInputs = shippingForm.querySelectorAll('input[required]');
+        let allFieldsFilled = true;
+        for (const input of requiredInputs) {
+            if (!input.value.trim()) {
+                allFieldsFilled = false;
+                break;
+            }
+        }
+
+        if (!allFieldsFilled) {
+            displayMessage('Please fill in all required shipping fields.', 'error', 'checkoutMessages');
+            return;
+        }
+
+        const zipCodeInput = document.getElementById('zipCode');
+        const phoneInput = document.getElementById('phone');
+
+        const zipCodePattern = /^\d{5,6}$/;
+        const phonePattern = /^\d{10}$/;
+
+        if (zipCodeInput && !zipCodePattern.test(zipCodeInput.value)) {
+            displayMessage('Invalid Zip Code format. Must be 5 or 6 digits.', 'error', 'checkoutMessages');
+            return;
+        }
+        if (phoneInput && !phonePattern.test(phoneInput.value)) {
+            displayMessage('Invalid Phone Number format. Must be 10 digits.', 'error', 'checkoutMessages');
+            return;
+        }
+
+        showLoadingOverlay('Saving shipping information...', 'spinner'); // Show loading overlay
+        displayMessage('Saving shipping information...', 'info', 'checkoutMessages');
+        const submitBtn = shippingForm.querySelector('.next-step-btn');
+        submitBtn.disabled = true;
+
+        const formData = new FormData(shippingForm);
+        const addressLine3Input = document.getElementById('addressLine3');
+        if (addressLine3Input) {
+            formData.append('addressLine3', addressLine3Input.value);
+        }
+
+        try {
+            const response = await fetch('/api/save_shipping_info', {
+                method: 'POST',
+                body: formData
+            });
+            const data = await response.json();
+
+            if (data.success) {
+                hideLoadingOverlay(data.message, 'success'); // Hide with success message
+                displayMessage(data.message, 'success', 'checkoutMessages');
+                if (data.redirect) {
+                    setTimeout(() => {
+                        window.location.href = data.redirect;
+                    }, 1000);
+                }
+            } else {
+                hideLoadingOverlay(data.message || 'Failed to save shipping information.', 'error'); // Hide with error message
+                displayMessage(data.message || 'Failed to save shipping information.', 'error', 'checkoutMessages');
+            }
+        } catch (error) {
+            console.error('Error saving shipping info (network/unhandled):', error);
+            hideLoadingOverlay('Network error saving shipping information.', 'error'); // Hide with network error message
+            displayMessage('Network error saving shipping information. Please try again.', 'error', 'checkoutMessages');
+        } finally {
+            submitBtn.disabled = false;
+        }
+    });
+}
+
+// --- Initializations ---
+ready.then(() => {
+    renderOrderSummary('checkoutMessages');
+    loadShippingInfo();
+});
@@ -0,0 +1,8 @@
+import { handleFormSubmission } from '../core.js';
+
+const contactForm = document.getElementById('contactForm');
+if (contactForm) {
+    contactForm.addEventListener('submit', (event) => {
+        handleFormSubmission(event, '/api/contact_us');
+    });
+}
@@ -0,0 +1,112 @@
+import { displayMessage, showLoadingOverlay, hideLoadingOverlay } from '../core.js';
+
+const csvImportForm = document.getElementById('csvImportForm');
+if (csvImportForm) {
+    const importProgress = document.getElementById('importProgress');
+
+    function showImportErrors(errors, errorCount) {
+        const importErrorsDiv = document.getElementById('importErrors');
+        if (!importErrorsDiv || !errors || errors.length === 0) return;
+        importErrorsDiv.style.display = 'block';
+        importErrorsDiv.innerHTML = '';
+        const ul = document.createElement('ul');
+        errors.forEach(error => {
+            const li = document.createElement('li');
+            li.textContent = error;
+            ul.appendChild(li);
+        });
+        importErrorsDiv.appendChild(ul);
+        if (errorCount > errors.length) {
+            const more = document.createElement('p');
+            more.textContent = `...and ${errorCount - errors.length} more rows with errors.`;
+            importErrorsDiv.appendChild(more);
+        }
+    }
+
+    // Polls a background import job until it finishes, updating the progress bar on the way.
+    async function pollImportJob(statusUrl) {
+        while (true) {
+            await new Promise(resolve => setTimeout(resolve, 1000));
+            const response = await fetch(statusUrl);
+            const data = await response.json();
+            if (!data.success) {
+                throw new Error(data.message);
+            }
+            const job = data.job;
+            if (importProgress) importProgress.value = job.progress;
+            if (job.status === 'queued' || job.status === 'running') {
+                displayMessage(`Importing products... ${job.rows_processed} rows processed (${job.progress}%).`, 'info', 'importMessages');
+                continue;
+            }
+            return job;
+        }
+    }
+
+    csvImportForm.addEventListener('submit', async (e) => {
+        e.preventDefault();
+
+        const fileInput = document.getElementById('csvFile');
+        const file = fileInput.files[0];
+        const importMessagesDiv = document.getElementById('importMessages');
+        const importErrorsDiv = document.getElementById('importErrors');
+
+        if (importMessagesDiv) {
+            importMessagesDiv.style.display = 'none';
+            importMessagesDiv.textContent = '';
+        }
+        if (importErrorsDiv) {
+            importErrorsDiv.style.display = 'none';
+            importErrorsDiv.innerHTML = '';
+        }
+        if (importProgress) {
+            importProgress.style.display = 'none';
+            importProgress.value = 0;
+        }
+
+        if (!file) {
+            displayMessage('Please select a CSV file to upload.', 'error', 'importMessages');
+            return;
+        }
+
+        const formData = new FormData();
+        formData.append('file', file);
+
+        try {
+            displayMessage('Uploading products file...', 'info', 'importMessages');
+            showLoadingOverlay('Uploading products file...', 'spinner');
+            const response = await fetch('/api/import_products', {
+                method: 'POST',
+                body: formData
+            });
+            const data = await response.json();
+
+            if (!data.success) {
+                hideLoadingOverlay('Import failed!', 'error');
+                displayMessage(data.message, 'error', 'importMessages');
+                showImportErrors(data.errors, data.errors ? data.errors.length : 0);
+                return;
+            }
+
+            hideLoadingOverlay('Upload complete!', 'success');
+            displayMessage(data.message, 'info', 'importMessages');
+            fileInput.value = '';
+            if (importProgress) importProgress.style.display = 'block';
+
+            const job = await pollImportJob(data.status_url);
+            if (job.status === 'completed') {
+                displayMessage(job.message, 'success', 'importMessages');
+                if (job.error_count > 0) {
+                    showImportErrors(job.errors, job.error_count);
+                    displayMessage('Some rows had errors. See details below.', 'error', 'importMessages');
+                }
+            } else {
+                displayMessage(job.message || 'Import failed.', 'error', 'importMessages');
+                showImportErrors(job.errors, job.error_count);
+            }
+        } catch (error) {
+            console.error('Error during CSV import:', error);
+            hideLoadingOverlay('Network error!', 'error');
+            displayMessage('An unexpected error occurred during import. Please check server logs.', 'error', 'importMessages');
+        }
+    });
+}
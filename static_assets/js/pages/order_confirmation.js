@@ -0,0 +1,99 @@
+import { isLoggedIn, displayMessage, showLoadingOverlay, hideLoadingOverlay, ready } from '../core.js';
+
+async function renderOrderConfirmationPage() {
+    const confirmationContainer = document.querySelector('.order-confirmation-section');
+    if (!confirmationContainer) {
+        return;
+    }
+    showLoadingOverlay('Loading order details...', 'spinner');
+
+    const urlParams = new URLSearchParams(window.location.search);
+    const orderId = urlParams.get('order_id');
+    const confirmationMessages = document.getElementById('confirmationMessages');
+    
+    if (!orderId) {
+        displayMessage('Order ID missing from URL. Cannot display order details.', 'error', 'confirmationMessages');
+        const orderDetailsSummary = document.querySelector('.order-details-summary');
+        if (orderDetailsSummary) orderDetailsSummary.style.display = 'none';
+        hideLoadingOverlay('Error loading order details.', 'error');
+        return;
+    }
+
+    // Only load order details if logged in (as it's user-specific data)
+    if (!isLoggedIn) {
+        displayMessage('Please log in to view order details.', 'info', 'confirmationMessages');
+        const orderDetailsSummary = document.querySelector('.order-details-summary');
+        if (orderDetailsSummary) orderDetailsSummary.style.display = 'none';
+        hideLoadingOverlay('Not logged in.', 'info');
+        return;
+    }
+
+
+    try {
+        const response = await fetch(`/api/get_order_details/${orderId}`);
+        const data = await response.json();
+
+        if (data.success && data.order) {
+            const order = data.order;
+            document.getElementById('orderIdDisplay').textContent = `#${order.id}`;
+            document.getElementById('orderDateDisplay').textContent = new Date(order.order_date).toLocaleString();
+            document.getElementById('orderTotalDisplay').textContent = `₹${parseFloat(order.total_amount).toFixed(2)}`;
+            document.getElementById('paymentMethodDisplay').textContent = order.payment_method ? order.payment_method.toUpperCase() : 'N/A';
+            
+            const orderStatusDisplay = document.getElementById('orderStatusDisplay');
+            orderStatusDisplay.textContent = order.status;
+            orderStatusDisplay.className = `order-status-badge ${order.status.toLowerCase()}`;
+
+
+            const shippingAddressDisplay = document.getElementById('shippingAddressDisplay');
+            shippingAddressDisplay.innerHTML = `
+                <p>${order.full_name}</p>
+                <p>${order.address_line1}</p>
+                <p>${order.address_line2}</p>
+                ${order.address_line3 ? `<p>${order.address_line3}</p>` : ''}
+                <p>${order.city}, ${order.state} - ${order.zip_code}</p>
+                <p>Phone: ${order.phone}</p>
+            `;
+
+            const orderItemsDisplay = document.getElementById('orderItemsDisplay');
+            orderItemsDisplay.innerHTML = '';
+            if (order.items && order.items.length > 0) {
+                order.items.forEach(item => {
+                    const itemDiv = document.createElement('div');
+                    itemDiv.className = 'order-item';
+                    itemDiv.innerHTML = `
+                        <img src="${item.image_url || 'https://placehold.co/60x60/E0F2F1/000000?text=Product'}" alt="${item.product_name || 'Product Image'}" class="order-item-image">
+                        <div class="order-item-details">
+                            <h4>${item.product_name || 'Unknown Product'}</h4>
+                            <p>${item.quantity} x ₹${parseFloat(item.product_price).toFixed(2)}</p>
+                        </div>
+                        <span class="order-item-price-total">₹${(item.quantity * parseFloat(item.product_price)).toFixed(2)}</span>
+                    `;
+                    orderItemsDisplay.appendChild(itemDiv);
+                });
+            } else {
+                orderItemsDisplay.innerHTML = '<p>No items found for this order.</p>';
+            }
+
+            hideLoadingOverlay('Order details loaded successfully!', 'success'); // Hide with success message
+            displayMessage('Order details loaded.', 'success', 'confirmationMessages');
+
+        } else {
+            hideLoadingOverlay('Failed to load order details.', 'error'); // Hide with error message
+            displayMessage(data.message || 'Failed to load order details.', 'error', 'confirmationMessages');
+            const orderDetailsSummary = document.querySelector('.order-details-summary');
+            if (orderDetailsSummary) orderDetailsSummary.style.display = 'none';
+        }
+    } catch (error) {
+        console.error('renderOrderConfirmationPage: Network error fetching order details:', error);
+        hideLoadingOverlay('Network error!', 'error'); // Hide with network error message
+        displayMessage('Network error loading order details. Please try again.', 'error', 'confirmationMessages');
+        const orderDetailsSummary = document.querySelector('.order-details-summary');
+        if (orderDetailsSummary) orderDetailsSummary.style.display = 'none';
+    }
+}
+
+// --- Initializations ---
+ready.then(() => {
+    renderOrderConfirmationPage();
+});
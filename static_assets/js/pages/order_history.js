@@ -0,0 +1,142 @@
+import { isLoggedIn, displayMessage, showLoadingOverlay, hideLoadingOverlay, ready } from '../core.js';
+
+// --- Order History Page Logic ---
+function createOrderCard(order) {
+    const orderDate = new Date(order.order_date).toLocaleString();
+    const orderCard = document.createElement('div');
+    orderCard.className = 'order-card';
+    orderCard.innerHTML = `
+        <div class="order-header">
+            <h3>Order #${order.id}</h3>
+            <span class="order-status-badge ${order.status.toLowerCase()}">${order.status}</span>
+        </div>
+        <div class="order-details">
+            <div><strong>Order Date:</strong> ${orderDate}</div>
+            <div><strong>Total:</strong> ₹${parseFloat(order.total_amount).toFixed(2)}</div>
+            <div><strong>Payment Method:</strong> ${order.payment_method ? order.payment_method.toUpperCase() : 'N/A'}</div>
+            <div><strong>Ship To:</strong> ${order.full_name}</div>
+            <div><strong>Address:</strong> ${order.address_line1}, ${order.address_line2}</div>
+            ${order.address_line3 ? `<div><strong>Landmark:</strong> ${order.address_line3}</div>` : ''}
+            <div><strong>City:</strong> ${order.city}, ${order.state} - ${order.zip_code}</div>
+            <div><strong>Phone:</strong> ${order.phone}</div>
+        </div>
+        <div class="order-items-list">
+            <h4>Items:</h4>
+            ${order.items.map(item => `
+                <div class="order-item">
+                    <img src="${item.image_url || 'https://placehold.co/60x60/E0F2F1/000000?text=Product'}" alt="${item.product_name || 'Product Image'}" class="order-item-image">
+                    <div class="order-item-details">
+                        <h4>${item.product_name || 'Unknown Product'}</h4>
+                        <p>${item.quantity} x ₹${parseFloat(item.product_price).toFixed(2)}</p>
+                    </div>
+                    <span class="order-item-price-total">₹${(item.quantity * parseFloat(item.product_price)).toFixed(2)}</span>
+                </div>
+            `).join('')}
+        </div>
+    `;
+    return orderCard;
+}
+
+async function renderOrderHistory() {
+    const ordersContainer = document.getElementById('ordersContainer');
+    const noOrdersMessage = document.getElementById('noOrdersMessage');
+    const orderHistoryMessages = document.getElementById('orderHistoryMessages');
+
+    if (!ordersContainer || !noOrdersMessage || !orderHistoryMessages) {
+        console.warn("renderOrderHistory: Required elements not found on order history page.");
+        return;
+    }
+
+    // Only load order history if logged in
+    if (!isLoggedIn) {
+        displayMessage('Please log in to view your order history.', 'info', 'orderHistoryMessages');
+        noOrdersMessage.style.display = 'block';
+        ordersContainer.innerHTML = ''; // Clear any loading message
+        return;
+    }
+
+    ordersContainer.innerHTML = '';
+    showLoadingOverlay('Loading order history...', 'spinner'); // Show loading overlay
+    displayMessage('Loading order history...', 'info', 'orderHistoryMessages');
+    noOrdersMessage.style.display = 'none';
+
+    // Orders are fetched a page at a time; the next page is requested when the
+    // sentinel below the list scrolls into view.
+    const sentinel = document.createElement('div');
+    sentinel.className = 'order-history-sentinel';
+    ordersContainer.after(sentinel);
+    let nextCursor = null;
+    let isLoadingPage = false;
+    let observer = null;
+
+    async function loadOrderHistoryPage(isFirstPage) {
+        if (isLoadingPage) return;
+        isLoadingPage = true;
+        try {
+            const url = nextCursor
+                ? `/api/get_order_history?cursor=${encodeURIComponent(nextCursor)}`
+                : '/api/get_order_history';
+            const response = await fetch(url);
+            const data = await response.json();
+
+            if (!data.success) {
+                if (isFirstPage) {
+                    hideLoadingOverlay('Failed to load order history.', 'error'); // Hide with error message
+                    noOrdersMessage.style.display = 'block';
+                }
+                displayMessage(data.message || 'Failed to load order history.', 'error', 'orderHistoryMessages');
+                if (observer) observer.disconnect();
+                return;
+            }
+
+            const orders = data.orders;
+            if (isFirstPage && orders.length === 0) {
+                hideLoadingOverlay('You have no past orders.', 'info'); // Hide with info message
+                displayMessage('You have no past orders.', 'info', 'orderHistoryMessages');
+                noOrdersMessage.style.display = 'block';
+            } else {
+                if (isFirstPage) {
+                    hideLoadingOverlay('Order history loaded.', 'success'); // Hide with success message
+                    displayMessage('', '', 'orderHistoryMessages');
+                }
+                orders.forEach(order => ordersContainer.appendChild(createOrderCard(order)));
+            }
+
+            nextCursor = data.next_cursor;
+            if (!nextCursor && observer) {
+                observer.disconnect();
+                sentinel.remove();
+            } else if (observer) {
+                // Re-observe so a sentinel that is still on screen triggers the next page.
+                observer.unobserve(sentinel);
+                observer.observe(sentinel);
+            }
+        } catch (error) {
+            console.error('renderOrderHistory: Error fetching order history:', error);
+            if (isFirstPage) {
+                hideLoadingOverlay('Network error loading history.', 'error'); // Hide with network error message
+                noOrdersMessage.style.display = 'block';
+            }
+            displayMessage('Error loading order history. Please try again.', 'error', 'orderHistoryMessages');
+        } finally {
+            isLoadingPage = false;
+        }
+    }
+
+    await loadOrderHistoryPage(true);
+    if (nextCursor) {
+        observer = new IntersectionObserver(entries => {
+            if (entries.some(entry => entry.isIntersecting) && nextCursor) {
+                loadOrderHistoryPage(false);
+            }
+        }, { rootMargin: '400px' });
+        observer.observe(sentinel);
+    } else {
+        sentinel.remove();
+    }
+}
+
+// --- Initializations ---
+ready.then(() => {
+    renderOrderHistory();
+});
@@ -0,0 +1,258 @@
+import { isLoggedIn, displayMessage, showLoadingOverlay, hideLoadingOverlay, showLoginRequiredModal, invalidateCart, updateCartCount, ready } from '../core.js';
+import { renderOrderSummary } from '../order_summary.js';
+
+// --- Payment Page Specific Logic ---
+let simulatedOtp = ''; // To store the generated OTP for demonstration
+const cardPaymentForm = document.getElementById('cardPaymentForm');
+const upiPaymentForm = document.getElementById('upiPaymentSection');
+const codPaymentForm = document.getElementById('codPaymentSection');
+const paymentMessages = document.getElementById('paymentMessages');
+
+const otpVerificationSection = document.getElementById('otpVerificationSection');
+const otpInput = document.getElementById('otpInput');
+const verifyOtpBtn = document.getElementById('verifyOtpBtn');
+const resendOtpLink = document.getElementById('resendOtpLink');
+const otpMessage = document.getElementById('otpMessage');
+
+
+function showPaymentMethod(methodId) {
+    document.querySelectorAll('.payment-method-content').forEach(section => {
+        section.style.display = 'none';
+    });
+    const selectedSection = document.getElementById(methodId);
+    if (selectedSection) {
+        selectedSection.style.display = 'block';
+    }
+    
+    const placeOrderBtn = document.getElementById('placeOrderBtn');
+    if (placeOrderBtn) {
+        if (methodId === 'codPaymentSection') {
+            placeOrderBtn.style.display = 'block';
+            displayMessage('Cash on Delivery selected. Review your order and place it.', 'info', 'paymentMessages');
+        } else {
+            placeOrderBtn.style.display = 'none';
+            displayMessage('', '', 'paymentMessages');
+        }
+    }
+
+    if (otpVerificationSection) {
+        otpVerificationSection.style.display = 'none';
+        otpInput.value = '';
+        displayMessage('', '', 'otpMessage');
+    }
+    if (cardPaymentForm) {
+        cardPaymentForm.querySelectorAll('input').forEach(input => input.readOnly = false);
+        cardPaymentForm.querySelector('.next-step-btn').disabled = false;
+    }
+}
+
+document.querySelectorAll('input[name="paymentMethod"]').forEach(radio => {
+    radio.addEventListener('change', (event) => {
+        showPaymentMethod(event.target.value + 'PaymentSection');
+    });
+});
+
+if (cardPaymentForm) {
+    cardPaymentForm.addEventListener('submit', (event) => {
+        event.preventDefault();
+
+        if (!isLoggedIn) {
+            showLoginRequiredModal('Please log in to proceed with payment.');
+            return;
+        }
+
+        const cardNameInput = document.getElementById('cardName');
+        const cardNumberInput = document.getElementById('cardNumber');
+        const expiryDateInput = document.getElementById('expiryDate');
+        const cvvInput = document.getElementById('cvv');
+
+        if (cardNameInput && !cardNameInput.checkValidity()) {
+            displayMessage(cardNameInput.title || 'Please enter the name on the card.', 'error', 'paymentMessages');
+            return;
+        }
+
+        const cardNumberPattern = /^\d{13,16}$/;
+        const expiryDatePattern = /^(0[1-9]|1[0-2])\/\d{2}$/;
+        const cvvPattern = /^\d{3,4}$/;
+
+        if (cardNumberInput && !cardNumberPattern.test(cardNumberInput.value)) {
+            displayMessage('Invalid Card Number. Must be 13-16 digits.', 'error', 'paymentMessages');
+            return;
+        }
+        if (expiryDateInput && !expiryDatePattern.test(expiryDateInput.value)) {
+            displayMessage('Invalid Expiry Date format (MM/YY).', 'error', 'paymentMessages');
+            return;
+        }
+        if (cvvInput && !cvvPattern.test(cvvInput.value)) {
+            displayMessage('Invalid CVV. Must be 3 or 4 digits.', 'error', 'paymentMessages');
+            return;
+        }
+        
+        const [month, year] = expiryDateInput.value.split('/').map(Number);
+        const currentYear = new Date().getFullYear() % 100;
+        const currentMonth = new Date().getMonth() + 1;
+        
+        if (year < currentYear || (year === currentYear && month < currentMonth)) {
+            displayMessage('Expiry date cannot be in the past.', 'error', 'paymentMessages');
+            return;
+        }
+
+        showLoadingOverlay('Card details confirmed. Sending OTP...', 'spinner'); // Show loading overlay
+        displayMessage('Card details confirmed. Sending OTP...', 'info', 'paymentMessages');
+        cardPaymentForm.querySelector('.next-step-btn').disabled = true;
+        cardPaymentForm.querySelectorAll('input').forEach(input => input.readOnly = true);
+
+        simulatedOtp = Math.floor(100000 + Math.random() * 900000).toString();
+        console.log('Simulated OTP:', simulatedOtp);
+
+        if (otpVerificationSection) {
+            otpVerificationSection.style.display = 'block';
+            hideLoadingOverlay('OTP sent!', 'success'); // Hide with success message
+            displayMessage('An OTP has been sent to your registered mobile number. Please enter it below.', 'info', 'otpMessage');
+            otpInput.focus();
+        }
+    });
+}
+
+if (verifyOtpBtn) {
+    verifyOtpBtn.addEventListener('click', async () => {
+        if (!isLoggedIn) {
+            showLoginRequiredModal('Please log in to verify OTP and place order.');
+            return;
+        }
+        const enteredOtp = otpInput.value.trim();
+
+        if (enteredOtp === simulatedOtp) {
+            showLoadingOverlay('OTP verified successfully. Placing your order...', 'spinner'); // Show loading overlay
+            displayMessage('OTP verified successfully. Placing your order...', 'success', 'otpMessage');
+            verifyOtpBtn.disabled = true;
+            resendOtpLink.style.display = 'none';
+
+            const selectedPaymentMethodRadio = document.querySelector('input[name="paymentMethod"]:checked');
+            let paymentMethod = selectedPaymentMethodRadio ? selectedPaymentMethodRadio.value : 'card';
+
+            const formData = new FormData();
+            formData.append('payment_method', paymentMethod);
+
+            try {
+                const response = await fetch('/api/place_order', {
+                    method: 'POST',
+                    body: formData
+                });
+                const data = await response.json();
+
+                if (data.success) {
+                    hideLoadingOverlay('Order placed successfully!', 'success'); // Hide with success message
+                    displayMessage(data.message || 'Your order has been placed successfully!', 'success', 'paymentMessages');
+                    invalidateCart();
+                    updateCartCount();
+                    setTimeout(() => {
+                        window.location.href = data.redirect;
+                    }, 1500);
+                } else {
+                    hideLoadingOverlay('Order failed!', 'error'); // Hide with error message
+                    displayMessage(data.message || 'Failed to place order after OTP verification.', 'error', 'paymentMessages');
+                    verifyOtpBtn.disabled = false;
+                    resendOtpLink.style.display = 'block';
+                }
+            } catch (error) {
+                console.error('Error placing order after OTP verification:', error);
+                hideLoadingOverlay('Network error!', 'error'); // Hide with network error message
+                displayMessage('Network error placing order. Please try again.', 'error', 'paymentMessages');
+                verifyOtpBtn.disabled = false;
+                resendOtpLink.style.display = 'block';
+            }
+        } else {
+            displayMessage('Invalid OTP. Please try again.', 'error', 'otpMessage');
+            otpInput.value = '';
+            otpInput.focus();
+        }
+    });
+}
+
+if (resendOtpLink) {
+    resendOtpLink.addEventListener('click', (event) => {
+        event.preventDefault();
+        if (!isLoggedIn) {
+            showLoginRequiredModal('Please log in to resend OTP.');
+            return;
+        }
+        simulatedOtp = Math.floor(100000 + Math.random() * 900000).toString();
+        console.log('New Simulated OTP:', simulatedOtp);
+        displayMessage('New OTP has been sent. Please check your mobile.', 'info', 'otpMessage');
+        otpInput.value = '';
+        otpInput.focus();
+        if (verifyOtpBtn) verifyOtpBtn.disabled = false;
+    });
+}
+
+if (upiPaymentForm) {
+    // No direct submit button on the UPI section itself, it's a display.
+}
+
+if (codPaymentForm) {
+    // No direct submit button on the COD section itself, it's a display.
+}
+
+const placeOrderBtn = document.getElementById('placeOrderBtn');
+if (placeOrderBtn) { 
+    placeOrderBtn.addEventListener('click', async () => {
+        if (!isLoggedIn) {
+            showLoginRequiredModal('Please log in to place your order.');
+            return;
+        }
+
+        const selectedPaymentMethodRadio = document.querySelector('input[name="paymentMethod"]:checked');
+        let paymentMethod = selectedPaymentMethodRadio ? selectedPaymentMethodRadio.value : null;
+
+        if (!paymentMethod || paymentMethod === 'card') {
+            displayMessage('Please confirm card details and verify OTP to place order.', 'error', 'paymentMessages');
+            return;
+        }
+
+        showLoadingOverlay('Placing your order...', 'spinner');
+        displayMessage('Placing your order...', 'info', 'paymentMessages');
+        placeOrderBtn.disabled = true;
+
+        const formData = new FormData();
+        formData.append('payment_method', paymentMethod);
+
+        try {
+            const response = await fetch('/api/place_order', { 
+                method: 'POST',
+                body: formData
+            });
+            const data = await response.json();
+
+            if (data.success) {
+                hideLoadingOverlay('Order placed successfully!', 'success');
+                displayMessage(data.message || 'Your order has been placed successfully!', 'success', 'paymentMessages');
+                invalidateCart();
+                updateCartCount();
+                setTimeout(() => {
+                    window.location.href = data.redirect;
+                }, 1500);
+            } else {
+                hideLoadingOverlay('Order failed!', 'error');
+                displayMessage(data.message || 'Failed to place order.', 'error', 'paymentMessages');
+            }
+        } catch (error) {
+            console.error('Error placing order (network/unhandled):', error);
+            hideLoadingOverlay('Network error!', 'error');
+            displayMessage('Network error placing order. Please try again.', 'error', 'paymentMessages');
+        } finally {
+            if (placeOrderBtn) placeOrderBtn.disabled = false;
+        }
+    });
+}
+
+// --- Initializations ---
+ready.then(() => {
+    renderOrderSummary('paymentMessages');
+    const defaultPaymentMethodRadio = document.querySelector('input[name="paymentMethod"]:checked');
+    if (defaultPaymentMethodRadio) {
+        showPaymentMethod(defaultPaymentMethodRadio.value + 'PaymentSection');
+    } else {
+        showPaymentMethod('cardPaymentSection');
+    }
+});
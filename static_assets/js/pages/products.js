@@ -0,0 +1,320 @@
+import { isLoggedIn, displayMessage, showLoadingOverlay, hideLoadingOverlay, showLoginRequiredModal, fetchCart, invalidateCart, updateCartCount, ready } from '../core.js';
+
+// Function to render the state of a product card (Add to Cart vs. Quantity Controls)
+function renderProductCardState(productId, quantity = 0) {
+    const productCard = document.querySelector(`.product-card[data-product-id="${productId}"]`);
+    if (!productCard) {
+        console.warn(`renderProductCardState: Product card with ID ${productId} not found.`);
+        return;
+    }
+
+    const addToCartBtn = productCard.querySelector('.btn-add-to-cart'); 
+    const quantityControls = productCard.querySelector('.quantity-controls-product-card');
+    const quantityDisplay = productCard.querySelector('.product-quantity-display');
+
+    // Always show "Add to Cart" if not logged in
+    if (!isLoggedIn) {
+        if (addToCartBtn) addToCartBtn.style.display = 'block';
+        if (quantityControls) quantityControls.style.display = 'none';
+        return;
+    }
+
+    // If logged in, show controls based on quantity
+    if (quantity > 0) {
+        if (addToCartBtn) addToCartBtn.style.display = 'none';
+        if (quantityControls) quantityControls.style.display = 'flex'; // Use flex to show controls
+        if (quantityDisplay) quantityDisplay.textContent = quantity;
+        console.log(`renderProductCardState: Product ${productId} set to quantity ${quantity}. Showing controls.`);
+    } else {
+        if (addToCartBtn) addToCartBtn.style.display = 'block';
+        if (quantityControls) quantityControls.style.display = 'none';
+        console.log(`renderProductCardState: Product ${productId} set to quantity 0. Showing Add to Cart button.`);
+    }
+}
+
+// Load initial product states on products page load
+async function loadProductStates() {
+    // Only run this if we are on the products page (check for a unique element)
+    if (!document.querySelector('.product-listing-section')) {
+        console.log("loadProductStates: Not on products page, skipping.");
+        return;
+    }
+
+    console.log("loadProductStates: Products page detected. Initiating loadProductStates...");
+
+    // Only attempt to load cart items if the user is logged in
+    if (!isLoggedIn) {
+        document.querySelectorAll('.product-card').forEach(card => {
+            renderProductCardState(card.dataset.productId, 0); // Ensure all show "Add to Cart"
+        });
+        return;
+    }
+
+    try {
+        const data = await fetchCart();
+
+        if (data.success && data.items) {
+            const cartItemsMap = {};
+            data.items.forEach(item => {
+                cartItemsMap[item.product_id.toString()] = item.quantity;
+            });
+
+            document.querySelectorAll('.product-card').forEach(card => {
+                const productIdHtml = card.dataset.productId;
+                const quantityInCart = cartItemsMap[productIdHtml] || 0;
+                renderProductCardState(productIdHtml, quantityInCart);
+            });
+        } else {
+            console.warn("loadProductStates: Failed to load cart items for product states or cart is empty:", data.message);
+            document.querySelectorAll('.product-card').forEach(card => {
+                renderProductCardState(card.dataset.productId, 0);
+            });
+        }
+    } catch (error) {
+        console.error("loadProductStates: Network error loading product states or JSON parsing failed:", error);
+        document.querySelectorAll('.product-card').forEach(card => {
+            renderProductCardState(card.dataset.productId, 0);
+        });
+    }
+}
+
+
+// Handle Add to Cart Clicks (on products.html)
+async function handleAddToCart(event) {
+    if (!isLoggedIn) {
+        showLoginRequiredModal('Please log in to add items to your cart.');
+        return;
+    }
+
+    const productId = event.target.dataset.productId;
+    const productName = event.target.dataset.productName;
+    const productStock = parseInt(event.target.dataset.productStock);
+
+    if (productStock <= 0) {
+        displayMessage('This product is out of stock!', 'error', 'productMessages');
+        return;
+    }
+
+    const originalText = event.target.textContent;
+    event.target.disabled = true;
+    event.target.textContent = 'Adding...';
+
+    showLoadingOverlay(`Adding ${productName} to cart...`, 'spinner');
+
+    try {
+        const formData = new FormData();
+        formData.append('product_id', productId);
+        formData.append('quantity', 1); // Add one at a time
+
+        const response = await fetch('/api/add_to_cart', {
+            method: 'POST',
+            body: formData
+        });
+        const data = await response.json();
+
+        if (data.success) {
+            hideLoadingOverlay(data.message, 'success');
+            displayMessage(data.message, 'success', 'productMessages');
+            invalidateCart();
+            updateCartCount();
+            renderProductCardState(productId, data.new_quantity || 1); // Use new_quantity from backend or default to 1
+        } else {
+            hideLoadingOverlay(data.message || 'Could not add product to cart.', 'error');
+            displayMessage('Error: ' + (data.message || 'Could not add product to cart.'), 'error', 'productMessages');
+        }
+    } catch (error) {
+        hideLoadingOverlay('Network error while adding to cart.', 'error');
+        displayMessage('Network error while adding to cart. Please check your connection.', 'error', 'productMessages');
+        console.error('Error adding to cart:', error);
+    } finally {
+        event.target.textContent = originalText;
+        event.target.disabled = false;
+    }
+}
+
+async function handleProductCardQuantityChange(event) {
+    if (!isLoggedIn) {
+        showLoginRequiredModal('Please log in to update cart quantity.');
+        return;
+    }
+
+    const button = event.target;
+    const productId = button.dataset.productId;
+    const changeType = button.classList.contains('increase-quantity-product-card') ? 'increase' : 'decrease';
+
+    const productCard = button.closest('.product-card');
+    const quantityDisplay = productCard.querySelector('.product-quantity-display');
+    let currentQuantity = parseInt(quantityDisplay.textContent);
+
+    // Optimistic UI update
+    if (changeType === 'increase') {
+        currentQuantity++;
+    } else if (changeType === 'decrease' && currentQuantity > 0) {
+        currentQuantity--;
+    }
+    quantityDisplay.textContent = currentQuantity;
+
+    const formData = new FormData();
+    formData.append('product_id', productId);
+    formData.append('change_type', changeType);
+
+    showLoadingOverlay('Updating cart...', 'spinner'); // Show loading overlay for this action
+
+    try {
+        const response = await fetch('/api/update_cart_quantity', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/x-www-form-urlencoded'
+            },
+            body: `product_id=${productId}&change_type=${changeType}`
+        });
+        const data = await response.json();
+
+        if (data.success) {
+            hideLoadingOverlay(data.message, 'success'); // Hide with success message
+            displayMessage(data.message, 'success', 'productMessages');
+            invalidateCart();
+            updateCartCount();
+            renderProductCardState(productId, data.new_quantity); // Update state based on new_quantity from backend
+        } else {
+            // Revert optimistic UI update on failure
+            quantityDisplay.textContent = currentQuantity + (changeType === 'increase' ? -1 : 1);
+            hideLoadingOverlay(data.message || 'Failed to update quantity.', 'error'); // Hide with error message
+            displayMessage(`Failed to update quantity: ${data.message || 'Unknown error'}`, 'error', 'productMessages');
+        }
+    } catch (error) {
+        // Revert optimistic UI update on network error
+        quantityDisplay.textContent = currentQuantity + (changeType === 'increase' ? -1 : 1);
+        hideLoadingOverlay('Network error updating quantity.', 'error'); // Hide with network error message
+        displayMessage('Network error updating quantity.', 'error', 'productMessages');
+        console.error('handleProductCardQuantityChange: Error updating quantity:', error);
+    }
+}
+
+// --- Product Listing and Search ---
+const productGrid = document.getElementById('productGrid');
+const productSearchInput = document.getElementById('productSearchInput');
+const productSearchBtn = document.getElementById('productSearchBtn');
+
+// Function to render products (now called from here)
+async function renderProducts(query = '') {
+    productGrid.innerHTML = '<p>Loading products...</p>'; // Clear existing products/message
+    try {
+        // Fetching from sheets API - this should always work regardless of login
+        const response = await fetch(`/api/admin/sheets/products?query=${encodeURIComponent(query)}`); 
+        const result = await response.json();
+
+        if (response.ok && result.success) {
+            productGrid.innerHTML = ''; // Clear loading message
+            if (result.products.length === 0) {
+                productGrid.innerHTML = `<p>${result.message || 'No products found.'}</p>`;
+                return;
+            }
+
+            result.products.forEach(product => {
+                const productCard = document.createElement('div');
+                productCard.className = 'product-card';
+                productCard.dataset.productId = product.id; 
+                productCard.innerHTML = `
+                    <img src="${product.image_url || 'https://placehold.co/300x200/cccccc/000000?text=No+Image'}" alt="${product.name || 'Product Image'}">
+                    <div class="product-info">
+                        <h3>${product.name || 'Unknown Product'}</h3>
+                        <p>${product.description || 'No description available.'}</p>
+                        <div class="product-price">₹${(product.price !== undefined && product.price !== null) ? parseFloat(product.price).toFixed(2) : '0.00'}</div>
+                        <div class="product-stock">Stock: ${(product.stock !== undefined && product.stock !== null) ? product.stock : 'N/A'}</div>
+                        
+                        <button class="btn btn-add-to-cart"
+                                data-product-id="${product.id}"
+                                data-product-name="${product.name || 'Unknown Product'}"
+                                data-product-price="${product.price || '0.00'}"
+                                data-product-stock="${product.stock || '0'}"
+                                style="display: block;">Add to Cart</button>
+                        
+                        <div class="quantity-controls-product-card" style="display: none;">
+                            <button class="quantity-btn-product-card decrease-quantity-product-card" data-product-id="${product.id}">-</button>
+                            <span class="product-quantity-display" data-product-id="${product.id}">0</span>
+                            <button class="quantity-btn-product-card increase-quantity-product-card" data-product-id="${product.id}">+</button>
+                        </div>
+                    </div>
+                `;
+                productGrid.appendChild(productCard);
+            });
+            // Attach listeners after all products are rendered
+            attachAddToCartListeners();
+            attachProductCardQuantityListeners(); 
+            loadProductStates(); // Load initial state for all product cards based on login
+        } else {
+            productGrid.innerHTML = `<p class="message error">${result.message || 'Failed to load products.'}</p>`;
+            console.error('Failed to load products:', result.message);
+        }
+    } catch (error) {
+        productGrid.innerHTML = '<p class="message error">An error occurred while loading products.</p>';
+        console.error('Fetch error loading products:', error);
+    }
+}
+
+// Attach event listeners for "Add to Cart" buttons
+function attachAddToCartListeners() {
+    document.querySelectorAll('.btn-add-to-cart').forEach(button => {
+        button.removeEventListener('click', handleAddToCart); 
+        button.addEventListener('click', handleAddToCart);
+    });
+}
+
+// Function to attach event listeners for quantity controls on product cards
+function attachProductCardQuantityListeners() {
+    document.querySelectorAll('.quantity-btn-product-card').forEach(button => {
+        button.removeEventListener('click', handleProductCardQuantityChange);
+        button.addEventListener('click', handleProductCardQuantityChange);
+    });
+}
+
+// Search functionality
+productSearchBtn.addEventListener('click', () => {
+    const query = productSearchInput.value.trim();
+    renderProducts(query);
+});
+
+productSearchInput.addEventListener('keypress', (e) => {
+    if (e.key === 'Enter') {
+        productSearchBtn.click();
+    }
+});
+
+// Type-ahead suggestions, fetched once the user pauses typing.
+const productSuggestions = document.getElementById('productSuggestions');
+let suggestTimer = null;
+let suggestController = null;
+productSearchInput.addEventListener('input', () => {
+    clearTimeout(suggestTimer);
+    const prefix = productSearchInput.value.trim();
+    if (!productSuggestions || prefix.length === 0) {
+        if (productSuggestions) productSuggestions.innerHTML = '';
+        return;
+    }
+    suggestTimer = setTimeout(async () => {
+        if (suggestController) suggestController.abort();
+        suggestController = new AbortController();
+        try {
+            const response = await fetch(`/api/products/suggest?prefix=${encodeURIComponent(prefix)}`, { signal: suggestController.signal });
+            const result = await response.json();
+            productSuggestions.innerHTML = '';
+            (result.suggestions || []).forEach(suggestion => {
+                const option = document.createElement('option');
+                option.value = suggestion.name;
+                productSuggestions.appendChild(option);
+            });
+        } catch (error) {
+            if (error.name !== 'AbortError') console.error('Fetch error loading suggestions:', error);
+        }
+    }, 150);
+});
+
+// Product cards show Add to Cart again once the user logs out
+document.addEventListener('logout', () => renderProducts());
+
+// --- Initializations ---
+ready.then(() => {
+    // Initial render of products on page load for products.html
+    renderProducts();
+});
@@ -0,0 +1,125 @@
+import { isLoggedIn, displayMessage, showLoadingOverlay, hideLoadingOverlay, handleFormSubmission, ready } from '../core.js';
+
+// --- Settings Page Logic ---
+async function loadUserSettings() {
+    const profileInfoForm = document.getElementById('profileInfoForm');
+    const shippingAddressForm = document.getElementById('shippingAddressForm');
+    const settingsMessages = document.getElementById('settingsMessages');
+
+    if (!profileInfoForm || !shippingAddressForm || !settingsMessages) {
+        console.warn("loadUserSettings: Required settings page elements not found.");
+        return;
+    }
+
+    // Only load user settings if logged in
+    if (!isLoggedIn) {
+        displayMessage('Please log in to view and manage your profile settings.', 'info', 'settingsMessages');
+        profileInfoForm.style.display = 'none';
+        shippingAddressForm.style.display = 'none';
+        document.getElementById('changePasswordForm').style.display = 'none'; // Assuming this exists
+        return;
+    }
+
+    showLoadingOverlay('Loading your settings...', 'spinner'); // Show loading overlay
+    displayMessage('Loading your settings...', 'info', 'settingsMessages');
+
+    try {
+        const response = await fetch('/api/get_user_profile');
+        const data = await response.json();
+
+        if (data.success && data.profile) {
+            const profile = data.profile;
+            document.getElementById('username').value = profile.username || '';
+            document.getElementById('email').value = profile.email || '';
+
+            const shipping = profile.shipping_info || {};
+            document.getElementById('fullName').value = shipping.full_name || '';
+            document.getElementById('addressLine1').value = shipping.address_line1 || '';
+            document.getElementById('addressLine2').value = shipping.address_line2 || '';
+            const addressLine3Input = document.getElementById('addressLine3');
+            if (addressLine3Input) {
+                addressLine3Input.value = shipping.address_line3 || '';
+            }
+            document.getElementById('city').value = shipping.city || '';
+            document.getElementById('state').value = shipping.state || '';
+            document.getElementById('zipCode').value = shipping.zip_code || '';
+            document.getElementById('phone').value = shipping.phone || '';
+
+            hideLoadingOverlay('Information loaded successfully.', 'success'); // Hide with success message
+            displayMessage('Information loaded successfully.', 'success', 'settingsMessages');
+        } else {
+            hideLoadingOverlay('No user profile data found.', 'info'); // Hide with info message
+            displayMessage('', '', 'settingsMessages');
+            console.log('loadUserSettings: No user profile data found.');
+        }
+    } catch (error) {
+        console.error('loadUserSettings: Network error fetching user profile:', error);
+        hideLoadingOverlay('Network error loading settings.', 'error'); // Hide with network error message
+        displayMessage('Network error loading settings. Please try again.', 'error', 'settingsMessages');
+    }
+}
+
+// Attach listeners for settings forms
+const profileInfoForm = document.getElementById('profileInfoForm');
+if (profileInfoForm) {
+    profileInfoForm.addEventListener('submit', (event) => {
+        handleFormSubmission(event, '/api/update_user_profile', null, 'settingsMessages');
+    });
+}
+
+const changePasswordForm = document.getElementById('changePasswordForm');
+if (changePasswordForm) {
+    changePasswordForm.addEventListener('submit', (event) => {
+        const newPassword = document.getElementById('newPassword').value;
+        const confirmNewPassword = document.getElementById('confirmNewPassword').value;
+
+        if (newPassword !== confirmNewPassword) {
+            displayMessage('New passwords do not match.', 'error', 'settingsMessages');
+            return;
+        }
+        if (newPassword.length < 6) {
+            displayMessage('New password must be at least 6 characters long.', 'error', 'settingsMessages');
+            return;
+        }
+        handleFormSubmission(event, '/api/change_password', null, 'settingsMessages');
+    });
+}
+
+const shippingAddressForm = document.getElementById('shippingAddressForm');
+if (shippingAddressForm) {
+    shippingAddressForm.addEventListener('submit', (event) => {
+        const zipCodeInput = document.getElementById('zipCode');
+        const phoneInput = document.getElementById('phone');
+        const addressLine2Input = document.getElementById('addressLine2');
+
+        const zipCodePattern = /^\d{5,6}$/;
+        const phonePattern = /^\d{10}$/;
+
+        if (!addressLine2Input.value.trim()) {
+            displayMessage('Address Line 2 (Area/Locality) is required.', 'error', 'settingsMessages');
+            return;
+        }
+        if (zipCodeInput && !zipCodePattern.test(zipCodeInput.value)) {
+            displayMessage('Invalid Zip Code format. Must be 5 or 6 digits.', 'error', 'settingsMessages');
+            return;
+        }
+        if (phoneInput && !phonePattern.test(phoneInput.value)) {
+            displayMessage('Invalid Phone Number format. Must be 10 digits.', 'error', 'settingsMessages');
+            return;
+        }
+
+        handleFormSubmission(event, '/api/save_shipping_info', null, 'settingsMessages');
+    });
+}
+
+const continueShoppingBtnSettings = document.getElementById('continueShoppingBtnSettings');
+if (continueShoppingBtnSettings) {
+    continueShoppingBtnSettings.addEventListener('click', () => {
+        window.location.href = 'products.html';
+    });
+}
+
+// --- Initializations ---
+ready.then(() => {
+    loadUserSettings();
+});